@@ -0,0 +1,45 @@
+ZONE_PLAN_MINI = (-240, -240)  # Coin inférieur gauche de la zone d'affichage du plan
+ZONE_PLAN_MAXI = (50, 200)  # Coin supérieur droit de la zone d'affichage du plan
+POINT_AFFICHAGE_ANNONCES = (-240, 240)  # Point d'origine de l'affichage des annonces
+POINT_AFFICHAGE_INVENTAIRE = (70, 210)  # Point d'origine de l'affichage de l'inventaire
+PAS_MINIMAL = 12  # Dimension minimale des cases en pixels (en dessous, le plan défile avec le personnage)
+TAILLE_TUILE = 16  # Nombre de cases de côté des tuiles du plan lues et tracées ensemble
+PERIODE_TICK = 16  # Période de la boucle de jeu en millisecondes (une image au plus par tic)
+MAX_DEPLACEMENTS_TICK = 8  # Déplacements en attente appliqués au plus par tic (les suivants attendent le tic suivant)
+RENDU_BITMAP = False  # Plan rastérisé en images avec zoom (touches + et -), pour les très grands plans
+TAILLE_CACHE_ETAGES = 3  # Etages d'un chateau à étages gardés en mémoire (l'étage courant et ses voisins)
+
+# Les valeurs ci-dessous définissent les couleurs des cases du plan
+COULEUR_CASES = 'white'
+COULEUR_COULOIR = 'white'
+COULEUR_MUR = 'grey'
+COULEUR_OBJECTIF = 'yellow'
+COULEUR_PORTE = 'orange'
+COULEUR_OBJET = 'green'
+COULEUR_VUE = 'wheat'
+COULEUR_ESCALIER = 'purple'
+COULEURS = [COULEUR_COULOIR, COULEUR_MUR, COULEUR_OBJECTIF, COULEUR_PORTE, COULEUR_OBJET, COULEUR_VUE,
+            COULEUR_ESCALIER]
+COULEUR_EXTERIEUR = 'white'
+COULEUR_BROUILLARD = 'black'  # Couleur des cases hors du champ de la torche
+
+# Couleur et dimension du personnage
+COULEUR_PERSONNAGE = 'red'
+RATIO_PERSONNAGE = 0.9  # Rapport entre diamètre du personnage et dimension des cases
+POSITION_DEPART = (0, 1)  # Porte d'entrée du château
+RAYON_TORCHE = 0  # Portée de la torche en cases (brouillard de guerre) ; 0 : tout le plan est visible
+
+# Gardes en ronde sur le plan (gardes.py)
+NB_GARDES = 0  # Nombre de gardes postés au hasard dans les couloirs au lancement
+RAYON_DETECTION_GARDES = 2  # Distance en cases à laquelle un garde repère le personnage
+COULEUR_GARDE = 'blue'
+
+# Désignation des fichiers de données à utiliser
+fichier_plan = 'plan_chateau.txt'
+fichier_questions = 'dico_portes.txt'
+fichier_objets = 'dico_objets.txt'
+fichier_enregistrement = 'derniere_partie.json'  # Journal de la dernière partie (rejouable par enregistrement.py)
+fichier_sauvegarde = 'sauvegarde'  # Progression sauvegardée (sauvegarde.sav et sauvegarde.jnl), reprise au lancement
+fichier_profil = 'profil.json'  # Rapport du mode --profile
+fichier_niveau = 'chateau.lvl'  # Niveau compilé (recompilé automatiquement si les fichiers ci-dessus changent)
+dossier_etages = ''  # Chateau à étages (voir etages.py), joué à la place des fichiers ci-dessus s'il est donné
@@ -0,0 +1,11 @@
+"""
+    PROJET LANCELOT
+    ===============
+
+    Paquet du jeu : moteur sans affichage (moteur.py, plan.py), niveaux (niveau.py, generateur.py), outils
+    (solveur.py, validateur.py, indices.py, lot.py, benchmark.py...) et front-end turtle (jeu.py).
+
+    Importer le paquet ou l'un de ses outils ne charge ni turtle ni Tk : seul jeu.main() les importe.
+"""
+
+__version__ = '1.0.0'
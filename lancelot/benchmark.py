@@ -0,0 +1,354 @@
+"""
+    PROJET LANCELOT - mesures de performance
+    ========================================
+
+    Chronomètre les chemins critiques du jeu sur des chateaux de tailles croissantes (générés par
+    generateur.py, avec une graine fixe) :
+        - lire_matrice (plan texte et plan binaire) et creer_dictionnaire ;
+        - afficher_plan, sur un canevas virtuel qui imite le canevas Tk de turtle sans fenêtre ;
+        - boucles de déplacements (moteur seul, puis moteur + rendu) et mises à jour de cases (case_def) ;
+        - rastérisation du plan et calcul de ses mipmaps pour le rendu bitmap (sans création des images Tk) ;
+        - tics des gardes en ronde (jusqu'à NB_GARDES_MESURE gardes), avec le rendu de ceux de la vue ;
+        - pas de l'environnement vectorisé (NB_COPIES_ENVIRONNEMENT copies du chateau, si NumPy est installé).
+
+    Chaque mesure est répétée et la meilleure durée est retenue. La préparation d'une mesure (lecture du
+    plan, premier afficher_plan, création de la partie, des gardes ou de l'environnement) est faite avant
+    chaque répétition, hors du chronomètre. Les résultats sont écrits en JSON et peuvent être comparés à une
+    référence enregistrée : toute mesure plus lente que la référence multipliée par le seuil est une
+    régression (code de sortie 1).
+
+    La référence dépend de la machine : elle s'obtient en lançant les mesures une première fois, avant les
+    changements à vérifier, avec --sortie reference.json (sur la même machine et le même Python).
+
+    Usage : python -m lancelot.benchmark [--tailles 27 101 501] [--sortie resultats.json]
+                                [--reference reference.json] [--seuil 1.25]
+
+    Dependencies : moteur.py, rendu.py, rendu_bitmap.py, generateur.py, gardes.py, environnement.py (NumPy)
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from .gardes import Gardes, placer_gardes
+from .generateur import generer_chateau
+from .moteur import Partie, lire_matrice, creer_dictionnaire, reponses_fixes, GAUCHE, DROITE, HAUT, BAS, VUE, \
+    COULOIR
+from .rendu import Rendu
+from .rendu_bitmap import construire_niveaux, image_ppm, CODES, COULEURS_CODES
+
+try:
+    import numpy as np
+    from .environnement import Environnement
+except ImportError:  # l'environnement vectorisé nécessite NumPy : sa mesure est omise
+    np = Environnement = None
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+VERSION = 2  # version 2 : préparation des mesures hors du chronomètre
+NB_DEPLACEMENTS = 100000  # déplacements par mesure, moteur seul
+NB_GARDES_MESURE = 5000  # gardes en ronde (au plus un quart des couloirs)
+NB_TICS_GARDES = 100  # tics des gardes par mesure
+NB_COPIES_ENVIRONNEMENT = 1024  # copies du chateau avancées ensemble
+NB_PAS_ENVIRONNEMENT = 1000  # pas de l'environnement par mesure
+NB_IMAGES = 5000  # déplacements (une image chacun) par mesure avec rendu
+
+
+# ======================================================================================================================
+# III. CANEVAS VIRTUEL
+# ======================================================================================================================
+
+class CanevasVirtuel:
+    """
+    Canevas sans fenêtre qui implémente la partie de l'interface du canevas Tk utilisée par le rendu.
+    Les items sont gardés en mémoire (coordonnées, options, étiquettes), ce qui permet de mesurer le
+    coût du rendu et de compter les items sans affichage. Un déplacement par étiquette est cumulé dans un
+    décalage de l'étiquette, pour que la mesure reflète le coût du rendu et non celui du canevas virtuel.
+    """
+
+    def __init__(self):
+        self.items = {}  # item -> [coordonnées hors décalages, options, étiquettes]
+        self.etiquettes = {}  # étiquette -> items
+        self.decalages = {}  # étiquette -> décalage (x, y) cumulé par move()
+        self.prochain = 1
+
+    def creer(self, coordonnees, options):
+        item = self.prochain
+        self.prochain += 1
+        etiquettes = options.pop('tags', ())
+        etiquettes = (etiquettes,) if isinstance(etiquettes, str) else tuple(etiquettes)
+        for etiquette in etiquettes:
+            self.etiquettes.setdefault(etiquette, set()).add(item)
+        self.items[item] = [[], options, etiquettes]
+        self.placer(item, coordonnees)
+        return item
+
+    def create_rectangle(self, *coordonnees, **options):
+        return self.creer(coordonnees, options)
+
+    def create_oval(self, *coordonnees, **options):
+        return self.creer(coordonnees, options)
+
+    def create_text(self, *coordonnees, **options):
+        return self.creer(coordonnees, options)
+
+    def create_image(self, *coordonnees, **options):
+        return self.creer(coordonnees, options)
+
+    def trouver(self, designation):
+        if isinstance(designation, int):
+            return [designation] if designation in self.items else []
+        return list(self.etiquettes.get(designation, ()))
+
+    def decalage(self, item):
+        delta_x = delta_y = 0
+        for etiquette in self.items[item][2]:
+            decalage_x, decalage_y = self.decalages.get(etiquette, (0, 0))
+            delta_x, delta_y = delta_x + decalage_x, delta_y + decalage_y
+        return delta_x, delta_y
+
+    def itemconfigure(self, designation, **options):
+        for item in self.trouver(designation):
+            self.items[item][1].update(options)
+
+    def coords(self, designation, *coordonnees):
+        items = self.trouver(designation)
+        if not coordonnees:  # lecture : coordonnées réelles du premier item
+            if not items:
+                return []
+            delta_x, delta_y = self.decalage(items[0])
+            return [valeur + (delta_y if rang % 2 else delta_x) for rang, valeur in enumerate(self.items[items[0]][0])]
+        for item in items:
+            self.placer(item, coordonnees)
+
+    def placer(self, item, coordonnees):
+        delta_x, delta_y = self.decalage(item)
+        self.items[item][0] = [valeur - (delta_y if rang % 2 else delta_x) for rang, valeur in enumerate(coordonnees)]
+
+    def move(self, designation, delta_x, delta_y):
+        if isinstance(designation, int):
+            if designation in self.items:
+                self.items[designation][0] = [valeur + (delta_y if rang % 2 else delta_x)
+                                              for rang, valeur in enumerate(self.items[designation][0])]
+        else:
+            decalage_x, decalage_y = self.decalages.get(designation, (0, 0))
+            self.decalages[designation] = (decalage_x + delta_x, decalage_y + delta_y)
+
+    def delete(self, designation):
+        for item in self.trouver(designation):
+            for etiquette in self.items.pop(item)[2]:
+                self.etiquettes[etiquette].discard(item)
+
+    def tag_raise(self, designation):
+        pass  # l'ordre d'empilement n'a pas de coût mesurable ici
+
+    def find_all(self):
+        return tuple(self.items)
+
+
+# ======================================================================================================================
+# IV. MESURES
+# ======================================================================================================================
+
+def chronometrer(fonction, repetitions, preparer=None):
+    """
+    Exécute une fonction plusieurs fois et renvoie la meilleure durée.
+
+    :param fonction: fonction à chronométrer, sans argument, ou avec le résultat de preparer()
+    :param repetitions: nombre d'exécutions
+    :param preparer: fonction sans argument appelée avant chaque exécution, hors du chronomètre (None : aucune)
+    :type fonction: callable
+    :type repetitions: int
+    :type preparer: callable or None
+    :return: meilleure durée en secondes
+    :rtype: float
+    """
+    meilleure = float('inf')
+    for _ in range(repetitions):
+        if preparer is None:
+            debut = time.perf_counter()
+            fonction()
+        else:
+            etat = preparer()
+            debut = time.perf_counter()
+            fonction(etat)
+        meilleure = min(meilleure, time.perf_counter() - debut)
+    return meilleure
+
+
+def mouvements_aleatoires(nombre, graine):
+    """
+    Tire une suite reproductible de mouvements.
+
+    :rtype: list[tuple[int, int]]
+    """
+    hasard = random.Random(graine)
+    return [hasard.choice((GAUCHE, DROITE, HAUT, BAS)) for _ in range(nombre)]
+
+
+def mesurer_taille(taille, dossier, repetitions):
+    """
+    Mesure tous les chemins critiques sur un chateau généré de taille x taille cases.
+
+    :param taille: nombre de lignes et de colonnes du chateau
+    :param dossier: dossier temporaire où écrire le chateau
+    :param repetitions: nombre d'exécutions de chaque mesure
+    :type taille: int
+    :type dossier: str
+    :type repetitions: int
+    :return: dictionnaire nom de la mesure -> meilleure durée en secondes
+    :rtype: dict[str, float]
+    """
+    fichier_texte = os.path.join(dossier, f'plan_{taille}.txt')
+    fichier_binaire = os.path.join(dossier, f'plan_{taille}.bin')
+    fichier_objets = os.path.join(dossier, f'objets_{taille}.txt')
+    fichier_portes = os.path.join(dossier, f'portes_{taille}.txt')
+    generer_chateau(fichier_texte, fichier_objets, fichier_portes, taille, taille, taille // 4, graine=taille)
+    generer_chateau(fichier_binaire, fichier_objets, fichier_portes, taille, taille, taille // 4, graine=taille,
+                    binaire=True)
+    dict_objet = creer_dictionnaire(fichier_objets)
+    dict_porte = creer_dictionnaire(fichier_portes)
+    mouvements = mouvements_aleatoires(NB_DEPLACEMENTS, taille)
+    resultats = {
+        'lire_matrice/texte': chronometrer(lambda: lire_matrice(fichier_texte), repetitions),
+        'lire_matrice/binaire': chronometrer(lambda: lire_matrice(fichier_binaire).fermer(), repetitions),
+        'creer_dictionnaire': chronometrer(lambda: (creer_dictionnaire(fichier_objets),
+                                                    creer_dictionnaire(fichier_portes)), repetitions),
+        'afficher_plan': chronometrer(lambda etat: etat[0].afficher_plan(etat[1]), repetitions,
+                                      lambda: (Rendu(CanevasVirtuel(), lambda: None), lire_matrice(fichier_texte))),
+    }
+
+    def rasteriser():
+        plan = lire_matrice(fichier_binaire)
+        palette = [(code, code, code) for code in range(len(COULEURS_CODES))]
+        for codes, nb_lignes, nb_colonnes in construire_niveaux(bytearray(bytes(plan.cases).translate(CODES)),
+                                                                plan.nb_lignes, plan.nb_colonnes):
+            image_ppm(codes, nb_lignes, nb_colonnes, palette)
+        plan.fermer()
+
+    def preparer_partie(fournisseur=None):
+        return Partie(lire_matrice(fichier_texte), dict_objet, dict_porte, fournisseur=fournisseur)
+
+    def preparer_rendu(fournisseur=None):
+        partie = preparer_partie(fournisseur)
+        rendu = Rendu(CanevasVirtuel(), lambda: None)
+        rendu.afficher_plan(partie.plan)
+        partie.abonner(rendu.observer)
+        return partie, rendu
+
+    def preparer_gardes():
+        partie, rendu = preparer_rendu()
+        plan = partie.plan
+        nb_couloirs = sum(1 for type_case in bytes(plan.cases) if type_case == COULOIR)
+        gardes = Gardes(partie, placer_gardes(plan, min(NB_GARDES_MESURE, nb_couloirs // 4), (partie.position,),
+                                              graine=taille), graine=taille)
+        return gardes, rendu
+
+    def preparer_environnement():
+        environnement = Environnement(lire_matrice(fichier_texte), dict_objet, dict_porte, NB_COPIES_ENVIRONNEMENT)
+        return environnement, np.random.default_rng(taille).integers(0, 4, (10, NB_COPIES_ENVIRONNEMENT))
+
+    def deplacer_sans_rendu(partie):
+        deplacer = partie.deplacer
+        for mouvement in mouvements:
+            deplacer(mouvement)
+
+    def deplacer_avec_rendu(etat):
+        partie, rendu = etat
+        for mouvement in mouvements[:NB_IMAGES]:
+            partie.deplacer(mouvement)
+            rendu.dessiner()
+
+    def definir_cases(etat):
+        partie, rendu = etat
+        plan = partie.plan
+        hasard = random.Random(taille)
+        for _ in range(NB_IMAGES):
+            partie.case_def((hasard.randrange(plan.nb_lignes), hasard.randrange(plan.nb_colonnes)), VUE)
+            rendu.dessiner()
+
+    def faire_rondes(etat):
+        gardes, rendu = etat
+        for _ in range(NB_TICS_GARDES):
+            gardes.avancer()
+            rendu.dessiner()
+
+    def avancer_environnement(etat):
+        environnement, actions = etat
+        for rang in range(NB_PAS_ENVIRONNEMENT):
+            environnement.pas(actions[rang % len(actions)])
+
+    resultats['deplacer'] = chronometrer(deplacer_sans_rendu, repetitions,
+                                         lambda: preparer_partie(reponses_fixes(dict_porte)))
+    resultats['deplacer+rendu'] = chronometrer(deplacer_avec_rendu, repetitions,
+                                               lambda: preparer_rendu(reponses_fixes(dict_porte)))
+    resultats['case_def+rendu'] = chronometrer(definir_cases, repetitions, preparer_rendu)
+    resultats['mipmaps'] = chronometrer(rasteriser, repetitions)
+    resultats['gardes'] = chronometrer(faire_rondes, repetitions, preparer_gardes)
+    if Environnement is not None and taille * taille * NB_COPIES_ENVIRONNEMENT <= 2 ** 28:  # 256 Mio de cases
+        resultats['environnement'] = chronometrer(avancer_environnement, repetitions, preparer_environnement)
+    return {f'{nom}[{taille}]': duree for nom, duree in resultats.items()}
+
+
+def comparer(resultats, reference, seuil):
+    """
+    Compare des résultats à une référence.
+
+    :param resultats: dictionnaire nom de la mesure -> durée
+    :param reference: dictionnaire nom de la mesure -> durée de référence
+    :param seuil: rapport de durée au-delà duquel une mesure est une régression
+    :type resultats: dict[str, float]
+    :type reference: dict[str, float]
+    :type seuil: float
+    :return: les régressions (nom, durée de référence, durée mesurée)
+    :rtype: list[tuple[str, float, float]]
+    """
+    return [(nom, reference[nom], duree) for nom, duree in sorted(resultats.items())
+            if nom in reference and duree > reference[nom] * seuil]
+
+
+# ======================================================================================================================
+# V. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description='Mesure les performances des chemins critiques du jeu.')
+    analyseur.add_argument('--tailles', type=int, nargs='+', default=[27, 101, 501], help='tailles des chateaux')
+    analyseur.add_argument('--repetitions', type=int, default=3, help='exécutions de chaque mesure')
+    analyseur.add_argument('--sortie', help='fichier JSON des résultats (défaut : sortie standard)')
+    analyseur.add_argument('--reference', help='fichier JSON de référence à comparer')
+    analyseur.add_argument('--seuil', type=float, default=1.25, help='rapport toléré avec la référence')
+    arguments = analyseur.parse_args()
+    mesures = {}
+    with tempfile.TemporaryDirectory() as dossier_temporaire:
+        for taille_chateau in arguments.tailles:
+            mesures.update(mesurer_taille(taille_chateau, dossier_temporaire, arguments.repetitions))
+    rapport = {'version': VERSION, 'python': platform.python_version(), 'machine': platform.machine(),
+               'resultats': mesures}
+    if arguments.sortie:
+        with open(arguments.sortie, 'w', encoding='UTF-8') as fichier_sortie:
+            json.dump(rapport, fichier_sortie, indent=2)
+    else:
+        print(json.dumps(rapport, indent=2))
+    if arguments.reference:
+        with open(arguments.reference, encoding='UTF-8') as fichier_reference:
+            reference_lue = json.load(fichier_reference)
+        if reference_lue.get('version') != VERSION:
+            analyseur.exit(2, f'{arguments.reference} : référence d\'une autre version des mesures ({VERSION}), '
+                              f'à refaire avec --sortie\n')
+        regressions = comparer(mesures, reference_lue['resultats'], arguments.seuil)
+        for nom_mesure, duree_reference, duree_mesuree in regressions:
+            print(f'régression : {nom_mesure} {duree_reference:.6f} s -> {duree_mesuree:.6f} s '
+                  f'(x{duree_mesuree / duree_reference:.2f})', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
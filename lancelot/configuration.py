@@ -0,0 +1,119 @@
+"""
+    PROJET LANCELOT - configuration d'une session de jeu
+    ====================================================
+
+    Réglages d'une session (niveau, fichiers, cadence de la boucle de jeu, torche, rendu) réunis dans un objet
+    typé et immuable, Configuration. Ses valeurs par défaut sont celles de CONFIGS.py ; un fichier de
+    configuration n'en remplace que certaines.
+
+    Le fichier de configuration reprend la syntaxe de CONFIGS.py, une affectation par réglage, les noms des
+    champs de Configuration étant insensibles à la casse :
+        RAYON_TORCHE = 6  # brouillard de guerre
+        fichier_plan = 'chateau_geant/plan_chateau.bin'
+    Il n'est jamais exécuté : chaque valeur est lue comme un littéral python (ast.literal_eval).
+
+    Les dimensions de la fenêtre et les couleurs restent des constantes de CONFIGS.py : leurs affectations
+    sont ignorées, si bien qu'une copie de CONFIGS.py est un fichier de configuration valide.
+
+    Dependencies : CONFIGS.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import ast
+from typing import NamedTuple, Tuple
+
+from . import CONFIGS
+
+
+# ======================================================================================================================
+# II. CONFIGURATION
+# ======================================================================================================================
+
+class Configuration(NamedTuple):
+    """
+    Réglages d'une session de jeu (valeurs par défaut : CONFIGS.py).
+    """
+    position_depart: Tuple[int, int] = CONFIGS.POSITION_DEPART
+    periode_tick: int = CONFIGS.PERIODE_TICK  # millisecondes
+    max_deplacements_tick: int = CONFIGS.MAX_DEPLACEMENTS_TICK
+    rayon_torche: int = CONFIGS.RAYON_TORCHE  # 0 : pas de brouillard de guerre
+    nb_gardes: int = CONFIGS.NB_GARDES
+    rayon_detection_gardes: int = CONFIGS.RAYON_DETECTION_GARDES
+    rendu_bitmap: bool = CONFIGS.RENDU_BITMAP
+    taille_cache_etages: int = CONFIGS.TAILLE_CACHE_ETAGES
+    fichier_plan: str = CONFIGS.fichier_plan
+    fichier_objets: str = CONFIGS.fichier_objets
+    fichier_questions: str = CONFIGS.fichier_questions
+    fichier_niveau: str = CONFIGS.fichier_niveau
+    fichier_enregistrement: str = CONFIGS.fichier_enregistrement
+    fichier_sauvegarde: str = CONFIGS.fichier_sauvegarde
+    fichier_profil: str = CONFIGS.fichier_profil
+    dossier_etages: str = CONFIGS.dossier_etages  # '' : un seul étage
+
+
+def charger_configuration(fichier=None):
+    """
+    Lit un fichier de configuration.
+
+    :param fichier: chemin du fichier (None : configuration par défaut)
+    :type fichier: str or None
+    :rtype: Configuration
+    :raise ValueError: si le fichier n'est pas du python valide, ou si une ligne n'est pas une affectation d'un
+                       littéral du bon type à un réglage connu
+
+    .. note:: les constantes de CONFIGS.py qui ne sont pas des réglages (fenêtre, couleurs) sont ignorées
+    """
+    if fichier is None:
+        return Configuration()
+    with open(fichier, encoding='UTF-8') as fichier_in:
+        source = fichier_in.read()
+    try:
+        arbre = ast.parse(source, fichier)
+    except SyntaxError as erreur:
+        raise ValueError(f'{fichier}, ligne {erreur.lineno} : syntaxe invalide ({erreur.msg})') from None
+    valeurs = {}
+    for instruction in arbre.body:
+        if not (isinstance(instruction, ast.Assign) and len(instruction.targets) == 1
+                and isinstance(instruction.targets[0], ast.Name)):
+            raise ValueError(f'{fichier}, ligne {instruction.lineno} : affectation attendue (NOM = valeur)')
+        nom = instruction.targets[0].id.lower()
+        if nom not in Configuration._fields:
+            if hasattr(CONFIGS, instruction.targets[0].id):
+                continue  # constante de CONFIGS.py qui n'est pas un réglage de session
+            raise ValueError(f'{fichier}, ligne {instruction.lineno} : réglage inconnu {instruction.targets[0].id}')
+        try:
+            valeur = ast.literal_eval(instruction.value)
+        except ValueError:
+            raise ValueError(f'{fichier}, ligne {instruction.lineno} : la valeur de {nom} n\'est pas un littéral') \
+                from None
+        defaut = Configuration._field_defaults[nom]
+        attendu = type(defaut)
+        if attendu is tuple and isinstance(valeur, list):
+            valeur = tuple(valeur)
+        if not est_du_type(valeur, defaut):
+            if attendu is tuple:
+                attendu_nom = f'tuple de {len(defaut)} {type(defaut[0]).__name__}'
+            else:
+                attendu_nom = attendu.__name__
+            raise ValueError(f'{fichier}, ligne {instruction.lineno} : {nom} doit être de type {attendu_nom}')
+        valeurs[nom] = valeur
+    return Configuration(**valeurs)
+
+
+def est_du_type(valeur, defaut):
+    """
+    Vérifie qu'une valeur lue a le type de la valeur par défaut d'un réglage ; un tuple doit en avoir aussi la
+    longueur et le type des éléments.
+
+    :param valeur: valeur lue dans le fichier
+    :param defaut: valeur par défaut du réglage
+    :rtype: bool
+
+    .. note:: un booléen n'est pas accepté là où un entier est attendu
+    """
+    if isinstance(defaut, tuple):
+        return isinstance(valeur, tuple) and len(valeur) == len(defaut) \
+            and all(est_du_type(element, attendu) for element, attendu in zip(valeur, defaut))
+    return isinstance(valeur, type(defaut)) and not (type(defaut) is int and isinstance(valeur, bool))
@@ -0,0 +1,259 @@
+"""
+    PROJET LANCELOT - enregistrement et relecture des parties
+    =========================================================
+
+    Une partie est enregistrée sous forme d'un journal compact : la suite des mouvements demandés au moteur
+    (une lettre G/D/H/B par appel à Partie.deplacer) et la suite des réponses données aux questions des
+    portes (dans l'ordre où poser_question les a demandées). Le moteur étant déterministe, ce journal suffit
+    à reproduire exactement la partie.
+
+    La relecture se fait sans rendu, à pleine vitesse (aucun observateur abonné, voir Partie), et ne trace
+    que l'état final ou quelques images choisies. L'état final enregistré (position, nombre d'objets,
+    victoire) permet de vérifier en quelques secondes des milliers de parties enregistrées.
+
+    Format du journal (JSON, UTF-8) :
+        {"version": 1, "plan": crc32 du plan initial, "depart": [ligne, colonne],
+         "mouvements": "DDBBG...", "reponses": ["42", null, ...],
+         "final": {"position": [ligne, colonne], "objets": n, "gagne": bool}}
+
+    Usage : python -m lancelot.enregistrement partie1.json [partie2.json ...] [--image 120 --image 250] [--final]
+                                     [--niveau plan dico_objets dico_portes]
+            code de sortie 1 si une partie ne retrouve pas son état final enregistré
+
+    Dependencies : CONFIGS.py, moteur.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import argparse
+import json
+import zlib
+
+from .CONFIGS import POSITION_DEPART, fichier_plan, fichier_objets, fichier_questions
+from .moteur import Partie, lire_matrice, creer_dictionnaire, LETTRES_MOUVEMENTS, MUR, SORTIE, PORTE, OBJET, VUE
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+VERSION = 1
+MOUVEMENTS_LETTRES = {lettre: mouvement for mouvement, lettre in LETTRES_MOUVEMENTS.items()}
+SYMBOLES = {MUR: '#', SORTIE: 'S', PORTE: 'P', OBJET: 'o', VUE: '.'}  # les couloirs sont des espaces
+DEMI_FENETRE = (10, 20)  # demi-hauteur et demi-largeur (en cases) des images tracées en texte
+
+
+# ======================================================================================================================
+# III. ENREGISTREMENT
+# ======================================================================================================================
+
+def empreinte_plan(plan):
+    """
+    Calcule l'empreinte (crc32) d'un plan, pour vérifier qu'une partie est rejouée sur son niveau.
+
+    :param plan: plan du chateau
+    :type plan: Plan
+    :rtype: int
+    """
+    return zlib.crc32(plan.cases)
+
+
+class Enregistreur:
+    """
+    Enregistre les mouvements et les réponses d'une partie.
+
+    Le fournisseur de réponses de la partie est remplacé par un fournisseur qui note chaque réponse ;
+    les mouvements doivent passer par Enregistreur.deplacer() au lieu de Partie.deplacer().
+
+    :param partie: partie à enregistrer, dans son état initial
+    :type partie: Partie
+
+    .. warning:: une partie reprise d'une sauvegarde (Sauvegarde.restauree) n'est plus dans l'état initial de
+                 son niveau : son journal ne se rejouerait pas
+    """
+
+    def __init__(self, partie):
+        self.partie = partie
+        self.plan = empreinte_plan(partie.plan)
+        self.depart = partie.position
+        self.mouvements = []  # lettres des mouvements
+        self.reponses = []
+        self.fournisseur = partie.fournisseur
+        partie.fournisseur = self.repondre
+
+    def repondre(self, question, porte):
+        """
+        Fournisseur de réponses : interroge le fournisseur d'origine et note sa réponse.
+
+        :param question: question posée par le garde de la porte
+        :param porte: position de la porte
+        :type question: str
+        :type porte: tuple[int, int]
+        :return: la réponse (None si le joueur ne répond pas)
+        :rtype: str or None
+        """
+        reponse = self.fournisseur(question, porte) if self.fournisseur is not None else None
+        self.reponses.append(reponse)
+        return reponse
+
+    def deplacer(self, mouvement):
+        """
+        Note le mouvement puis l'applique à la partie.
+
+        :param mouvement: mouvement demandé
+        :type mouvement: tuple[int, int]
+        :return: la position du personnage après le déplacement
+        :rtype: tuple[int, int]
+        """
+        self.mouvements.append(LETTRES_MOUVEMENTS[mouvement])
+        return self.partie.deplacer(mouvement)
+
+    def journal(self):
+        """
+        Renvoie le journal de la partie, état final compris.
+
+        :rtype: dict
+        """
+        return {'version': VERSION, 'plan': self.plan, 'depart': list(self.depart),
+                'mouvements': ''.join(self.mouvements), 'reponses': self.reponses,
+                'final': etat_final(self.partie)}
+
+    def sauvegarder(self, fichier):
+        """
+        Ecrit le journal de la partie dans un fichier JSON.
+
+        :param fichier: chemin du journal
+        :type fichier: str
+        """
+        with open(fichier, 'w', encoding='UTF-8') as fichier_out:
+            json.dump(self.journal(), fichier_out, separators=(',', ':'))
+
+
+def etat_final(partie):
+    """
+    Résume l'état d'une partie pour la vérification des relectures.
+
+    :param partie: partie
+    :type partie: Partie
+    :rtype: dict
+    """
+    return {'position': list(partie.position), 'objets': len(partie.inventaire), 'gagne': partie.gagne}
+
+
+def lire_journal(fichier):
+    """
+    Lit un journal écrit par Enregistreur.sauvegarder().
+
+    :param fichier: chemin du journal
+    :type fichier: str
+    :rtype: dict
+    :raise ValueError: si le fichier n'est pas un journal de la version courante
+    """
+    with open(fichier, encoding='UTF-8') as fichier_in:
+        journal = json.load(fichier_in)
+    if journal.get('version') != VERSION:
+        raise ValueError(f'{fichier} n\'est pas un journal de partie (version {VERSION})')
+    if journal['mouvements'].strip('GDHB'):
+        raise ValueError(f'{fichier} : mouvement inconnu dans le journal')
+    return journal
+
+
+# ======================================================================================================================
+# IV. RELECTURE
+# ======================================================================================================================
+
+def rejouer(partie, journal, images=(), capturer=None):
+    """
+    Rejoue un journal sur une partie dans son état initial, à pleine vitesse.
+
+    :param partie: partie à faire jouer (ses observateurs éventuels reçoivent tous les événements)
+    :param journal: journal de la partie
+    :param images: numéros des mouvements après lesquels capturer une image (0 : avant le premier)
+    :param capturer: fonction appelée avec le numéro du mouvement et la partie, pour chaque image
+    :type partie: Partie
+    :type journal: dict
+    :type images: iterable[int]
+    :type capturer: callable or None
+    :return: la partie, dans son état final
+    :rtype: Partie
+
+    .. note:: les réponses sont redonnées dans l'ordre enregistré ; une question de plus que prévu
+              (journal rejoué sur un autre niveau) reçoit None
+    """
+    reponses = iter(journal['reponses'])
+    partie.fournisseur = lambda question, porte: next(reponses, None)
+    mouvements = [MOUVEMENTS_LETTRES[lettre] for lettre in journal['mouvements']]
+    deplacer = partie.deplacer
+    numero = 0
+    for image in sorted(set(images)):
+        for mouvement in mouvements[numero:image]:
+            deplacer(mouvement)
+        numero = max(numero, image)
+        if capturer is not None and image <= len(mouvements):
+            capturer(image, partie)
+    for mouvement in mouvements[numero:]:
+        deplacer(mouvement)
+    return partie
+
+
+def tracer_texte(partie, demi_fenetre=DEMI_FENETRE):
+    """
+    Trace en texte la partie du plan autour du personnage (@).
+
+    :param partie: partie à tracer
+    :param demi_fenetre: demi-hauteur et demi-largeur de la zone tracée, en cases
+    :type partie: Partie
+    :type demi_fenetre: tuple[int, int]
+    :rtype: str
+    """
+    plan = partie.plan
+    ligne_perso, colonne_perso = partie.position
+    premiere_colonne = max(colonne_perso - demi_fenetre[1], 0)
+    derniere_colonne = min(colonne_perso + demi_fenetre[1] + 1, plan.nb_colonnes)
+    lignes = []
+    for ligne in range(max(ligne_perso - demi_fenetre[0], 0), min(ligne_perso + demi_fenetre[0] + 1, plan.nb_lignes)):
+        rangee = plan.ligne(ligne)
+        lignes.append(''.join('@' if (ligne, colonne) == partie.position else SYMBOLES.get(rangee[colonne], ' ')
+                              for colonne in range(premiere_colonne, derniere_colonne)))
+    return '\n'.join(lignes)
+
+
+# ======================================================================================================================
+# V. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description='Rejoue et vérifie des parties enregistrées.')
+    analyseur.add_argument('journaux', nargs='+', help='journaux de parties (JSON)')
+    analyseur.add_argument('--niveau', nargs=3, metavar=('PLAN', 'OBJETS', 'PORTES'),
+                           default=(fichier_plan, fichier_objets, fichier_questions), help='fichiers du niveau')
+    analyseur.add_argument('--image', type=int, action='append', default=[],
+                           help='trace l\'image après ce numéro de mouvement (répétable)')
+    analyseur.add_argument('--final', action='store_true', help='trace l\'image de l\'état final')
+    arguments = analyseur.parse_args()
+    plan_initial = lire_matrice(arguments.niveau[0])
+    dict_objet, dict_porte = creer_dictionnaire(arguments.niveau[1]), creer_dictionnaire(arguments.niveau[2])
+    empreinte = empreinte_plan(plan_initial)
+    nb_echecs = 0
+
+    def afficher_image(numero_mouvement, partie_en_cours):
+        print(f'--- après {numero_mouvement} mouvements, position {partie_en_cours.position}')
+        print(tracer_texte(partie_en_cours))
+
+    for fichier_journal in arguments.journaux:
+        journal_partie = lire_journal(fichier_journal)
+        if journal_partie['plan'] != empreinte:
+            print(f'{fichier_journal} : enregistré sur un autre plan')
+            nb_echecs += 1
+            continue
+        partie_rejouee = rejouer(Partie(plan_initial.copier(), dict_objet, dict_porte,
+                                        tuple(journal_partie.get('depart', POSITION_DEPART))),
+                                 journal_partie, arguments.image, afficher_image)
+        if arguments.final:
+            afficher_image(len(journal_partie['mouvements']), partie_rejouee)
+        if etat_final(partie_rejouee) != journal_partie['final']:
+            print(f'{fichier_journal} : état final {etat_final(partie_rejouee)} au lieu de {journal_partie["final"]}')
+            nb_echecs += 1
+    print(f'{len(arguments.journaux) - nb_echecs} / {len(arguments.journaux)} parties conformes.')
+    if nb_echecs:
+        analyseur.exit(1)
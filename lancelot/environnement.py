@@ -0,0 +1,236 @@
+"""
+    PROJET LANCELOT - environnement vectorisé pour agents automatiques
+    ==================================================================
+
+    Fait jouer en parallèle N copies indépendantes d'un même niveau, pour les agents automatiques et les
+    campagnes de tests de jouabilité. Toutes les copies avancent ensemble : chaque pas reçoit une action par
+    copie et applique en bloc, avec NumPy, les règles de moteur.Partie :
+        - deplacer : pas de sortie du plan, les murs bloquent, plus aucun mouvement depuis la sortie, la case
+          quittée devient une case vue (sauf un escalier) ;
+        - ramasser_objet : l'objet entre dans l'inventaire et sa case devient un couloir ;
+        - poser_question : comme dans le solveur, une porte s'ouvre (et le personnage y entre) quand la copie
+          a ramassé tous les objets qui définissent les indices cités dans sa question.
+
+    L'état est fait de tableaux empilés : les cases de chaque copie (N x nombre de cases), la position de
+    chaque personnage et son inventaire, un ensemble de bits par copie (un bit par objet de dict_objet, par
+    mots de 64 bits). Une copie qui atteint la sortie (ou la limite de pas) est remise au départ dans le même
+    pas.
+
+    Actions : indices dans ACTIONS (0 : gauche, 1 : droite, 2 : haut, 3 : bas).
+
+    .. note:: les cases de chaque copie sont gardées en mémoire : N x nombre de cases octets
+
+    Dependencies : CONFIGS.py, moteur.py, indices.py, NumPy
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import numpy as np
+
+from .CONFIGS import POSITION_DEPART
+from .indices import dependances_portes
+from .moteur import COULOIR, MUR, SORTIE, PORTE, OBJET, VUE, ESCALIER, GAUCHE, DROITE, HAUT, BAS
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+ACTIONS = (GAUCHE, DROITE, HAUT, BAS)
+DELTAS_LIGNES = np.array([action[0] for action in ACTIONS], dtype=np.int64)
+DELTAS_COLONNES = np.array([action[1] for action in ACTIONS], dtype=np.int64)
+RECOMPENSE_PAS = -0.01  # chaque pas coûte un peu : les chemins courts sont préférés
+RECOMPENSE_OBJET = 0.1
+RECOMPENSE_SORTIE = 1.0
+TAILLE_MOT = 64  # bits par mot des inventaires
+
+
+# ======================================================================================================================
+# III. ENVIRONNEMENT
+# ======================================================================================================================
+
+class Environnement:
+    """
+    N copies d'un niveau, avancées ensemble par pas().
+
+    :param plan: plan du chateau
+    :param dict_objet: dictionnaire position -> objet
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :param nombre: nombre de copies
+    :param depart: position de départ des personnages
+    :param rayon_vue: 0 : les observations sont les positions ; sinon, les cases autour de chaque personnage,
+                      dans un carré de 2 x rayon_vue + 1 cases de côté (hors du plan : des murs)
+    :param pas_max: nombre de pas après lequel une copie est remise au départ (0 : pas de limite)
+    :param exiger_indices: si False, toute porte s'ouvre (joueur qui devine), comme avec reponses_fixes()
+    :type plan: Plan
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :type nombre: int
+    :type depart: tuple[int, int]
+    :type rayon_vue: int
+    :type pas_max: int
+    :type exiger_indices: bool
+
+    .. note:: une porte qui dépend d'un objet absent du plan ne s'ouvre jamais (comme dans le solveur)
+    """
+
+    def __init__(self, plan, dict_objet, dict_porte, nombre, depart=POSITION_DEPART, rayon_vue=0, pas_max=0,
+                 exiger_indices=True):
+        nb_cases = plan.nb_lignes * plan.nb_colonnes
+        self.nb_lignes, self.nb_colonnes = nb_lignes, nb_colonnes = plan.nb_lignes, plan.nb_colonnes
+        self.nombre = nombre
+        self.depart = depart
+        self.rayon_vue = rayon_vue
+        self.pas_max = pas_max
+        self.initiales = np.frombuffer(bytes(plan.cases), dtype=np.uint8)
+        self.bases = np.arange(nombre, dtype=np.int64) * nb_cases  # début des cases de chaque copie, à plat
+
+        # objets : un bit par objet du dictionnaire présent sur le plan
+        objets = sorted(position for position in dict_objet
+                        if 0 <= position[0] < nb_lignes and 0 <= position[1] < nb_colonnes
+                        and plan[position] == OBJET)
+        self.objets = objets
+        self.rang_objet = np.full(nb_cases, -1, dtype=np.int64)  # case -> bit de son objet
+        for rang, (ligne, colonne) in enumerate(objets):
+            self.rang_objet[ligne * nb_colonnes + colonne] = rang
+        self.nb_mots = max(-(-len(objets) // TAILLE_MOT), 1)
+
+        # portes : masque des objets nécessaires et possibilité d'ouverture
+        dependances = dependances_portes(dict_objet, dict_porte) if exiger_indices else {}
+        portes = sorted(dict_porte)
+        self.rang_porte = np.full(nb_cases, len(portes), dtype=np.int64)  # case -> rang de sa porte
+        self.requis = np.zeros((len(portes) + 1, self.nb_mots), dtype=np.uint64)
+        self.ouvrables = np.ones(len(portes) + 1, dtype=bool)
+        self.ouvrables[len(portes)] = False  # case porte sans entrée dans dict_porte : jamais ouverte
+        rangs_objets = {position: rang for rang, position in enumerate(objets)}
+        for rang, (ligne, colonne) in enumerate(portes):
+            if 0 <= ligne < nb_lignes and 0 <= colonne < nb_colonnes:
+                self.rang_porte[ligne * nb_colonnes + colonne] = rang
+            for position in dependances.get((ligne, colonne), ()):
+                if position not in rangs_objets:
+                    self.ouvrables[rang] = False
+                    continue
+                bit = rangs_objets[position]
+                self.requis[rang, bit // TAILLE_MOT] |= np.uint64(1 << bit % TAILLE_MOT)
+
+        # état des copies
+        self.cases = np.tile(self.initiales, nombre)  # cases de toutes les copies, à plat
+        self.lignes = np.full(nombre, depart[0], dtype=np.int64)
+        self.colonnes = np.full(nombre, depart[1], dtype=np.int64)
+        self.inventaires = np.zeros((nombre, self.nb_mots), dtype=np.uint64)
+        self.nb_pas = np.zeros(nombre, dtype=np.int64)
+        if rayon_vue:
+            deltas = np.arange(-rayon_vue, rayon_vue + 1, dtype=np.int64)
+            self.vue_lignes = np.repeat(deltas, deltas.size)
+            self.vue_colonnes = np.tile(deltas, deltas.size)
+
+    # Etat
+    # ----
+
+    def reinitialiser(self, copies=None):
+        """
+        Remet des copies au départ : plan initial, position de départ, inventaire vide.
+
+        :param copies: masque ou indices des copies à remettre au départ (None : toutes)
+        :type copies: numpy.ndarray or None
+        :return: les observations de toutes les copies
+        :rtype: numpy.ndarray
+        """
+        if copies is None:
+            copies = np.arange(self.nombre)
+        elif copies.dtype == bool:
+            copies = np.flatnonzero(copies)
+        if copies.size:
+            nb_cases = self.initiales.size
+            self.cases.reshape(self.nombre, nb_cases)[copies] = self.initiales
+            self.lignes[copies] = self.depart[0]
+            self.colonnes[copies] = self.depart[1]
+            self.inventaires[copies] = 0
+            self.nb_pas[copies] = 0
+        return self.observations()
+
+    def observations(self):
+        """
+        Renvoie les observations de toutes les copies.
+
+        :return: positions (N x 2) si rayon_vue vaut 0, sinon cases autour de chaque personnage
+                 (N x (2 x rayon_vue + 1) x (2 x rayon_vue + 1))
+        :rtype: numpy.ndarray
+        """
+        if not self.rayon_vue:
+            return np.stack((self.lignes, self.colonnes), axis=1)
+        lignes = self.lignes[:, None] + self.vue_lignes
+        colonnes = self.colonnes[:, None] + self.vue_colonnes
+        dedans = (lignes >= 0) & (lignes < self.nb_lignes) & (colonnes >= 0) & (colonnes < self.nb_colonnes)
+        vues = self.cases[self.bases[:, None] + np.where(dedans, lignes * self.nb_colonnes + colonnes, 0)]
+        vues[~dedans] = MUR
+        cote = 2 * self.rayon_vue + 1
+        return vues.reshape(self.nombre, cote, cote)
+
+    def nb_objets(self):
+        """
+        Compte les objets ramassés par chaque copie.
+
+        :rtype: numpy.ndarray
+        """
+        return np.unpackbits(self.inventaires.view(np.uint8), axis=1).sum(axis=1)
+
+    # Pas
+    # ---
+
+    def pas(self, actions):
+        """
+        Applique une action par copie, avec les règles du moteur.
+
+        :param actions: indice dans ACTIONS de l'action de chaque copie
+        :type actions: numpy.ndarray
+        :return: les observations (après remise au départ des copies finies), les récompenses et les copies
+                 finies (sortie atteinte ou limite de pas)
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """
+        cases, bases, nb_colonnes = self.cases, self.bases, self.nb_colonnes
+        actions = np.asarray(actions)
+        lignes_fin = self.lignes + DELTAS_LIGNES[actions]
+        colonnes_fin = self.colonnes + DELTAS_COLONNES[actions]
+        positions = bases + self.lignes * nb_colonnes + self.colonnes  # cases des personnages, à plat
+        possibles = (lignes_fin >= 0) & (lignes_fin < self.nb_lignes) & (colonnes_fin >= 0) \
+            & (colonnes_fin < nb_colonnes) & (cases[positions] != SORTIE)
+        arrivees = np.where(possibles, lignes_fin * nb_colonnes + colonnes_fin, 0)  # dans le plan, à plat
+        types_fin = cases[bases + arrivees]
+
+        # poser_question : la porte s'ouvre si tous ses objets ont été ramassés
+        devant_porte = np.flatnonzero(possibles & (types_fin == PORTE))
+        if devant_porte.size:
+            portes = self.rang_porte[arrivees[devant_porte]]
+            requis = self.requis[portes]
+            ouvertes = devant_porte[((self.inventaires[devant_porte] & requis) == requis).all(axis=1)
+                                    & self.ouvrables[portes]]
+            types_fin[ouvertes] = COULOIR  # la porte devient un couloir, le personnage y entre
+            cases[bases[ouvertes] + arrivees[ouvertes]] = COULOIR
+
+        # deplacer : la case quittée devient vue, sauf un escalier
+        bougent = np.flatnonzero(possibles & (types_fin != MUR) & (types_fin != PORTE))
+        quittees = positions[bougent]
+        cases[quittees[cases[quittees] != ESCALIER]] = VUE
+        self.lignes[bougent] = lignes_fin[bougent]
+        self.colonnes[bougent] = colonnes_fin[bougent]
+        self.nb_pas += 1
+        recompenses = np.full(self.nombre, RECOMPENSE_PAS)
+
+        # ramasser_objet : bit de l'objet dans l'inventaire, la case devient un couloir
+        ramassent = bougent[types_fin[bougent] == OBJET]
+        if ramassent.size:
+            cases[bases[ramassent] + arrivees[ramassent]] = COULOIR
+            bits = self.rang_objet[arrivees[ramassent]]
+            connus = bits >= 0  # case objet sans entrée dans dict_objet : pas de bit
+            ramassent, bits = ramassent[connus], bits[connus]
+            self.inventaires[ramassent, bits // TAILLE_MOT] |= np.left_shift(np.uint64(1),
+                                                                             (bits % TAILLE_MOT).astype(np.uint64))
+            recompenses[ramassent] += RECOMPENSE_OBJET
+
+        finies = np.zeros(self.nombre, dtype=bool)
+        finies[bougent[types_fin[bougent] == SORTIE]] = True
+        recompenses[finies] += RECOMPENSE_SORTIE
+        if self.pas_max:
+            finies |= self.nb_pas >= self.pas_max
+        return self.reinitialiser(finies), recompenses, finies
@@ -0,0 +1,295 @@
+"""
+    PROJET LANCELOT - chateaux à plusieurs étages
+    =============================================
+
+    Un chateau à étages est un dossier qui contient :
+        - un sous-dossier etage_<n> par étage (n entier), avec son plan (plan_chateau.txt ou plan_chateau.bin),
+          dico_objets.txt et dico_portes.txt, comme un niveau d'un lot (lot.py) ; chaque étage est compilé
+          dans etage_<n>/niveau.lvl (niveau.py) ;
+        - escaliers.txt : une ligne par escalier, (étage, (ligne, colonne)), (étage d'arrivée, (ligne, colonne)),
+          les deux cases étant des escaliers (ESCALIER). Le chemin inverse est ajouté s'il n'est pas décrit.
+
+    Seuls quelques étages sont gardés en mémoire, dans un cache LRU de taille réglable : l'étage courant et ceux
+    où mènent ses escaliers les plus proches du personnage. Ces voisins sont chargés (et préparés pour le rendu)
+    par un fil d'exécution d'arrière-plan dès l'arrivée sur un étage, avant que le personnage n'atteigne un
+    escalier : le changement d'étage ne fait alors que changer le plan de la partie.
+
+    Les changements d'un étage (portes ouvertes, objets ramassés, cases vues) sont notés au fil de la partie et
+    réappliqués quand un étage sorti du cache est rechargé. La mémoire reste ainsi bornée quel que soit le
+    nombre d'étages : taille du cache fois taille d'un étage, plus les cases modifiées.
+
+    Dependencies : CONFIGS.py, moteur.py, niveau.py, lot.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .CONFIGS import POSITION_DEPART, TAILLE_CACHE_ETAGES
+from .lot import NOMS_PLAN, NOM_OBJETS, NOM_PORTES
+from .moteur import Partie, creer_dictionnaire, ESCALIER
+from .niveau import charger_niveau
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+FICHIER_ESCALIERS = 'escaliers.txt'
+NOM_NIVEAU = 'niveau.lvl'  # étage compilé, dans le dossier de l'étage
+
+Etage = namedtuple('Etage', 'plan dict_objet dict_porte')
+
+
+# ======================================================================================================================
+# III. ESCALIERS
+# ======================================================================================================================
+
+def lire_escaliers(fichier):
+    """
+    Lit les escaliers d'un chateau et complète les chemins inverses.
+
+    :param fichier: chemin de escaliers.txt
+    :type fichier: str
+    :return: dictionnaire (étage, position) de l'escalier -> (étage, position) d'arrivée
+    :rtype: dict[tuple[int, tuple[int, int]], tuple[int, tuple[int, int]]]
+    :raise ValueError: si une ligne n'est pas de la forme (étage, (ligne, colonne)), (étage, (ligne, colonne))
+    """
+    escaliers = creer_dictionnaire(fichier)
+    for depart, arrivee in list(escaliers.items()):
+        for extremite in (depart, arrivee):
+            if not (isinstance(extremite, tuple) and len(extremite) == 2 and isinstance(extremite[0], int)
+                    and isinstance(extremite[1], tuple) and len(extremite[1]) == 2):
+                raise ValueError(f'{fichier} : {extremite} n\'est pas de la forme (étage, (ligne, colonne))')
+        escaliers.setdefault(arrivee, depart)
+    return escaliers
+
+
+# ======================================================================================================================
+# IV. CHATEAU
+# ======================================================================================================================
+
+class Chateau:
+    """
+    Chateau à étages : cache LRU des étages, préchargement des étages voisins et changements d'étage.
+
+    :param dossier: dossier du chateau
+    :param taille_cache: nombre d'étages gardés en mémoire (au moins 1 ; l'étage courant en fait partie)
+    :param preparer: fonction appelée sur le plan de chaque étage chargé, dans le fil de préchargement
+                     (par exemple RenduBitmap.preparer), ou None
+    :type dossier: str
+    :type taille_cache: int
+    :type preparer: callable or None
+
+    .. note:: le cache est partagé entre le fil du jeu et le fil de préchargement, sous un verrou
+    """
+
+    def __init__(self, dossier, taille_cache=TAILLE_CACHE_ETAGES, preparer=None):
+        self.dossier = dossier
+        self.escaliers = lire_escaliers(os.path.join(dossier, FICHIER_ESCALIERS))
+        self.voisins = {}  # étage -> (position de l'escalier, étage d'arrivée) de ses escaliers
+        for (etage, position), (arrivee, _) in self.escaliers.items():
+            self.voisins.setdefault(etage, []).append((position, arrivee))
+        self.taille_cache = max(taille_cache, 1)
+        self.preparer = preparer
+        self.cache = OrderedDict()  # étage -> Future de son chargement, du moins au plus récemment utilisé
+        self.modifications = {}  # étage -> {indice à plat: type} des cases changées pendant la partie
+        self.verrou = threading.Lock()
+        self.executeur = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prechargement')
+        self.etage = None  # étage courant
+        self.partie = None
+
+    # Chargement et cache
+    # -------------------
+
+    def charger(self, etage):
+        """
+        Charge un étage (compilé au besoin) et lui réapplique ses changements.
+
+        :param etage: numéro de l'étage
+        :type etage: int
+        :rtype: Etage
+        :raise ValueError: si l'étage n'existe pas ou est invalide
+        """
+        dossier = os.path.join(self.dossier, f'etage_{etage}')
+        fichier_plan = next((os.path.join(dossier, nom) for nom in NOMS_PLAN
+                             if os.path.exists(os.path.join(dossier, nom))), None)
+        if fichier_plan is None:
+            raise ValueError(f'{dossier} : étage introuvable')
+        plan, dict_objet, dict_porte = charger_niveau(fichier_plan, os.path.join(dossier, NOM_OBJETS),
+                                                      os.path.join(dossier, NOM_PORTES),
+                                                      os.path.join(dossier, NOM_NIVEAU))
+        with self.verrou:
+            modifications = list(self.modifications.get(etage, {}).items())
+        cases = plan.cases
+        for indice, type_case in modifications:
+            cases[indice] = type_case
+        if self.preparer is not None:
+            self.preparer(plan)
+        return Etage(plan, dict_objet, dict_porte)
+
+    def obtenir(self, etage):
+        """
+        Renvoie un étage, depuis le cache s'il y est (en attendant la fin de son préchargement s'il est en
+        cours), sinon en le chargeant tout de suite.
+
+        :param etage: numéro de l'étage
+        :type etage: int
+        :rtype: Etage
+        """
+        with self.verrou:
+            futur = self.cache.pop(etage, None)
+            if futur is not None and futur.cancel():  # préchargement pas encore commencé : fait ici
+                futur = None
+            a_charger = futur is None
+            if a_charger:
+                futur = Future()
+            self.cache[etage] = futur  # le cache n'est réduit qu'au préchargement, une fois l'étage courant changé
+        if a_charger:
+            try:
+                futur.set_result(self.charger(etage))
+            except (OSError, ValueError) as erreur:
+                futur.set_exception(erreur)
+                with self.verrou:
+                    self.cache.pop(etage, None)
+        return futur.result()
+
+    def evincer(self):
+        """
+        Retire du cache les étages les moins récemment utilisés au-delà de sa taille (jamais l'étage courant).
+
+        .. warning:: à appeler sous le verrou
+        .. note:: le plan d'un étage évincé est fermé par le fil de préchargement, après les tâches déjà
+                  lancées qui pourraient encore le lire
+        """
+        for etage in list(self.cache):
+            if len(self.cache) <= self.taille_cache:
+                break
+            if etage != self.etage:
+                self.executeur.submit(fermer_etage, self.cache.pop(etage))
+
+    def precharger(self, position=None):
+        """
+        Lance le chargement en arrière-plan des étages où mènent les escaliers de l'étage courant, des plus
+        proches aux plus lointains du personnage, dans la limite du cache. Les étages déjà en mémoire sont
+        seulement préparés à nouveau pour le rendu (l'étage que l'on vient de quitter a pu changer).
+
+        :param position: position du personnage (défaut : celle de la partie)
+        :type position: tuple[int, int] or None
+        """
+        ligne, colonne = position if position is not None else self.partie.position
+        voisins = sorted(self.voisins.get(self.etage, ()),
+                         key=lambda voisin: abs(voisin[0][0] - ligne) + abs(voisin[0][1] - colonne))
+        arrivees = []
+        for _, arrivee in voisins:
+            if arrivee != self.etage and arrivee not in arrivees:
+                arrivees.append(arrivee)
+        arrivees = arrivees[:self.taille_cache - 1]
+        with self.verrou:
+            for etage in reversed(arrivees):  # le plus proche devient le plus récemment utilisé
+                if etage not in self.cache:
+                    self.cache[etage] = self.executeur.submit(self.charger, etage)
+                elif self.preparer is not None:
+                    self.executeur.submit(self.preparer_etage, self.cache[etage])
+                self.cache.move_to_end(etage)
+            if self.etage in self.cache:
+                self.cache.move_to_end(self.etage)
+            self.evincer()
+
+    def preparer_etage(self, futur):
+        """
+        Prépare pour le rendu un étage déjà chargé, dans le fil de préchargement.
+
+        :param futur: chargement de l'étage
+        :type futur: concurrent.futures.Future
+        """
+        if not futur.cancelled() and futur.exception() is None:
+            self.preparer(futur.result().plan)
+
+    def fermer(self):
+        """
+        Arrête le préchargement et ferme les plans des étages en mémoire.
+
+        .. note:: seuls les chargements pas encore commencés sont annulés : les fermetures d'étages évincés
+                  déjà demandées au fil de préchargement sont faites avant son arrêt
+        """
+        with self.verrou:
+            for futur in self.cache.values():
+                futur.cancel()
+        self.executeur.shutdown(wait=True)
+        with self.verrou:
+            for futur in self.cache.values():
+                fermer_etage(futur)
+            self.cache.clear()
+
+    # Partie
+    # ------
+
+    def commencer(self, etage=0, position=POSITION_DEPART, fournisseur=None):
+        """
+        Crée la partie sur un étage du chateau.
+
+        :param etage: étage de départ
+        :param position: position de départ
+        :param fournisseur: fournisseur de réponses aux questions des portes
+        :type etage: int
+        :type position: tuple[int, int]
+        :type fournisseur: callable or None
+        :rtype: Partie
+
+        .. note:: les étages voisins sont préchargés au premier appel de precharger(), une fois le rendu prêt
+        """
+        self.etage = etage
+        depart = self.obtenir(etage)
+        self.partie = Partie(depart.plan, depart.dict_objet, depart.dict_porte, position, fournisseur)
+        self.partie.abonner(self.observer)
+        return self.partie
+
+    def observer(self, evenement, *arguments):
+        """
+        Observateur du moteur : note les changements de l'étage courant et fait changer d'étage.
+
+        :param evenement: nom de l'événement
+        :param arguments: arguments de l'événement
+        :type evenement: str
+        """
+        if evenement == 'case':
+            (ligne, colonne), type_case = arguments
+            with self.verrou:
+                self.modifications.setdefault(self.etage, {})[ligne * self.partie.plan.nb_colonnes + colonne] = \
+                    type_case
+        elif evenement == 'escalier':
+            self.emprunter(arguments[0])
+
+    def emprunter(self, position):
+        """
+        Fait prendre au personnage l'escalier sur lequel il se trouve.
+
+        :param position: position de l'escalier sur l'étage courant
+        :type position: tuple[int, int]
+        """
+        arrivee = self.escaliers.get((self.etage, position))
+        if arrivee is None:
+            return
+        etage, position_arrivee = arrivee
+        suivant = self.obtenir(etage)
+        if suivant.plan[position_arrivee] != ESCALIER:
+            raise ValueError(f'étage {etage} : pas d\'escalier en {position_arrivee}')
+        self.etage = etage
+        self.partie.changer_plan(suivant.plan, suivant.dict_objet, suivant.dict_porte, position_arrivee)
+        self.partie.notifier('annonce', f'Etage {etage}')
+        self.precharger(position_arrivee)
+
+
+def fermer_etage(futur):
+    """
+    Ferme le plan d'un étage sorti du cache (chargement annulé ou en échec : rien à fermer).
+
+    :param futur: chargement de l'étage
+    :type futur: concurrent.futures.Future
+    """
+    if not futur.cancelled() and futur.exception() is None:
+        futur.result().plan.fermer()
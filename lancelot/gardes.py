@@ -0,0 +1,298 @@
+"""
+    PROJET LANCELOT - gardes en ronde
+    =================================
+
+    Gardes qui parcourent le plan à chaque tic de la boucle de jeu, en plus de ceux qui posent les questions
+    des portes. Ils suivent les règles de déplacement du personnage (moteur.Partie.deplacer) : ils ne sortent
+    pas du plan, n'entrent ni dans un mur ni dans une porte fermée, et ne quittent pas la sortie. Deux gardes
+    n'occupent jamais la même case, et un garde n'entre pas sur la case du personnage. Les collisions ne valent
+    que pour les gardes : le moteur ne connaît pas les gardes, le personnage peut donc passer sur leur case (un
+    garde ne fait que le repérer).
+
+    A chaque tic, chaque garde avance dans sa direction ; il en change au hasard (PROBABILITE_VIRAGE) ou
+    quand il est bloqué. Il repère le personnage quand celui-ci est à moins de RAYON_DETECTION_GARDES cases
+    (distance de Manhattan).
+
+    Avec NumPy, le tic est calculé en bloc pour tous les gardes (cases d'arrivée, collisions, repérage) sur
+    les cases du plan vues comme un tableau, sans copie : portes ouvertes et objets ramassés sont vus tout de
+    suite. Sans NumPy, il est calculé garde par garde en python pur, suffisant pour quelques dizaines de
+    gardes.
+
+    Les gardes notifient les observateurs de la partie ('gardes', voir moteur.py) : le rendu ne retrace que
+    les gardes déplacés dans sa vue.
+
+    Dependencies : CONFIGS.py, moteur.py, NumPy (optionnel)
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import random
+
+from .CONFIGS import RAYON_DETECTION_GARDES
+from .moteur import COULOIR, MUR, SORTIE, PORTE, GAUCHE, DROITE, HAUT, BAS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : tic calculé garde par garde
+    np = None
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+MOUVEMENTS = (GAUCHE, DROITE, HAUT, BAS)  # direction d'un garde : indice dans MOUVEMENTS
+PROBABILITE_VIRAGE = 0.1  # probabilité qu'un garde change de direction à chaque tic sans être bloqué
+
+if np is not None:
+    DELTAS_LIGNES = np.array([mouvement[0] for mouvement in MOUVEMENTS], dtype=np.int64)
+    DELTAS_COLONNES = np.array([mouvement[1] for mouvement in MOUVEMENTS], dtype=np.int64)
+
+
+# ======================================================================================================================
+# III. PLACEMENT
+# ======================================================================================================================
+
+def placer_gardes(plan, nombre, exclues=(), graine=None):
+    """
+    Tire des cases de couloir distinctes où poster des gardes.
+
+    :param plan: plan du chateau
+    :param nombre: nombre de gardes voulu
+    :param exclues: positions interdites (par exemple celle du personnage)
+    :param graine: graine du tirage (None : tirage non reproductible)
+    :type plan: Plan
+    :type nombre: int
+    :type exclues: iterable[tuple[int, int]]
+    :type graine: int or None
+    :return: positions des gardes (moins de nombre s'il n'y a pas assez de couloirs)
+    :rtype: list[tuple[int, int]]
+    """
+    nb_colonnes = plan.nb_colonnes
+    interdites = {ligne * nb_colonnes + colonne for ligne, colonne in exclues}
+    if np is not None:
+        libres = np.flatnonzero(np.frombuffer(plan.cases, dtype=np.uint8) == COULOIR)
+        libres = libres[~np.isin(libres, list(interdites))]
+        choisies = np.random.default_rng(graine).choice(libres, min(nombre, libres.size), replace=False)
+        return [divmod(int(indice), nb_colonnes) for indice in choisies]
+    cases = plan.cases
+    libres = [indice for indice in range(len(cases)) if cases[indice] == COULOIR and indice not in interdites]
+    return [divmod(indice, nb_colonnes) for indice in random.Random(graine).sample(libres, min(nombre, len(libres)))]
+
+
+# ======================================================================================================================
+# IV. GARDES
+# ======================================================================================================================
+
+class Gardes:
+    """
+    Gardes en ronde sur le plan d'une partie.
+
+    :param partie: partie dont les gardes parcourent le plan
+    :param positions: position de départ de chaque garde (cases distinctes)
+    :param rayon: distance de repérage du personnage, en cases
+    :param graine: graine des virages (None : non reproductibles)
+    :type partie: Partie
+    :type positions: list[tuple[int, int]]
+    :type rayon: int
+    :type graine: int or None
+
+    .. note:: - les gardes sont ceux d'un seul plan : ils disparaissent quand la partie change de plan
+              - sans observateur, rien n'est notifié
+    .. warning:: avec NumPy, les gardes gardent une vue sur les cases du plan : appeler fermer() avant
+                 Plan.fermer() (c'est fait au changement de plan), sinon le mmap d'un plan binaire ne peut
+                 pas être fermé (BufferError)
+    """
+
+    def __init__(self, partie, positions, rayon=RAYON_DETECTION_GARDES, graine=None):
+        self.partie = partie
+        self.plan = partie.plan
+        self.rayon = rayon
+        self.nombre = len(positions)
+        self.repere = False  # le personnage est-il repéré par au moins un garde ?
+        nb_colonnes = self.plan.nb_colonnes
+        if np is not None:
+            self.hasard = np.random.default_rng(graine)
+            self.cases = np.frombuffer(self.plan.cases, dtype=np.uint8)  # vue sur les cases du plan, sans copie
+            positions = np.array(positions, dtype=np.int64).reshape(-1, 2)
+            self.lignes, self.colonnes = positions[:, 0].copy(), positions[:, 1].copy()
+            self.directions = self.hasard.integers(0, len(MOUVEMENTS), self.nombre)
+            self.occupees = np.zeros(self.cases.size, dtype=bool)  # cases occupées par un garde
+            self.occupees[self.lignes * nb_colonnes + self.colonnes] = True
+            self.deplaces = np.empty(0, dtype=np.int64)
+        else:
+            self.hasard = random.Random(graine)
+            self.cases = self.plan.cases
+            self.lignes = [ligne for ligne, _ in positions]
+            self.colonnes = [colonne for _, colonne in positions]
+            self.directions = [self.hasard.randrange(len(MOUVEMENTS)) for _ in positions]
+            self.occupees = {ligne * nb_colonnes + colonne for ligne, colonne in positions}
+            self.deplaces = []
+        if (int(self.occupees.sum()) if np is not None else len(self.occupees)) != self.nombre:
+            raise ValueError('deux gardes ne peuvent pas occuper la même case')
+        partie.abonner(self.observer)
+
+    def observer(self, evenement, *arguments):
+        """
+        Observateur du moteur : les gardes disparaissent quand la partie change de plan.
+
+        :param evenement: nom de l'événement
+        :param arguments: arguments de l'événement
+        :type evenement: str
+        """
+        if evenement == 'plan':
+            self.fermer()
+
+    def fermer(self):
+        """
+        Arrête les gardes et libère leur vue sur les cases du plan, qui peut alors être fermé.
+        """
+        self.plan = self.cases = self.occupees = None
+
+    # Tic
+    # ---
+
+    def avancer(self):
+        """
+        Fait avancer tous les gardes d'une case, puis cherche si le personnage est repéré.
+
+        :return: nombre de gardes déplacés
+        :rtype: int
+
+        .. note:: - un garde n'entre pas sur une case occupée au début du tic : pas d'échange de cases
+                    entre deux gardes ; si plusieurs gardes visent la même case, le premier l'obtient
+                  - émet l'événement 'gardes' si des gardes se sont déplacés, et une annonce quand le
+                    personnage vient d'être repéré
+        """
+        if self.plan is None:
+            return 0
+        nb_deplaces = self.avancer_numpy() if np is not None else self.avancer_python()
+        partie = self.partie
+        repere = self.reperer(partie.position)
+        if partie.observateurs:
+            if nb_deplaces:
+                partie.notifier('gardes', self)
+            if repere and not self.repere:
+                partie.notifier('annonce', 'Un garde vous a repéré !')
+        self.repere = repere
+        return nb_deplaces
+
+    def avancer_numpy(self):
+        """
+        Tic de tous les gardes en bloc (version vectorisée).
+
+        :return: nombre de gardes déplacés
+        :rtype: int
+
+        .. warning:: nécessite NumPy
+        """
+        hasard, cases, plan = self.hasard, self.cases, self.plan
+        nb_lignes, nb_colonnes = plan.nb_lignes, plan.nb_colonnes
+        virages = np.flatnonzero(hasard.random(self.nombre) < PROBABILITE_VIRAGE)
+        self.directions[virages] = hasard.integers(0, len(MOUVEMENTS), virages.size)
+        lignes_fin = self.lignes + DELTAS_LIGNES[self.directions]
+        colonnes_fin = self.colonnes + DELTAS_COLONNES[self.directions]
+        departs = self.lignes * nb_colonnes + self.colonnes
+        possibles = (lignes_fin >= 0) & (lignes_fin < nb_lignes) & (colonnes_fin >= 0) & (colonnes_fin < nb_colonnes)
+        arrivees = np.where(possibles, lignes_fin * nb_colonnes + colonnes_fin, 0)
+        types_fin = cases[arrivees]
+        possibles &= (types_fin != MUR) & (types_fin != PORTE) & (cases[departs] != SORTIE)
+        ligne_perso, colonne_perso = self.partie.position
+        possibles &= ~self.occupees[arrivees] & (arrivees != ligne_perso * nb_colonnes + colonne_perso)
+        candidats = np.flatnonzero(possibles)
+        _, premiers = np.unique(arrivees[candidats], return_index=True)  # un seul garde par case d'arrivée
+        deplaces = candidats[premiers]
+        self.occupees[departs[deplaces]] = False
+        self.occupees[arrivees[deplaces]] = True
+        self.lignes[deplaces] = lignes_fin[deplaces]
+        self.colonnes[deplaces] = colonnes_fin[deplaces]
+        bloques = np.flatnonzero(~possibles)
+        self.directions[bloques] = hasard.integers(0, len(MOUVEMENTS), bloques.size)
+        self.deplaces = deplaces
+        return deplaces.size
+
+    def avancer_python(self):
+        """
+        Tic des gardes un par un (version python pur).
+
+        :return: nombre de gardes déplacés
+        :rtype: int
+        """
+        hasard, cases, plan, occupees = self.hasard, self.cases, self.plan, self.occupees
+        lignes, colonnes, directions = self.lignes, self.colonnes, self.directions
+        nb_lignes, nb_colonnes = plan.nb_lignes, plan.nb_colonnes
+        ligne_perso, colonne_perso = self.partie.position
+        perso = ligne_perso * nb_colonnes + colonne_perso
+        occupees_debut = set(occupees)
+        deplaces = []
+        for garde in range(self.nombre):
+            if hasard.random() < PROBABILITE_VIRAGE:
+                directions[garde] = hasard.randrange(len(MOUVEMENTS))
+            delta_ligne, delta_colonne = MOUVEMENTS[directions[garde]]
+            ligne_fin, colonne_fin = lignes[garde] + delta_ligne, colonnes[garde] + delta_colonne
+            depart = lignes[garde] * nb_colonnes + colonnes[garde]
+            arrivee = ligne_fin * nb_colonnes + colonne_fin
+            if 0 <= ligne_fin < nb_lignes and 0 <= colonne_fin < nb_colonnes and cases[arrivee] != MUR \
+                    and cases[arrivee] != PORTE and cases[depart] != SORTIE and arrivee != perso \
+                    and arrivee not in occupees_debut and arrivee not in occupees:
+                occupees.discard(depart)
+                occupees.add(arrivee)
+                lignes[garde], colonnes[garde] = ligne_fin, colonne_fin
+                deplaces.append(garde)
+            else:
+                directions[garde] = hasard.randrange(len(MOUVEMENTS))
+        self.deplaces = deplaces
+        return len(deplaces)
+
+    def reperer(self, position):
+        """
+        Cherche si un garde est assez proche d'une position pour la repérer.
+
+        :param position: position du personnage
+        :type position: tuple[int, int]
+        :rtype: bool
+        """
+        ligne, colonne = position
+        if np is not None:
+            return bool((np.abs(self.lignes - ligne) + np.abs(self.colonnes - colonne) <= self.rayon).any())
+        return any(abs(ligne_garde - ligne) + abs(colonne_garde - colonne) <= self.rayon
+                   for ligne_garde, colonne_garde in zip(self.lignes, self.colonnes))
+
+    # Accès pour le rendu
+    # -------------------
+
+    def position(self, garde):
+        """
+        Renvoie la position d'un garde.
+
+        :param garde: indice du garde
+        :type garde: int
+        :rtype: tuple[int, int]
+        """
+        return int(self.lignes[garde]), int(self.colonnes[garde])
+
+    def dans_zone(self, origine, nb_lignes, nb_colonnes, deplaces=False):
+        """
+        Renvoie les gardes dont la position est dans un rectangle du plan.
+
+        :param origine: case du coin haut gauche du rectangle
+        :param nb_lignes: nombre de lignes du rectangle
+        :param nb_colonnes: nombre de colonnes du rectangle
+        :param deplaces: ne chercher que parmi les gardes déplacés au dernier tic
+        :type origine: tuple[int, int]
+        :type nb_lignes: int
+        :type nb_colonnes: int
+        :type deplaces: bool
+        :return: indices des gardes
+        :rtype: list[int]
+        """
+        ligne_0, colonne_0 = origine
+        if np is not None:
+            gardes = self.deplaces if deplaces else slice(None)
+            lignes, colonnes = self.lignes[gardes] - ligne_0, self.colonnes[gardes] - colonne_0
+            dedans = (lignes >= 0) & (lignes < nb_lignes) & (colonnes >= 0) & (colonnes < nb_colonnes)
+            indices = self.deplaces[dedans] if deplaces else np.flatnonzero(dedans)
+            return indices.tolist()
+        gardes = self.deplaces if deplaces else range(self.nombre)
+        return [garde for garde in gardes if 0 <= self.lignes[garde] - ligne_0 < nb_lignes
+                and 0 <= self.colonnes[garde] - colonne_0 < nb_colonnes]
@@ -0,0 +1,196 @@
+"""
+    PROJET LANCELOT - génération procédurale de chateaux
+    ====================================================
+
+    Génère, à partir d'une graine, un plan de chateau de taille quelconque et ses dictionnaires d'objets et de
+    portes, avec une chaîne porte / indice toujours soluble.
+
+    Le chateau est un labyrinthe parfait découpé en bandes horizontales. Chaque bande est générée ligne par
+    ligne par l'algorithme d'Eller, qui ne garde en mémoire que la ligne en cours : le plan est écrit au fil
+    de l'eau et la mémoire utilisée ne dépend que de la largeur du chateau. Deux bandes successives ne
+    communiquent que par une porte, dont la question porte sur l'indice (objet) caché dans la bande
+    au-dessus, et sur le précédent. L'entrée est en POSITION_DEPART (0, 1) et la sortie dans le mur du bas.
+
+    Usage : python -m lancelot.generateur --lignes 1001 --colonnes 1001 --portes 20 --graine 42 -o dossier [--binaire]
+
+    Dependencies : moteur.py, plan.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import argparse
+import os
+import random
+
+from .moteur import COULOIR, MUR, SORTIE, PORTE, OBJET
+from .plan import ENTETE, SIGNATURE, VERSION
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+TABLE_TEXTE = bytes.maketrans(bytes(range(10)), b'0123456789')  # octet 0-9 -> caractère '0'-'9'
+
+
+# ======================================================================================================================
+# III. LABYRINTHE PAR L'ALGORITHME D'ELLER
+# ======================================================================================================================
+
+def lignes_eller(largeur, hauteur, hasard):
+    """
+    Génère un labyrinthe parfait de largeur x hauteur cellules, une ligne de cellules à la fois.
+
+    :param largeur: nombre de cellules par ligne
+    :param hauteur: nombre de lignes de cellules
+    :param hasard: générateur aléatoire
+    :type largeur: int
+    :type hauteur: int
+    :type hasard: random.Random
+    :return: pour chaque ligne, les passages vers la droite (largeur - 1 booléens) et vers le bas
+             (largeur booléens, tous faux pour la dernière ligne)
+    :rtype: iterator[tuple[list[bool], list[bool]]]
+
+    .. note:: les ensembles sont fusionnés du plus petit vers le plus grand : O(largeur log largeur) par ligne
+    """
+    ensembles = list(range(largeur))  # ensemble de chaque cellule de la ligne
+    membres = {colonne: [colonne] for colonne in range(largeur)}  # ensemble -> cellules de la ligne
+    prochain = largeur
+    for ligne in range(hauteur):
+        derniere = ligne == hauteur - 1
+        droite = [False] * (largeur - 1)
+        for colonne in range(largeur - 1):
+            gauche_ens, droite_ens = ensembles[colonne], ensembles[colonne + 1]
+            if gauche_ens != droite_ens and (derniere or hasard.random() < 0.5):
+                droite[colonne] = True
+                if len(membres[gauche_ens]) < len(membres[droite_ens]):
+                    gauche_ens, droite_ens = droite_ens, gauche_ens
+                for cellule in membres[droite_ens]:  # fusion du plus petit ensemble dans le plus grand
+                    ensembles[cellule] = gauche_ens
+                membres[gauche_ens].extend(membres.pop(droite_ens))
+        bas = [False] * largeur
+        if not derniere:
+            for cellules in membres.values():  # au moins un passage vers le bas par ensemble
+                bas[hasard.choice(cellules)] = True
+                for cellule in cellules:
+                    if hasard.random() < 0.3:
+                        bas[cellule] = True
+            membres = {}
+            for colonne in range(largeur):
+                if not bas[colonne]:
+                    ensembles[colonne] = prochain
+                    prochain += 1
+                membres.setdefault(ensembles[colonne], []).append(colonne)
+        yield droite, bas
+
+
+# ======================================================================================================================
+# IV. GENERATION DU CHATEAU
+# ======================================================================================================================
+
+def generer_chateau(fichier_plan, fichier_objets, fichier_portes, nb_lignes, nb_colonnes, nb_portes, graine,
+                    binaire=False):
+    """
+    Génère un chateau et écrit son plan et ses dictionnaires au fil de l'eau.
+
+    :param fichier_plan: chemin du plan à écrire
+    :param fichier_objets: chemin du dictionnaire des objets à écrire
+    :param fichier_portes: chemin du dictionnaire des portes à écrire
+    :param nb_lignes: nombre de lignes voulu (arrondi à l'impair inférieur, au moins 3)
+    :param nb_colonnes: nombre de colonnes voulu (arrondi à l'impair inférieur, au moins 3)
+    :param nb_portes: nombre de portes (limité par le nombre de lignes de cellules)
+    :param graine: graine du générateur aléatoire (même graine, même chateau)
+    :param binaire: écrire le plan au format binaire de plan.py plutôt qu'au format texte
+    :type fichier_plan: str
+    :type fichier_objets: str
+    :type fichier_portes: str
+    :type nb_lignes: int
+    :type nb_colonnes: int
+    :type nb_portes: int
+    :type graine: int
+    :type binaire: bool
+    :return: dimensions réelles du plan (nb_lignes, nb_colonnes) et nombre de portes
+    :rtype: tuple[int, int, int]
+    """
+    hasard = random.Random(graine)
+    largeur, hauteur = max((nb_colonnes - 1) // 2, 1), max((nb_lignes - 1) // 2, 1)
+    nb_colonnes, nb_lignes = 2 * largeur + 1, 2 * hauteur + 1
+    nb_portes = max(min(nb_portes, hauteur - 1), 0)
+    nb_bandes = nb_portes + 1
+    # première ligne de cellules de chaque bande, puis tirage de la cellule de l'indice de chaque bande
+    debuts = [bande * hauteur // nb_bandes for bande in range(nb_bandes)] + [hauteur]
+    indices = {}  # ligne de cellules -> (colonne de cellule, numéro de l'indice)
+    for bande in range(nb_portes):
+        indices[hasard.randrange(debuts[bande], debuts[bande + 1])] = (hasard.randrange(largeur), bande + 1)
+    valeurs = [hasard.randrange(1, 100) for _ in range(nb_portes + 1)]
+    colonne_sortie = 2 * hasard.randrange(largeur) + 1
+
+    with open(fichier_plan, 'wb') as plan_out, open(fichier_objets, 'w', encoding='UTF-8') as objets_out, \
+            open(fichier_portes, 'w', encoding='UTF-8') as portes_out:
+
+        def ecrire_ligne(rangee):
+            if binaire:
+                plan_out.write(rangee)
+            else:
+                texte = bytearray(b' ' * (2 * nb_colonnes - 1))
+                texte[0::2] = rangee.translate(TABLE_TEXTE)
+                plan_out.write(texte + b'\n')
+
+        if binaire:
+            plan_out.write(ENTETE.pack(SIGNATURE, VERSION, nb_lignes, nb_colonnes))
+        rangee = bytearray([MUR]) * nb_colonnes
+        rangee[1] = COULOIR  # porte d'entrée du chateau
+        ecrire_ligne(rangee)
+        numero_porte = 0
+        for bande in range(nb_bandes):
+            for ligne, (droite, bas) in enumerate(lignes_eller(largeur, debuts[bande + 1] - debuts[bande], hasard),
+                                                  debuts[bande]):
+                rangee = bytearray([MUR]) * nb_colonnes
+                rangee[1::2] = bytes(largeur)  # cellules
+                rangee[2:-1:2] = bytes(MUR - passage for passage in droite)
+                if ligne in indices:
+                    colonne, numero = indices[ligne]
+                    rangee[2 * colonne + 1] = OBJET
+                    texte = f'indice{numero} = {valeurs[numero]}'
+                    objets_out.write(f'{(2 * ligne + 1, 2 * colonne + 1)!r}, {texte!r}\n')
+                ecrire_ligne(rangee)
+                rangee = bytearray([MUR]) * nb_colonnes
+                if ligne == hauteur - 1:  # mur du bas : sortie
+                    rangee[colonne_sortie] = SORTIE
+                elif ligne == debuts[bande + 1] - 1:  # mur entre deux bandes : une seule porte
+                    numero_porte += 1
+                    colonne_porte = 2 * hasard.randrange(largeur) + 1
+                    rangee[colonne_porte] = PORTE
+                    if numero_porte == 1:
+                        question, reponse = f'indice1 + {valeurs[0]} = ?', valeurs[1] + valeurs[0]
+                    else:
+                        question = f'indice{numero_porte} + indice{numero_porte - 1} = ?'
+                        reponse = valeurs[numero_porte] + valeurs[numero_porte - 1]
+                    portes_out.write(f'{(2 * ligne + 2, colonne_porte)!r}, {(question, str(reponse))!r}\n')
+                else:
+                    rangee[1::2] = bytes(MUR - passage for passage in bas)
+                ecrire_ligne(rangee)
+    return nb_lignes, nb_colonnes, nb_portes
+
+
+# ======================================================================================================================
+# V. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description='Génère un chateau soluble de taille quelconque.')
+    analyseur.add_argument('--lignes', type=int, default=101, help='nombre de lignes du plan')
+    analyseur.add_argument('--colonnes', type=int, default=101, help='nombre de colonnes du plan')
+    analyseur.add_argument('--portes', type=int, default=10, help='nombre de portes à franchir')
+    analyseur.add_argument('--graine', type=int, default=0, help='graine du générateur aléatoire')
+    analyseur.add_argument('--binaire', action='store_true', help='plan au format binaire (plan_chateau.bin)')
+    analyseur.add_argument('-o', '--dossier', default='.', help='dossier de sortie')
+    arguments = analyseur.parse_args()
+    os.makedirs(arguments.dossier, exist_ok=True)
+    nom_plan = 'plan_chateau.bin' if arguments.binaire else 'plan_chateau.txt'
+    dimensions = generer_chateau(os.path.join(arguments.dossier, nom_plan),
+                                 os.path.join(arguments.dossier, 'dico_objets.txt'),
+                                 os.path.join(arguments.dossier, 'dico_portes.txt'),
+                                 arguments.lignes, arguments.colonnes, arguments.portes, arguments.graine,
+                                 arguments.binaire)
+    print('Chateau de {} x {} cases, {} portes.'.format(*dimensions))
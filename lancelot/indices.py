@@ -0,0 +1,315 @@
+"""
+    PROJET LANCELOT - index des indices et des portes
+    =================================================
+
+    Index, calculé au chargement du niveau, des liens entre les questions des portes et les indices
+    (objets) : l'objet 'indice2 = 2' définit l'indice indice2, donc la porte 'indice2 + indice4 = ?' dépend
+    de cet objet et de celui qui définit indice4.
+
+    L'index donne pour chaque porte :
+        - les positions et les noms des objets dont elle dépend ;
+        - les indices qu'elle cite sans qu'aucun objet ne les définisse (noms de la forme préfixe + numéro,
+          comme ceux des indices définis : 'indice5' si 'indice1' existe) ;
+        - les portes à ouvrir avant elle : celles qui barrent le chemin du départ jusqu'à elle ou jusqu'à
+          un de ses objets (zones du plan séparées par les portes, parcourues en largeur depuis le départ).
+    Il en déduit un ordre topologique des portes et repère les portes prises dans un cycle (porte dont un
+    objet n'est accessible qu'en passant par elle, par exemple).
+
+    L'aide du jeu répond alors à « que me manque-t-il ? » en O(1) par porte, sans parcourir l'inventaire.
+
+    Usage : python -m lancelot.indices [plan dico_objets dico_portes]  (par défaut, les fichiers de CONFIGS.py)
+
+    Dependencies : CONFIGS.py, moteur.py, plan.py, validateur.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import re
+import sys
+from collections import deque
+
+from .CONFIGS import POSITION_DEPART, fichier_plan, fichier_objets, fichier_questions
+from .moteur import lire_matrice, creer_dictionnaire, MUR, PORTE, OBJET, COULOIR
+from .plan import Plan
+from .validateur import etiqueter
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+MOT = re.compile(r'\w+')
+NOM_NUMEROTE = re.compile(r'([^\W\d_]+)\d+')  # préfixe + numéro, comme 'indice2'
+PORTES_FERMEES = bytes(MUR if type_case == PORTE else type_case for type_case in range(256))
+
+
+# ======================================================================================================================
+# III. DEPENDANCES TEXTUELLES
+# ======================================================================================================================
+
+def definir_indices(dict_objet):
+    """
+    Associe à chaque nom d'indice la position de l'objet qui le définit (texte de la forme 'nom = valeur').
+
+    :param dict_objet: dictionnaire position -> objet
+    :type dict_objet: dict[tuple[int, int], str]
+    :return: les définitions (nom -> position) et les noms définis par plusieurs objets
+    :rtype: tuple[dict[str, tuple[int, int]], set[str]]
+
+    .. note:: un nom défini par plusieurs objets est associé au dernier d'entre eux
+    """
+    definitions = {}
+    doublons = set()
+    for position, texte in dict_objet.items():
+        if '=' in texte:
+            nom = texte.split('=')[0].strip()
+            if nom in definitions:
+                doublons.add(nom)
+            definitions[nom] = position
+    return definitions, doublons
+
+
+def dependances_portes(dict_objet, dict_porte, definitions=None):
+    """
+    Associe à chaque porte les positions des objets qui définissent les indices cités dans sa question.
+
+    :param dict_objet: dictionnaire position -> objet
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :param definitions: indices déjà définis par definir_indices(dict_objet) (None : calculés ici)
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :type definitions: dict[str, tuple[int, int]] or None
+    :return: dictionnaire position de la porte -> positions des objets nécessaires
+    :rtype: dict[tuple[int, int], frozenset[tuple[int, int]]]
+    """
+    if definitions is None:
+        definitions = definir_indices(dict_objet)[0]
+    return {porte: frozenset(definitions[mot] for mot in MOT.findall(question) if mot in definitions)
+            for porte, (question, _) in dict_porte.items()}
+
+
+# ======================================================================================================================
+# IV. INDEX DU NIVEAU
+# ======================================================================================================================
+
+class IndexIndices:
+    """
+    Index des dépendances entre portes et indices d'un niveau.
+
+    :param plan: plan du chateau
+    :param dict_objet: dictionnaire position -> objet
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :param depart: position de départ du personnage
+    :type plan: Plan
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :type depart: tuple[int, int]
+    """
+
+    def __init__(self, plan, dict_objet, dict_porte, depart=POSITION_DEPART):
+        self.definitions, self.doublons = definir_indices(dict_objet)
+        noms_par_position = {position: nom for nom, position in self.definitions.items()}
+        prefixes = {NOM_NUMEROTE.fullmatch(nom).group(1) for nom in self.definitions if NOM_NUMEROTE.fullmatch(nom)}
+        self.dependances = dependances_portes(dict_objet, dict_porte, self.definitions)  # porte -> objets nécessaires
+        self.noms = {}  # porte -> noms des indices nécessaires, triés
+        self.manquants = {}  # porte -> indices cités mais définis par aucun objet
+        for porte, (question, _) in dict_porte.items():
+            self.noms[porte] = tuple(sorted(noms_par_position[objet] for objet in self.dependances[porte]))
+            mots = MOT.findall(question)
+            manquants = sorted({mot for mot in mots if mot not in self.definitions and NOM_NUMEROTE.fullmatch(mot)
+                                and NOM_NUMEROTE.fullmatch(mot).group(1) in prefixes})
+            if manquants:
+                self.manquants[porte] = manquants
+        self.prerequis, self.inaccessibles = self.calculer_prerequis(plan, depart)
+        self.ordre, self.cycles, self.bloquees = self.ordonner()
+
+    def calculer_prerequis(self, plan, depart):
+        """
+        Calcule, pour chaque porte, les portes à ouvrir avant elle.
+
+        Le plan, portes fermées, est découpé en zones (composantes connexes). Les zones sont parcourues en
+        largeur depuis celle du départ, en passant d'une zone à l'autre par les portes : le chemin de portes
+        qui mène à chaque zone en est déduit.
+
+        :param plan: plan du chateau
+        :param depart: position de départ
+        :type plan: Plan
+        :type depart: tuple[int, int]
+        :return: les prérequis (porte -> portes) et les portes ou objets accessibles par aucun chemin
+        :rtype: tuple[dict[tuple[int, int], frozenset[tuple[int, int]]], set[tuple[int, int]]]
+        """
+        nb_lignes, nb_colonnes = plan.nb_lignes, plan.nb_colonnes
+        fermee = Plan(nb_lignes, nb_colonnes, bytes(plan.cases).translate(PORTES_FERMEES))
+        etiquettes = etiqueter(fermee)
+        zones_porte = {}  # porte -> zones qui la touchent
+        portes_zone = {}  # zone -> portes qui la touchent
+        for porte in self.dependances:
+            ligne, colonne = porte
+            zones = set()
+            for voisine in ((ligne - 1, colonne), (ligne + 1, colonne), (ligne, colonne - 1), (ligne, colonne + 1)):
+                if 0 <= voisine[0] < nb_lignes and 0 <= voisine[1] < nb_colonnes:
+                    zone = int(etiquettes[voisine[0] * nb_colonnes + voisine[1]])
+                    if zone != -1:
+                        zones.add(zone)
+            zones_porte[porte] = zones
+            for zone in zones:
+                portes_zone.setdefault(zone, []).append(porte)
+        chemins = {}  # zone -> portes à franchir pour l'atteindre
+        if plan.contient(depart) and etiquettes[plan.indice(depart)] != -1:
+            zone_depart = int(etiquettes[plan.indice(depart)])
+            chemins[zone_depart] = frozenset()
+            file = deque([zone_depart])
+            while file:
+                zone = file.popleft()
+                for porte in portes_zone.get(zone, ()):
+                    for suivante in zones_porte[porte]:
+                        if suivante not in chemins:
+                            chemins[suivante] = chemins[zone] | {porte}
+                            file.append(suivante)
+        prerequis = {}
+        inaccessibles = set()
+        for porte, objets in self.dependances.items():
+            atteintes = [chemins[zone] for zone in zones_porte[porte] if zone in chemins]
+            if not atteintes:
+                inaccessibles.add(porte)
+            portes = set(min(atteintes, key=len)) if atteintes else set()
+            for objet in objets:
+                zone = int(etiquettes[plan.indice(objet)]) if plan.contient(objet) else -1
+                if zone in chemins:
+                    portes |= chemins[zone]
+                else:
+                    inaccessibles.add(objet)
+            prerequis[porte] = frozenset(portes)
+        return prerequis, inaccessibles
+
+    def ordonner(self):
+        """
+        Range les portes dans un ordre topologique de leurs prérequis (algorithme de Kahn).
+
+        Les portes absentes de l'ordre sont soit prises dans un cycle, soit bloquées par une porte d'un cycle.
+
+        :return: l'ordre d'ouverture des portes, les portes prises dans un cycle et les portes qu'un cycle bloque
+        :rtype: tuple[list[tuple[int, int]], list[tuple[int, int]], list[tuple[int, int]]]
+        """
+        restants = {porte: len(portes) for porte, portes in self.prerequis.items()}
+        suivantes = {porte: [] for porte in self.prerequis}
+        for porte, portes in self.prerequis.items():
+            for prealable in portes:
+                suivantes[prealable].append(porte)
+        file = deque(sorted(porte for porte, nombre in restants.items() if nombre == 0))
+        ordre = []
+        while file:
+            porte = file.popleft()
+            ordre.append(porte)
+            for suivante in suivantes[porte]:
+                restants[suivante] -= 1
+                if restants[suivante] == 0:
+                    file.append(suivante)
+        restantes = {porte for porte, nombre in restants.items() if nombre > 0}
+        cycles = []
+        for origine in sorted(restantes):  # une porte est dans un cycle si elle est son propre prérequis
+            vues = set()
+            pile = [porte for porte in suivantes[origine] if porte in restantes]
+            while pile and origine not in vues:
+                porte = pile.pop()
+                if porte not in vues:
+                    vues.add(porte)
+                    pile.extend(suivante for suivante in suivantes[porte] if suivante in restantes)
+            if origine in vues:
+                cycles.append(origine)
+        return ordre, cycles, sorted(restantes.difference(cycles))
+
+    def aide(self, porte, ramasses):
+        """
+        Renvoie les noms des indices qui manquent pour ouvrir une porte.
+
+        :param porte: position de la porte
+        :param ramasses: positions des objets déjà ramassés
+        :type porte: tuple[int, int]
+        :type ramasses: set[tuple[int, int]]
+        :rtype: list[str]
+        """
+        return [nom for nom in self.noms.get(porte, ()) if self.definitions[nom] not in ramasses]
+
+    def problemes(self):
+        """
+        Liste les problèmes de dépendances, pour les concepteurs de niveaux.
+
+        :rtype: list[str]
+        """
+        problemes = [f'indice {nom} défini par plusieurs objets' for nom in sorted(self.doublons)]
+        problemes += [f'porte {porte} : indice(s) {", ".join(noms)} défini(s) par aucun objet'
+                      for porte, noms in sorted(self.manquants.items())]
+        problemes += [f'porte {porte} prise dans un cycle de dépendances' for porte in self.cycles]
+        problemes += [f'porte {porte} bloquée par un cycle de dépendances' for porte in self.bloquees]
+        problemes += [f'{position} inaccessible depuis le départ' for position in sorted(self.inaccessibles)]
+        return problemes
+
+
+# ======================================================================================================================
+# V. AIDE DU JEU
+# ======================================================================================================================
+
+class Aide:
+    """
+    Aide aux joueurs : indique, devant une porte, les indices qu'il reste à trouver.
+
+    Suit les objets ramassés grâce aux événements 'case' du moteur (la case d'un objet devient un couloir).
+
+    :param index: index des indices du niveau
+    :param partie: partie en cours (éventuellement restaurée d'une sauvegarde)
+    :type index: IndexIndices
+    :type partie: Partie
+    """
+
+    def __init__(self, index, partie):
+        self.index = index
+        self.objets = set(index.definitions.values())
+        self.ramasses = {objet for objet in self.objets
+                         if partie.plan.contient(objet) and partie.plan[objet] != OBJET}
+        partie.abonner(self.observer)
+
+    def observer(self, evenement, *arguments):
+        """
+        Observateur du moteur : note les objets ramassés.
+
+        :param evenement: nom de l'événement
+        :param arguments: arguments de l'événement
+        :type evenement: str
+        """
+        if evenement == 'case' and arguments[1] == COULOIR and arguments[0] in self.objets:
+            self.ramasses.add(arguments[0])
+
+    def pour_porte(self, porte):
+        """
+        Met en forme l'aide pour la question d'une porte.
+
+        :param porte: position de la porte
+        :type porte: tuple[int, int]
+        :return: l'aide, ou '' si la porte ne dépend d'aucun indice
+        :rtype: str
+        """
+        if not self.index.noms.get(porte):
+            return ''
+        manquants = self.index.aide(porte, self.ramasses)
+        if manquants:
+            return 'Indices à trouver : ' + ', '.join(manquants)
+        return 'Vous avez tous les indices nécessaires.'
+
+
+# ======================================================================================================================
+# VI. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    fichiers = sys.argv[1:4] if len(sys.argv) == 4 else (fichier_plan, fichier_objets, fichier_questions)
+    index_niveau = IndexIndices(lire_matrice(fichiers[0]), creer_dictionnaire(fichiers[1]),
+                                creer_dictionnaire(fichiers[2]))
+    for numero, porte_ordre in enumerate(index_niveau.ordre, 1):
+        noms_indices = index_niveau.noms[porte_ordre]
+        print(f'{numero}. porte {porte_ordre}' + (f' : {", ".join(noms_indices)}' if noms_indices else ''))
+    liste_problemes = index_niveau.problemes()
+    for probleme in liste_problemes:
+        print(f'problème : {probleme}')
+    if liste_problemes:
+        sys.exit(1)
@@ -0,0 +1,309 @@
+"""
+    PROJET LANCELOT - corrigée post peer-reviewing
+    ==============================================
+    Author : Matthieu PELINGRE
+    Date : May 03, 2021
+
+    Niv 1 : Affichage du plan du chateau dans Turtle.
+    Niv 2 : Déplacement du personnage sur le plan.
+    Niv 3 : Collecte des objets dans le chateau.
+    Niv 4 : Gestion des portes et des enigmes.
+
+    Input :  keyboard arrows (+ and - to zoom with RENDU_BITMAP)
+    Output : turtle
+
+    Usage : lancelot [--config reglages.py] [--profile [rapport.json]]
+            (ou python -m lancelot.jeu, ou python MP-Project_Lancelot-ultra_basic-corrigee.py)
+            (--config : fichier de configuration, voir configuration.py)
+            (--profile : mesure les chemins critiques et écrit un rapport à la fermeture de la fenêtre)
+            (dossier_etages dans la configuration : chateau à plusieurs étages, voir etages.py)
+
+    Rien n'est exécuté à l'import du module : main() ouvre la fenêtre et lance la partie. turtle (et Tk) n'est
+    importé que par main(), les outils sans affichage du paquet ne le chargent jamais.
+
+    Dependencies : turtle, configuration.py, moteur.py, niveau.py, rendu.py, enregistrement.py, sauvegarde.py,
+                   vision.py, profilage.py, indices.py, rendu_bitmap.py, etages.py, gardes.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import argparse
+import time
+from collections import deque
+
+from .configuration import charger_configuration
+from .enregistrement import Enregistreur
+from .etages import Chateau
+from .gardes import Gardes, placer_gardes
+from .indices import IndexIndices, Aide
+from .moteur import Partie, GAUCHE, DROITE, HAUT, BAS
+from .niveau import charger_niveau
+from .profilage import Profileur
+from .rendu import Rendu
+from .rendu_bitmap import RenduBitmap
+from .sauvegarde import Sauvegarde, effacer
+from .vision import Vision
+
+
+# ======================================================================================================================
+# II. DECLARATION DES VARIABLES GLOBALES
+# ======================================================================================================================
+
+# la partie en cours (plan, position du personnage et inventaire) est portée par l'objet partie du moteur,
+# créée par main(). Ce module ne fait que l'afficher et lui transmettre les actions du joueur.
+turtle = None  # module turtle, importé par main() seulement
+configuration = None  # réglages de la session (Configuration)
+partie = None
+enregistreur = None  # journal des mouvements et des réponses de la partie, sauvegardé à la fermeture
+sauvegarde = None  # sauvegarde automatique de la progression, écrite à chaque tic
+aide = None  # indices qu'il reste à trouver pour chaque porte, affichés avec sa question
+rendu = None  # rendu retenu du plan sur le canevas de turtle
+chateau = None  # étages en mémoire et changements d'étage, pour un chateau à plusieurs étages
+gardes = None  # gardes en ronde, avancés à chaque tic
+file_mouvements = deque()  # déplacements demandés au clavier, pas encore appliqués
+
+
+# ======================================================================================================================
+# III. DEFINITION DES FONCTIONS
+# ======================================================================================================================
+
+# Niveau 2 : gestion des déplacements
+# -----------------------------------
+
+# fonctions évènements clavier : elles ne font que mettre le mouvement en file d'attente, la file est vidée
+# par la boucle de jeu à intervalle fixe (aucun appui n'est perdu pendant un tracé, même long)
+def deplacer_gauche():
+    """
+    Fonction événementielle d'appui sur la flèche gauche du clavier.
+    Met le déplacement vers la gauche en file d'attente
+
+    .. warning:: utilise la variable globale file_mouvements
+    .. seealso::  boucle_de_jeu()
+    """
+    file_mouvements.append(GAUCHE)
+
+
+def deplacer_droite():
+    """
+    Fonction événementielle d'appui sur la flèche droite du clavier.
+    Met le déplacement vers la droite en file d'attente
+
+    .. warning:: utilise la variable globale file_mouvements
+    .. seealso::  boucle_de_jeu()
+    """
+    file_mouvements.append(DROITE)
+
+
+def deplacer_haut():
+    """
+    Fonction événementielle d'appui sur la flèche haut du clavier.
+    Met le déplacement vers le haut en file d'attente
+
+    .. warning:: utilise la variable globale file_mouvements
+    .. seealso::  boucle_de_jeu()
+    """
+    file_mouvements.append(HAUT)
+
+
+def deplacer_bas():
+    """
+    Fonction événementielle d'appui sur la flèche bas du clavier.
+    Met le déplacement vers le bas en file d'attente
+
+    .. warning:: utilise la variable globale file_mouvements
+    .. seealso::  boucle_de_jeu()
+    """
+    file_mouvements.append(BAS)
+
+
+def boucle_de_jeu():
+    """
+    Tic de la boucle de jeu, relancé toutes les configuration.periode_tick millisecondes par turtle.ontimer.
+    Applique les déplacements en attente (au plus configuration.max_deplacements_tick, les suivants restent
+    en file pour le tic suivant), fait avancer les gardes, puis trace une seule image pour tous ces
+    déplacements.
+
+    :return: déplace le personnage et met à jour l'affichage si des déplacements étaient en attente
+    :rtype: turtle
+
+    .. warning:: utilise turtle et les variables globales configuration, enregistreur, rendu, sauvegarde,
+                 gardes et file_mouvements
+    .. note:: - la période est tenue à cadence fixe : la durée du tic est retranchée du délai suivant
+              - le moteur notifie le rendu des changements à tracer
+              - pas de sauvegarde automatique dans un chateau à plusieurs étages
+    .. seealso::  Enregistreur.deplacer(), Partie.deplacer(), Rendu.dessiner()
+    """
+    debut = time.perf_counter()
+    deplacements = bool(file_mouvements)
+    for _ in range(min(len(file_mouvements), configuration.max_deplacements_tick)):
+        enregistreur.deplacer(file_mouvements.popleft())  # le moteur applique le déplacement, qui est noté
+    rondes = gardes is not None and gardes.avancer()  # tous les gardes en un seul calcul
+    if deplacements or rondes:
+        rendu.dessiner()  # une seule image pour tous les déplacements du tic
+    if deplacements and sauvegarde is not None:
+        sauvegarde.ecrire()  # sauvegarde automatique : seuls les changements du tic sont écrits
+    duree = int((time.perf_counter() - debut) * 1000)
+    turtle.ontimer(boucle_de_jeu, max(configuration.periode_tick - duree, 0))
+
+
+def zoomer_plus():
+    """
+    Fonction événementielle d'appui sur la touche + : agrandit la vue du plan (rendu bitmap).
+
+    .. warning:: utilise la variable globale rendu
+    .. note:: l'image est tracée tout de suite : zoomer ne recopie que la vue
+    .. seealso::  RenduBitmap.zoomer()
+    """
+    rendu.zoomer(1)
+    rendu.dessiner()
+
+
+def zoomer_moins():
+    """
+    Fonction événementielle d'appui sur la touche - : réduit la vue du plan (rendu bitmap).
+
+    .. warning:: utilise la variable globale rendu
+    .. note:: l'image est tracée tout de suite : zoomer ne recopie que la vue
+    .. seealso::  RenduBitmap.zoomer()
+    """
+    rendu.zoomer(-1)
+    rendu.dessiner()
+
+
+# Niveau 4 : Gestion des portes
+# -----------------------------
+
+def demander_reponse(question, porte):
+    """
+    Fournisseur de réponses du moteur : pose la question d'une porte au joueur dans turtle.
+
+    :param question: question posée par le garde de la porte
+    :param porte: position de la porte
+    :type question: str
+    :type porte: tuple[int, int]
+    :return: la réponse du joueur (None s'il annule)
+    :rtype: str or None
+
+    .. warning:: utilise turtle et les variables globales rendu et aide
+    .. note:: - affiche les annonces en attente avant d'ouvrir la saisie
+              - ajoute à la question les indices qu'il reste à trouver pour y répondre (un seul étage)
+              - rend l'écoute du clavier à la fenêtre principale après la saisie
+    """
+    rendu.dessiner()
+    conseil = aide.pour_porte(porte) if aide is not None else ''
+    reponse = turtle.textinput('Question', question + '\n\n' + conseil if conseil else question)
+    turtle.listen()
+    return reponse
+
+
+# ======================================================================================================================
+# IV. CORE
+# ======================================================================================================================
+
+def main(arguments=None):
+    """
+    Point d'entrée du jeu : lit les options et la configuration, ouvre la fenêtre turtle et lance la partie.
+
+    :param arguments: options de la ligne de commande (None : sys.argv)
+    :type arguments: list[str] or None
+
+    .. warning:: modifie les variables globales du module
+    """
+    global turtle, configuration, partie, enregistreur, sauvegarde, aide, rendu, chateau, gardes
+    file_mouvements.clear()
+
+    # core - options : configuration et mode profilage
+    analyseur = argparse.ArgumentParser(description='Lancelot au château du Python des Neiges.')
+    analyseur.add_argument('--config', metavar='FICHIER', help='fichier de configuration (défaut : CONFIGS.py)')
+    analyseur.add_argument('--profile', nargs='?', const='', metavar='RAPPORT',
+                           help='mesure les chemins critiques et écrit un rapport JSON (défaut : fichier_profil)')
+    arguments = analyseur.parse_args(arguments)
+    configuration = charger_configuration(arguments.config)
+    profileur = Profileur() if arguments.profile is not None else None
+    import turtle  # Tk n'est chargé qu'au lancement du jeu
+
+    # core - turtle : paramètres d'affichage
+    turtle.title('Escape Game - Lancelot au château du Python des Neiges')  # change le titre de la fenêtre
+    turtle.tracer(0, 0)  # désactive le rafraichissement d'écran de turtle (tracé instantané)
+    turtle.hideturtle()  # cache le pointeur turtle
+    turtle.setup(480, 480)  # affiche une fenêtre aux bonnes dimensions (optionnel)
+
+    if configuration.dossier_etages:
+        # core - chateau à étages : l'étage de départ est chargé, ses voisins le seront en arrière-plan ; la
+        # sauvegarde et l'aide ne portent que sur un plan, elles sont désactivées
+        chateau = Chateau(configuration.dossier_etages, configuration.taille_cache_etages)
+        annonce = None
+        partie = chateau.commencer(0, configuration.position_depart, demander_reponse)
+        mat_plan = partie.plan
+        sauvegarde = aide = None
+    else:
+        # core - Niv 1, 3 et 4 : chargement du niveau compilé (plan, objets et portes)
+        mat_plan, dict_objet, dict_porte = charger_niveau(configuration.fichier_plan, configuration.fichier_objets,
+                                                          configuration.fichier_questions,
+                                                          configuration.fichier_niveau)
+        index_indices = IndexIndices(mat_plan, dict_objet, dict_porte)  # dépendances des portes, avant la reprise
+
+        # core - moteur : création de la partie, reprise de la progression sauvegardée, branchement de
+        # l'affichage et des questions
+        chateau = None
+        annonce = None  # annonce de la reprise, affichée une fois le rendu abonné
+        partie = Partie(mat_plan, dict_objet, dict_porte, configuration.position_depart, demander_reponse)
+        try:
+            sauvegarde = Sauvegarde(partie, configuration.fichier_sauvegarde)  # reprend la progression sauvegardée
+        except ValueError as erreur:  # sauvegarde d'un autre niveau ou abîmée : la partie repart du début
+            annonce = f'{erreur} : sauvegarde effacée'
+            effacer(configuration.fichier_sauvegarde)
+            sauvegarde = Sauvegarde(partie, configuration.fichier_sauvegarde)
+        aide = Aide(index_indices, partie)  # après la reprise : les objets déjà ramassés sont lus sur le plan
+    # brouillard de guerre (torche)
+    vision = Vision(mat_plan, configuration.rayon_torche) if configuration.rayon_torche else None
+    rendu = (RenduBitmap if configuration.rendu_bitmap else Rendu)(turtle.getcanvas(), turtle.update, vision)
+    if profileur is not None:  # sans profilage, aucune méthode n'est remplacée
+        profileur.instrumenter_partie(partie)
+        profileur.instrumenter_rendu(rendu)
+    rendu.afficher_plan(mat_plan, partie.position)  # crée les items du plan une seule fois
+    rendu.tracer_inventaire(partie.inventaire)
+    rendu.dessiner()
+    partie.abonner(rendu.observer)
+    if annonce is not None:
+        partie.notifier('annonce', annonce)
+    enregistreur = Enregistreur(partie)  # note les mouvements et les réponses (relecture : enregistrement.py)
+    gardes = None
+    if configuration.nb_gardes:  # gardes en ronde, postés au hasard dans les couloirs
+        gardes = Gardes(partie, placer_gardes(mat_plan, configuration.nb_gardes, (partie.position,)),
+                        configuration.rayon_detection_gardes)
+        if profileur is not None:
+            profileur.chronometrer(gardes, 'avancer')
+    if chateau is not None:
+        if configuration.rendu_bitmap and vision is None:  # étages voisins rastérisés pendant le préchargement
+            chateau.preparer = rendu.preparer
+        chateau.precharger()
+
+    # core - Niv 2 : déplacements
+    turtle.listen()  # Déclenche l’écoute du clavier
+    entree = profileur.horodater if profileur is not None else lambda gestionnaire: gestionnaire  # instant des appuis
+    turtle.onkeypress(entree(deplacer_gauche), "Left")  # Associe à la touche Left la fonction deplacer_gauche
+    turtle.onkeypress(entree(deplacer_droite), "Right")
+    turtle.onkeypress(entree(deplacer_haut), "Up")
+    turtle.onkeypress(entree(deplacer_bas), "Down")
+    if configuration.rendu_bitmap:  # le zoom ne fait que changer l'image copiée dans la vue, à la prochaine image
+        turtle.onkeypress(zoomer_plus, "plus")
+        turtle.onkeypress(zoomer_moins, "minus")
+    boucle_de_jeu()  # lance la boucle de jeu à cadence fixe
+    turtle.mainloop()  # Place le programme en position d’attente d’une action du joueur
+    if gardes is not None:
+        gardes.fermer()  # libère la vue des gardes sur les cases du plan, avant sa fermeture
+    if chateau is None:
+        if not sauvegarde.restauree:  # le journal ne se rejoue que depuis l'état initial du niveau
+            enregistreur.sauvegarder(configuration.fichier_enregistrement)  # fenêtre fermée : sauvegarde du journal
+        sauvegarde.fermer()
+    else:  # le journal d'un chateau à étages ne se rejoue pas sur un seul plan
+        chateau.fermer()
+    if profileur is not None:
+        profileur.ecrire(arguments.profile or configuration.fichier_profil)
+        print(profileur.resume())
+
+
+if __name__ == '__main__':
+    main()
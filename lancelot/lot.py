@@ -0,0 +1,216 @@
+"""
+    PROJET LANCELOT - vérification de lots de niveaux
+    =================================================
+
+    Vérifie en parallèle tous les niveaux d'un lot : chaque sous-dossier qui contient un plan
+    (plan_chateau.txt ou plan_chateau.bin), dico_objets.txt et dico_portes.txt est un niveau.
+
+    Chaque niveau est lu, validé (validateur.py) puis résolu (solveur.py) dans un processus d'un
+    ProcessPoolExecutor, avec un délai maximal par niveau. Les résultats sont affichés au fur et à mesure
+    qu'ils arrivent, puis résumés ; le rapport complet peut être écrit en JSON.
+
+    Statuts : 'valide', 'erreurs' (problèmes bloquants trouvés par le validateur), 'insoluble',
+    'illisible' (fichier absent ou mal formé), 'delai' (délai dépassé), 'plantage' (exception inattendue pendant
+    la vérification : le lot continue, l'exception est notée dans les problèmes du niveau).
+
+    Usage : python -m lancelot.lot dossier_du_lot [--processus 8] [--delai 60] [--rapport rapport.json]
+            code de sortie 1 si un niveau n'est pas valide
+
+    Dependencies : moteur.py, solveur.py, validateur.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .moteur import lire_matrice, creer_dictionnaire
+from .solveur import resoudre
+from .validateur import valider_niveau, ERREUR
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+NOMS_PLAN = ('plan_chateau.txt', 'plan_chateau.bin')
+NOM_OBJETS = 'dico_objets.txt'
+NOM_PORTES = 'dico_portes.txt'
+DELAI = 60  # secondes par niveau
+STATUTS = ('valide', 'erreurs', 'insoluble', 'illisible', 'delai', 'plantage')
+
+
+class DelaiDepasse(Exception):
+    """
+    Levée dans un processus de vérification quand le délai du niveau est dépassé.
+    """
+
+
+# ======================================================================================================================
+# III. VERIFICATION D'UN NIVEAU
+# ======================================================================================================================
+
+def trouver_niveaux(dossier_lot):
+    """
+    Liste les niveaux d'un lot.
+
+    :param dossier_lot: dossier qui contient un sous-dossier par niveau
+    :type dossier_lot: str
+    :return: chemins des dossiers des niveaux, triés
+    :rtype: list[str]
+    """
+    niveaux = []
+    for entree in sorted(os.scandir(dossier_lot), key=lambda entree: entree.name):
+        if entree.is_dir() and any(os.path.exists(os.path.join(entree.path, nom)) for nom in NOMS_PLAN):
+            niveaux.append(entree.path)
+    return niveaux
+
+
+def interrompre(numero_signal, cadre):
+    """
+    Gestionnaire de l'alarme du délai : interrompt la vérification en cours.
+
+    :raise DelaiDepasse: toujours
+    """
+    raise DelaiDepasse()
+
+
+def verifier_niveau(dossier, delai=DELAI):
+    """
+    Lit, valide et résout un niveau (exécuté dans un processus du lot).
+
+    :param dossier: dossier du niveau
+    :param delai: durée maximale de la vérification, en secondes (0 : pas de délai)
+    :type dossier: str
+    :type delai: float
+    :return: le résultat : dossier, statut, durée, problèmes et longueur de la solution
+    :rtype: dict
+
+    .. note:: le délai est tenu par une alarme (signal.setitimer) quand le système en dispose
+    """
+    debut = time.perf_counter()
+    resultat = {'dossier': dossier, 'statut': 'valide', 'problemes': [], 'deplacements': None}
+    alarme = delai and hasattr(signal, 'setitimer')
+    plan = None
+    if alarme:
+        signal.signal(signal.SIGALRM, interrompre)
+        signal.setitimer(signal.ITIMER_REAL, delai)
+    try:
+        fichier_plan = next(os.path.join(dossier, nom) for nom in NOMS_PLAN
+                            if os.path.exists(os.path.join(dossier, nom)))
+        plan = lire_matrice(fichier_plan)
+        dict_objet = creer_dictionnaire(os.path.join(dossier, NOM_OBJETS))
+        dict_porte = creer_dictionnaire(os.path.join(dossier, NOM_PORTES))
+        problemes = valider_niveau(plan, dict_objet, dict_porte)
+        resultat['problemes'] = [f'{gravite} : {message}' + (f' {position}' if position is not None else '')
+                                 for gravite, position, message in problemes]
+        if any(probleme.gravite == ERREUR for probleme in problemes):
+            resultat['statut'] = 'erreurs'
+        else:
+            solution = resoudre(plan, dict_objet, dict_porte)
+            if solution is None:
+                resultat['statut'] = 'insoluble'
+            else:
+                resultat['deplacements'] = len(solution)
+        if alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)  # plus d'alarme possible pendant le traitement du résultat
+    except DelaiDepasse:
+        resultat['statut'] = 'delai'
+    except (OSError, ValueError, StopIteration) as erreur:
+        resultat['statut'] = 'illisible'
+        resultat['problemes'] = [str(erreur) or 'plan introuvable']
+    except Exception as erreur:  # un niveau qui fait planter le moteur ne doit pas arrêter le lot
+        resultat['statut'] = 'plantage'
+        resultat['problemes'] = [f'{type(erreur).__name__} : {erreur}']
+    finally:
+        if alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if plan is not None:
+            plan.fermer()  # plan binaire projeté en mémoire : les processus du lot servent à de nombreux niveaux
+    resultat['duree'] = time.perf_counter() - debut
+    return resultat
+
+
+# ======================================================================================================================
+# IV. VERIFICATION DU LOT
+# ======================================================================================================================
+
+def verifier_lot(niveaux, processus=None, delai=DELAI):
+    """
+    Vérifie des niveaux en parallèle et renvoie leurs résultats au fur et à mesure.
+
+    :param niveaux: dossiers des niveaux
+    :param processus: nombre de processus (None : un par cœur)
+    :param delai: durée maximale de la vérification de chaque niveau, en secondes
+    :type niveaux: list[str]
+    :type processus: int or None
+    :type delai: float
+    :return: les résultats, dans leur ordre d'arrivée
+    :rtype: iterator[dict]
+
+    .. note:: un processus mort en cours de vérification (mémoire épuisée, par exemple) donne le statut
+              'plantage' aux niveaux qu'il n'a pas pu rendre
+    """
+    with ProcessPoolExecutor(max_workers=processus) as executeur:
+        futurs = {executeur.submit(verifier_niveau, dossier, delai): dossier for dossier in niveaux}
+        for futur in as_completed(futurs):
+            try:
+                resultat = futur.result()
+            except Exception as erreur:
+                resultat = {'dossier': futurs[futur], 'statut': 'plantage', 'duree': 0.0, 'deplacements': None,
+                            'problemes': [f'{type(erreur).__name__} : {erreur}']}
+            yield resultat
+
+
+def resumer(resultats, duree):
+    """
+    Agrège les résultats d'un lot.
+
+    :param resultats: résultats des niveaux
+    :param duree: durée totale de la vérification, en secondes
+    :type resultats: list[dict]
+    :type duree: float
+    :rtype: dict
+    """
+    statuts = Counter(resultat['statut'] for resultat in resultats)
+    return {'niveaux': len(resultats), 'duree': duree,
+            'statuts': {statut: statuts[statut] for statut in STATUTS},
+            'plus_lents': [(resultat['dossier'], resultat['duree'])
+                           for resultat in sorted(resultats, key=lambda resultat: -resultat['duree'])[:5]],
+            'resultats': sorted(resultats, key=lambda resultat: resultat['dossier'])}
+
+
+# ======================================================================================================================
+# V. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description='Valide et résout en parallèle les niveaux d\'un lot.')
+    analyseur.add_argument('lot', help='dossier du lot (un sous-dossier par niveau)')
+    analyseur.add_argument('--processus', type=int, help='nombre de processus (défaut : un par cœur)')
+    analyseur.add_argument('--delai', type=float, default=DELAI, help=f'secondes par niveau (défaut : {DELAI})')
+    analyseur.add_argument('--rapport', help='fichier JSON du rapport complet')
+    arguments = analyseur.parse_args()
+    liste_niveaux = trouver_niveaux(arguments.lot)
+    debut_lot = time.perf_counter()
+    liste_resultats = []
+    for numero, resultat_niveau in enumerate(verifier_lot(liste_niveaux, arguments.processus, arguments.delai), 1):
+        liste_resultats.append(resultat_niveau)
+        details = f'{resultat_niveau["deplacements"]} déplacements' if resultat_niveau['statut'] == 'valide' \
+            else '; '.join(resultat_niveau['problemes'][:3])
+        print(f'[{numero}/{len(liste_niveaux)}] {resultat_niveau["statut"]:<9} {resultat_niveau["dossier"]} '
+              f'({resultat_niveau["duree"]:.2f} s) {details}', flush=True)
+    rapport = resumer(liste_resultats, time.perf_counter() - debut_lot)
+    print(f'{rapport["niveaux"]} niveaux en {rapport["duree"]:.1f} s : '
+          + ', '.join(f'{nombre} {statut}' for statut, nombre in rapport['statuts'].items() if nombre))
+    if arguments.rapport:
+        with open(arguments.rapport, 'w', encoding='UTF-8') as fichier_rapport:
+            json.dump(rapport, fichier_rapport, indent=2)
+    if rapport['statuts']['valide'] != rapport['niveaux']:
+        sys.exit(1)
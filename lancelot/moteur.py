@@ -0,0 +1,301 @@
+"""
+    PROJET LANCELOT - moteur de jeu
+    ===============================
+
+    Logique pure du jeu, sans aucun appel à turtle : lecture des fichiers du niveau,
+    état de la partie et règles de déplacement, de ramassage des objets et d'ouverture des portes.
+
+    Le moteur ne dessine rien : il notifie ses observateurs (le front-end turtle, les outils de test...)
+    par des événements de rendu, et obtient les réponses aux questions des portes auprès d'un fournisseur
+    de réponses interchangeable.
+
+    Evénements émis (nom, arguments) :
+        - 'case' (position, type_case) : une case du plan a changé de type ;
+        - 'perso' (position) : le personnage s'est déplacé ;
+        - 'annonce' (texte) : une annonce doit être affichée ;
+        - 'inventaire' (inventaire) : un objet a été ajouté à l'inventaire ;
+        - 'escalier' (position) : le personnage est arrivé sur un escalier (changement d'étage, voir etages.py) ;
+        - 'plan' (plan, position) : la partie continue sur un autre plan (un autre étage du chateau) ;
+        - 'gardes' (gardes) : des gardes en ronde se sont déplacés (émis par gardes.Gardes).
+
+    Dependencies : CONFIGS.py, plan.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import ast
+
+from .CONFIGS import POSITION_DEPART
+from .plan import Plan, lire_plan
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+COULOIR = 0
+MUR = 1
+SORTIE = 2
+PORTE = 3
+OBJET = 4
+VUE = 5
+ESCALIER = 6  # mène à un autre étage (etages.py) ; ne devient jamais une case vue
+
+GAUCHE = (0, -1)
+DROITE = (0, 1)
+HAUT = (-1, 0)
+BAS = (1, 0)
+LETTRES_MOUVEMENTS = {GAUCHE: 'G', DROITE: 'D', HAUT: 'H', BAS: 'B'}  # notation compacte des mouvements
+
+
+# ======================================================================================================================
+# III. LECTURE DES FICHIERS DU NIVEAU
+# ======================================================================================================================
+
+def lire_matrice(fichier):
+    """
+    Permet de transposer le fichier en plan compact.
+
+    :param fichier: chemin du fichier du plan du chateau (texte, ou binaire projeté en mémoire)
+    :type fichier: str
+    :return: le plan du chateau, une case par octet
+    :rtype: Plan
+
+    .. seealso:: plan.lire_plan()
+    """
+    return lire_plan(fichier)
+
+
+def creer_dictionnaire(fichier_texte):
+    """
+    Permet de transposer le fichier en dictionnaire.
+
+    :param fichier_texte: chemin du fichier texte (encodé en UTF-8) du dictionnaire
+    :type fichier_texte: str
+    :return: dictionnaire
+    :rtype: dict
+    :raise ValueError: si une ligne n'est pas un couple de littéraux python (clé, valeur)
+
+    .. note:: chaque ligne est lue par ast.literal_eval : aucun code du fichier n'est exécuté
+    """
+    dictionnaire = {}
+    with open(fichier_texte, encoding='UTF-8') as fichier_in:
+        for numero, ligne in enumerate(fichier_in, 1):
+            if not ligne.strip():  # ligne vide
+                continue
+            try:
+                cle, valeur = ast.literal_eval(ligne.strip())
+                dictionnaire[cle] = valeur  # TypeError si la clé n'est pas hachable (une liste par exemple)
+            except (SyntaxError, ValueError, TypeError) as erreur:
+                raise ValueError(f'{fichier_texte}, ligne {numero} : entrée invalide ({erreur})') from None
+    return dictionnaire  # renvoie le dictionnaire
+
+
+# ======================================================================================================================
+# IV. ETAT ET REGLES DE LA PARTIE
+# ======================================================================================================================
+
+class Partie:
+    """
+    Etat d'une partie (plan, position du personnage, inventaire) et règles du jeu.
+
+    :param plan: plan du chateau (une liste de listes d'entiers est convertie en plan compact)
+    :param dict_objet: dictionnaire position -> objet
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :param position: position initiale du personnage
+    :param fournisseur: fonction recevant la question d'une porte et la position de cette porte, et renvoyant
+                        la réponse du joueur (ou None si le joueur ne répond pas)
+    :type plan: Plan or list[list[int]]
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :type position: tuple[int, int]
+    :type fournisseur: callable or None
+
+    .. note:: sans observateur abonné, aucun événement n'est construit : le moteur peut alors enchaîner
+              les déplacements à pleine vitesse (tests automatiques, simulations).
+    """
+
+    def __init__(self, plan, dict_objet, dict_porte, position=POSITION_DEPART, fournisseur=None):
+        if not isinstance(plan, Plan):
+            plan = Plan.depuis_matrice(plan)
+        self.plan = plan
+        self.dict_objet = dict_objet
+        self.dict_porte = dict_porte
+        self.position = position
+        self.inventaire = []
+        self.fournisseur = fournisseur
+        self.observateurs = []
+
+    @property
+    def gagne(self):
+        """
+        Indique si le personnage a atteint la sortie.
+
+        :rtype: bool
+        """
+        return self.plan[self.position] == SORTIE
+
+    def abonner(self, observateur):
+        """
+        Abonne un observateur aux événements de rendu de la partie.
+
+        :param observateur: fonction appelée avec le nom de l'événement puis ses arguments
+        :type observateur: callable
+        """
+        self.observateurs.append(observateur)
+
+    def notifier(self, evenement, *arguments):
+        """
+        Transmet un événement à tous les observateurs abonnés.
+
+        :param evenement: nom de l'événement ('case', 'perso', 'annonce', 'inventaire', 'escalier', 'plan'
+                          ou 'gardes')
+        :param arguments: arguments de l'événement
+        :type evenement: str
+        """
+        for observateur in self.observateurs:
+            observateur(evenement, *arguments)
+
+    def case_def(self, position, type_case):
+        """
+        Change le type de case à la position donnée dans le plan.
+
+        :param position: position en coordonnées matricielles
+        :param type_case: type voulu de la nouvelle case [0, 5]
+        :type position: tuple[int, int]
+        :type type_case: int
+
+        .. note:: modifie le plan et émet l'événement 'case'
+        """
+        plan = self.plan
+        plan.cases[position[0] * plan.nb_colonnes + position[1]] = type_case
+        if self.observateurs:
+            self.notifier('case', position, type_case)
+
+    def deplacer(self, mouvement):
+        """
+        Déplace le personnage si le déplacement est possible.
+        Possible si :
+            - ne sort pas du plan
+            - ne rentre pas dans un mur
+            - n'est pas sur la case sortie
+        Un escalier reste un escalier quand le personnage le quitte.
+
+        :param mouvement: mouvement demandé
+        :type mouvement: tuple[int, int]
+        :return: la position du personnage après le déplacement
+        :rtype: tuple[int, int]
+
+        .. note:: - une porte (3) est franchie seulement si le fournisseur donne la bonne réponse
+                  - modifie le plan, la position et l'inventaire
+        .. seealso:: case_def(), ramasser_objet(), poser_question()
+        """
+        plan = self.plan
+        cases, nb_colonnes = plan.cases, plan.nb_colonnes
+        position = self.position
+        ligne_fin, colonne_fin = position[0] + mouvement[0], position[1] + mouvement[1]
+        if 0 <= ligne_fin < plan.nb_lignes and 0 <= colonne_fin < nb_colonnes \
+                and cases[position[0] * nb_colonnes + position[1]] != SORTIE:
+            # si la position finale est dans le plan (et que l'on est pas sur la sortie)
+            type_fin = cases[ligne_fin * nb_colonnes + colonne_fin]
+            if type_fin == PORTE:  # si on arrive sur une porte
+                return self.poser_question(mouvement)  # on pose la question correspondante
+            if type_fin != MUR:
+                if cases[position[0] * nb_colonnes + position[1]] != ESCALIER:
+                    self.case_def(position, VUE)  # la position précédente devient "vue"
+                position = self.position = ligne_fin, colonne_fin  # change de position
+                if type_fin == OBJET:  # si la case contient un objet
+                    self.ramasser_objet(position)  # il est ramassé
+                elif type_fin == SORTIE and self.observateurs:  # si c'est la sortie
+                    self.notifier('annonce', 'Bravo ! Vous avez gagné !')
+                if self.observateurs:
+                    self.notifier('perso', position)
+                    if type_fin == ESCALIER:
+                        self.notifier('escalier', position)
+        return self.position
+
+    def ramasser_objet(self, position):
+        """
+        Ramasse l'objet à la position donnée et l'ajoute à l'inventaire.
+        La case devient vide.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+
+        .. note:: modifie le plan et l'inventaire
+        """
+        new_object = self.dict_objet[position]
+        self.inventaire.append(new_object)  # ajoute l'objet à l'inventaire
+        if self.observateurs:
+            self.notifier('annonce', f'Vous avez trouvé : {new_object}')
+            self.notifier('inventaire', self.inventaire)
+        self.case_def(position, COULOIR)  # change en couloir la case où se trouvait l'objet
+
+    def poser_question(self, mouvement):
+        """
+        Pose la question de la porte rencontrée après mouvement du personnage, et ouvre la porte
+        si le fournisseur de réponses donne la bonne réponse.
+
+        :param mouvement: mouvement à effectuer pour arriver sur la porte
+        :type mouvement: tuple[int, int]
+        :return: la position du personnage (sur la porte si elle s'est ouverte)
+        :rtype: tuple[int, int]
+        """
+        case = self.position
+        new_case = (case[0] + mouvement[0], case[1] + mouvement[1])
+        question, reponse = self.dict_porte[new_case]
+        if self.observateurs:
+            self.notifier('annonce', 'Cette porte est fermée.')
+        if self.fournisseur is not None and self.fournisseur(question, new_case) == reponse:
+            if self.observateurs:
+                self.notifier('annonce', 'La porte s\'ouvre.')
+            if self.plan[case] != ESCALIER:
+                self.case_def(case, VUE)  # la position précédente devient "vue"
+            self.position = new_case
+            self.case_def(new_case, COULOIR)  # la porte devient un couloir
+            if self.observateurs:
+                self.notifier('perso', new_case)
+        elif self.observateurs:
+            self.notifier('annonce', 'Mauvaise réponse.')
+        return self.position
+
+    def changer_plan(self, plan, dict_objet, dict_porte, position):
+        """
+        Continue la partie sur un autre plan (changement d'étage), en gardant l'inventaire.
+
+        :param plan: nouveau plan
+        :param dict_objet: dictionnaire position -> objet du nouveau plan
+        :param dict_porte: dictionnaire position -> (question, réponse) du nouveau plan
+        :param position: position d'arrivée du personnage
+        :type plan: Plan
+        :type dict_objet: dict[tuple[int, int], str]
+        :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+        :type position: tuple[int, int]
+
+        .. note:: émet l'événement 'plan'
+        """
+        self.plan = plan
+        self.dict_objet = dict_objet
+        self.dict_porte = dict_porte
+        self.position = position
+        if self.observateurs:
+            self.notifier('plan', plan, position)
+
+
+def reponses_fixes(dict_porte):
+    """
+    Construit un fournisseur de réponses qui répond toujours juste aux questions des portes du niveau.
+    Utile pour les parties automatiques.
+
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :return: fournisseur de réponses
+    :rtype: callable
+
+    .. note:: la réponse est cherchée par porte : deux portes peuvent poser la même question
+    """
+    solutions = {porte: reponse for porte, (_, reponse) in dict_porte.items()}
+
+    def repondre(question, porte):
+        return solutions.get(porte)
+    return repondre
@@ -0,0 +1,300 @@
+"""
+    PROJET LANCELOT - niveaux compilés
+    ==================================
+
+    Compilation d'un niveau (plan + dictionnaire des objets + dictionnaire des portes) en un fichier binaire
+    unique et versionné, puis chargement de ce fichier au démarrage du jeu.
+
+    Les dictionnaires sont lus avec un analyseur de littéraux (ast.literal_eval) et non plus avec eval(), et
+    chaque entrée est validée (position dans le plan, types des valeurs). Le niveau compilé est rechargé tel
+    quel tant que ses fichiers sources sont les mêmes (chemin absolu, taille et date de modification) ; sinon
+    il est recompilé. Le chemin distingue deux copies d'un niveau aux dates conservées.
+
+    Format du niveau compilé (petit-boutiste) :
+        - en-tête : signature b'LNIV', version (1 octet), 3 octets de remplissage, position de la section du
+          plan (uint64) ;
+        - sources (plan, objets, portes) : date de modification (int64, en nanosecondes), taille (uint64) et
+          chemin absolu (uint32 de longueur puis octets du chemin) de chacune ;
+        - index des objets : nombre d'entrées (uint32), puis pour chacune ligne, colonne (uint32) et texte ;
+        - index des portes : nombre d'entrées (uint32), puis pour chacune ligne, colonne, question et réponse ;
+        - section du plan au format binaire de plan.py, projetée en mémoire au chargement.
+    Les textes sont codés en UTF-8, précédés de leur longueur (uint32).
+
+    Usage : python -m lancelot.niveau plan_chateau.txt dico_objets.txt dico_portes.txt -o chateau.lvl
+
+    Dependencies : plan.py, moteur.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import argparse
+import os
+import struct
+
+from .moteur import creer_dictionnaire, ESCALIER
+from .plan import lire_plan, ecrire_section_plan, ouvrir_plan_binaire
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+SIGNATURE = b'LNIV'
+VERSION = 2
+ENTETE = struct.Struct('<4sB3xQ')  # signature, version, position de la section du plan
+SOURCE = struct.Struct('<qQ')  # date de modification, taille (suivies du chemin de la source)
+ENTIER = struct.Struct('<I')
+POSITION = struct.Struct('<II')
+TYPES_CONNUS = bytes(range(ESCALIER + 1))
+
+
+# ======================================================================================================================
+# III. VALIDATION DES SOURCES
+# ======================================================================================================================
+
+def valider_plan(plan, fichier):
+    """
+    Vérifie que le plan n'est pas vide et que toutes ses cases sont d'un type connu.
+
+    :param plan: plan du chateau
+    :param fichier: nom du fichier source (pour les messages d'erreur)
+    :type plan: Plan
+    :type fichier: str
+    :raise ValueError: si le plan est invalide
+    """
+    if plan.nb_lignes == 0 or plan.nb_colonnes == 0:
+        raise ValueError(f'{fichier} : plan vide')
+    inconnus = bytes(plan.cases).translate(None, TYPES_CONNUS)
+    if inconnus:
+        raise ValueError(f'{fichier} : type de case inconnu ({inconnus[0]})')
+
+
+def valider_dictionnaire(dictionnaire, plan, fichier, nb_textes):
+    """
+    Vérifie que les clés du dictionnaire sont des positions du plan et que ses valeurs sont un texte
+    (nb_textes = 1, objets) ou un couple de textes (nb_textes = 2, portes).
+
+    :param dictionnaire: dictionnaire position -> valeur
+    :param plan: plan du chateau
+    :param fichier: nom du fichier source (pour les messages d'erreur)
+    :param nb_textes: nombre de textes attendus par entrée (1 ou 2)
+    :type dictionnaire: dict
+    :type plan: Plan
+    :type fichier: str
+    :type nb_textes: int
+    :raise ValueError: si une entrée est invalide
+    """
+    for position, valeur in dictionnaire.items():
+        if not (isinstance(position, tuple) and len(position) == 2 and all(type(n) is int for n in position)):
+            raise ValueError(f'{fichier} : la clé {position!r} n\'est pas une position (ligne, colonne)')
+        if not plan.contient(position):
+            raise ValueError(f'{fichier} : la position {position} est hors du plan')
+        textes = (valeur,) if nb_textes == 1 else valeur
+        if not (isinstance(textes, tuple) and len(textes) == nb_textes and all(isinstance(t, str) for t in textes)):
+            attendu = 'un texte' if nb_textes == 1 else 'un couple (question, réponse)'
+            raise ValueError(f'{fichier} : la valeur en {position} doit être {attendu}')
+
+
+# ======================================================================================================================
+# IV. COMPILATION ET CHARGEMENT
+# ======================================================================================================================
+
+def identifier_sources(*fichiers):
+    """
+    Identifie les fichiers sources : chemin absolu (en octets), taille et date de modification (en nanosecondes).
+
+    :rtype: tuple[tuple[bytes, int, int], ...]
+    """
+    identites = []
+    for fichier in fichiers:
+        etat = os.stat(fichier)
+        identites.append((os.fsencode(os.path.realpath(fichier)), etat.st_size, etat.st_mtime_ns))
+    return tuple(identites)
+
+
+def ecrire_texte(fichier_out, texte):
+    """
+    Ecrit un texte en UTF-8 précédé de sa longueur.
+
+    :param fichier_out: fichier binaire ouvert en écriture
+    :param texte: texte à écrire
+    :type fichier_out: io.BufferedWriter
+    :type texte: str
+    """
+    donnees = texte.encode('UTF-8')
+    fichier_out.write(ENTIER.pack(len(donnees)))
+    fichier_out.write(donnees)
+
+
+def lire_texte(donnees, decalage):
+    """
+    Lit un texte écrit par ecrire_texte().
+
+    :param donnees: octets lus dans le fichier
+    :param decalage: position du texte dans les octets
+    :type donnees: bytes
+    :type decalage: int
+    :return: le texte et la position qui le suit
+    :rtype: tuple[str, int]
+    """
+    longueur, = ENTIER.unpack_from(donnees, decalage)
+    decalage += ENTIER.size
+    return str(donnees[decalage:decalage + longueur], 'UTF-8'), decalage + longueur
+
+
+def compiler_niveau(fichier_plan, fichier_objets, fichier_portes, fichier_niveau):
+    """
+    Valide les sources d'un niveau et les compile en un fichier binaire unique.
+
+    :param fichier_plan: chemin du plan (texte ou binaire)
+    :param fichier_objets: chemin du dictionnaire des objets
+    :param fichier_portes: chemin du dictionnaire des portes
+    :param fichier_niveau: chemin du niveau compilé à écrire
+    :type fichier_plan: str
+    :type fichier_objets: str
+    :type fichier_portes: str
+    :type fichier_niveau: str
+    :raise ValueError: si une source est invalide
+
+    .. note:: le niveau est écrit dans un fichier temporaire puis renommé, pour ne jamais laisser
+              un niveau compilé à moitié écrit
+    """
+    sources = identifier_sources(fichier_plan, fichier_objets, fichier_portes)
+    plan = lire_plan(fichier_plan)
+    try:  # un plan binaire est projeté en mémoire : il est refermé même si une source est refusée
+        valider_plan(plan, fichier_plan)
+        dict_objet = creer_dictionnaire(fichier_objets)
+        valider_dictionnaire(dict_objet, plan, fichier_objets, 1)
+        dict_porte = creer_dictionnaire(fichier_portes)
+        valider_dictionnaire(dict_porte, plan, fichier_portes, 2)
+        fichier_temporaire = fichier_niveau + '.tmp'
+        with open(fichier_temporaire, 'wb') as fichier_out:
+            fichier_out.write(ENTETE.pack(SIGNATURE, VERSION, 0))
+            for chemin, taille, date in sources:
+                fichier_out.write(SOURCE.pack(date, taille))
+                fichier_out.write(ENTIER.pack(len(chemin)))
+                fichier_out.write(chemin)
+            fichier_out.write(ENTIER.pack(len(dict_objet)))
+            for position, objet in dict_objet.items():
+                fichier_out.write(POSITION.pack(*position))
+                ecrire_texte(fichier_out, objet)
+            fichier_out.write(ENTIER.pack(len(dict_porte)))
+            for position, (question, reponse) in dict_porte.items():
+                fichier_out.write(POSITION.pack(*position))
+                ecrire_texte(fichier_out, question)
+                ecrire_texte(fichier_out, reponse)
+            section_plan = fichier_out.tell()
+            ecrire_section_plan(plan, fichier_out)
+            fichier_out.seek(0)
+            fichier_out.write(ENTETE.pack(SIGNATURE, VERSION, section_plan))
+    finally:
+        plan.fermer()
+    os.replace(fichier_temporaire, fichier_niveau)
+
+
+def lire_entete(fichier_niveau):
+    """
+    Lit l'en-tête d'un niveau compilé.
+
+    :param fichier_niveau: chemin du niveau compilé
+    :type fichier_niveau: str
+    :return: les sources (chemin, taille, date) du niveau, la position de la section du plan et celle de
+             l'index des objets, ou None si le fichier n'existe pas ou n'est pas un niveau compilé de la
+             version courante
+    :rtype: tuple[tuple[tuple[bytes, int, int], ...], int, int] or None
+    """
+    try:
+        with open(fichier_niveau, 'rb') as fichier_in:
+            entete = fichier_in.read(ENTETE.size)
+            if len(entete) != ENTETE.size:
+                return None
+            signature, version, section_plan = ENTETE.unpack(entete)
+            if signature != SIGNATURE or version != VERSION:
+                return None
+            sources = []
+            for _ in range(3):
+                source = fichier_in.read(SOURCE.size + ENTIER.size)
+                if len(source) != SOURCE.size + ENTIER.size:
+                    return None
+                date, taille = SOURCE.unpack_from(source)
+                longueur, = ENTIER.unpack_from(source, SOURCE.size)
+                chemin = fichier_in.read(longueur)
+                if len(chemin) != longueur:
+                    return None
+                sources.append((chemin, taille, date))
+            return tuple(sources), section_plan, fichier_in.tell()
+    except FileNotFoundError:
+        return None
+
+
+def ouvrir_niveau(fichier_niveau):
+    """
+    Charge un niveau compilé : les index sont décodés, le plan est projeté en mémoire.
+
+    :param fichier_niveau: chemin du niveau compilé
+    :type fichier_niveau: str
+    :return: le plan, le dictionnaire des objets et le dictionnaire des portes
+    :rtype: tuple[Plan, dict, dict]
+    :raise ValueError: si le fichier n'est pas un niveau compilé de la version courante
+    """
+    entete = lire_entete(fichier_niveau)
+    if entete is None:
+        raise ValueError(f'{fichier_niveau} n\'est pas un niveau compilé (version {VERSION})')
+    _, section_plan, index = entete
+    with open(fichier_niveau, 'rb') as fichier_in:
+        fichier_in.seek(index)
+        donnees = fichier_in.read(section_plan - index)
+    decalage = 0
+    dict_objet = {}
+    nb_objets, = ENTIER.unpack_from(donnees, decalage)
+    decalage += ENTIER.size
+    for _ in range(nb_objets):
+        position = POSITION.unpack_from(donnees, decalage)
+        dict_objet[position], decalage = lire_texte(donnees, decalage + POSITION.size)
+    dict_porte = {}
+    nb_portes, = ENTIER.unpack_from(donnees, decalage)
+    decalage += ENTIER.size
+    for _ in range(nb_portes):
+        position = POSITION.unpack_from(donnees, decalage)
+        question, decalage = lire_texte(donnees, decalage + POSITION.size)
+        reponse, decalage = lire_texte(donnees, decalage)
+        dict_porte[position] = (question, reponse)
+    return ouvrir_plan_binaire(fichier_niveau, section_plan), dict_objet, dict_porte
+
+
+def charger_niveau(fichier_plan, fichier_objets, fichier_portes, fichier_niveau):
+    """
+    Charge le niveau compilé, en le (re)compilant d'abord s'il n'existe pas ou si ses sources ont changé.
+
+    :param fichier_plan: chemin du plan (texte ou binaire)
+    :param fichier_objets: chemin du dictionnaire des objets
+    :param fichier_portes: chemin du dictionnaire des portes
+    :param fichier_niveau: chemin du niveau compilé
+    :type fichier_plan: str
+    :type fichier_objets: str
+    :type fichier_portes: str
+    :type fichier_niveau: str
+    :return: le plan, le dictionnaire des objets et le dictionnaire des portes
+    :rtype: tuple[Plan, dict, dict]
+    """
+    entete = lire_entete(fichier_niveau)
+    if entete is None or entete[0] != identifier_sources(fichier_plan, fichier_objets, fichier_portes):
+        compiler_niveau(fichier_plan, fichier_objets, fichier_portes, fichier_niveau)
+    return ouvrir_niveau(fichier_niveau)
+
+
+# ======================================================================================================================
+# V. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description='Compile un niveau en un fichier binaire unique.')
+    analyseur.add_argument('plan', help='plan du chateau (texte ou binaire)')
+    analyseur.add_argument('objets', help='dictionnaire des objets')
+    analyseur.add_argument('portes', help='dictionnaire des portes')
+    analyseur.add_argument('-o', '--sortie', default='chateau.lvl', help='niveau compilé (défaut : chateau.lvl)')
+    arguments = analyseur.parse_args()
+    try:
+        compiler_niveau(arguments.plan, arguments.objets, arguments.portes, arguments.sortie)
+    except (OSError, ValueError) as erreur:
+        analyseur.exit(1, f'erreur : {erreur}\n')
@@ -0,0 +1,356 @@
+"""
+    PROJET LANCELOT - plan compact
+    ==============================
+
+    Représentation compacte du plan du chateau : une case par octet, stockée à plat ligne par ligne
+    (indice = ligne * nb_colonnes + colonne) dans un bytearray, ou directement dans un fichier binaire
+    projeté en mémoire (mmap) pour les grands plans. Plusieurs parties peuvent partager un même plan à
+    travers une superposition qui ne garde que leurs cases modifiées.
+
+    Format binaire (petit-boutiste) :
+        - en-tête de 16 octets : signature b'LANC', version (1 octet), 3 octets de remplissage,
+          nombre de lignes (uint32), nombre de colonnes (uint32) ;
+        - puis les cases, un octet chacune, ligne par ligne.
+
+    Usage : python -m lancelot.plan plan_chateau.txt plan_chateau.bin  (convertit un plan texte au format binaire)
+
+    Dependencies : aucune
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import mmap
+import struct
+import sys
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+SIGNATURE = b'LANC'
+VERSION = 1
+ENTETE = struct.Struct('<4sB3xII')  # signature, version, nombre de lignes, nombre de colonnes
+
+CHIFFRES = b'0123456789'
+TABLE_CHIFFRES = bytes.maketrans(CHIFFRES, bytes(range(10)))  # caractère '0'-'9' -> octet 0-9
+
+
+# ======================================================================================================================
+# III. DEFINITION DU PLAN
+# ======================================================================================================================
+
+class Plan:
+    """
+    Plan du chateau stocké à plat, une case par octet.
+
+    :param nb_lignes: nombre de lignes du plan
+    :param nb_colonnes: nombre de colonnes du plan
+    :param cases: octets des cases, ligne par ligne (bytearray, ou memoryview modifiable d'un mmap)
+    :param projection: mmap dont sont issues les cases, gardé ouvert tant que le plan existe
+    :type nb_lignes: int
+    :type nb_colonnes: int
+    :type cases: bytearray or memoryview or Superposition
+    :type projection: mmap.mmap or None
+
+    .. note:: pour les boucles critiques, indexer directement plan.cases[ligne * plan.nb_colonnes + colonne]
+    """
+
+    def __init__(self, nb_lignes, nb_colonnes, cases=None, projection=None):
+        if cases is None:
+            cases = bytearray(nb_lignes * nb_colonnes)
+        if len(cases) != nb_lignes * nb_colonnes:
+            raise ValueError(f'{len(cases)} cases pour un plan de {nb_lignes} x {nb_colonnes}')
+        self.nb_lignes = nb_lignes
+        self.nb_colonnes = nb_colonnes
+        self.cases = cases
+        self.projection = projection
+
+    @classmethod
+    def depuis_matrice(cls, matrice):
+        """
+        Construit un plan à partir d'une liste de listes d'entiers.
+
+        :param matrice: liste de liste d'entiers représentant le plan du chateau
+        :type matrice: list[list[int]]
+        :return: le plan correspondant
+        :rtype: Plan
+        """
+        nb_colonnes = len(matrice[0])
+        cases = bytearray()
+        for ligne in matrice:
+            if len(ligne) != nb_colonnes:
+                raise ValueError(f'ligne de {len(ligne)} cases dans un plan de {nb_colonnes} colonnes')
+            cases.extend(ligne)
+        return cls(len(matrice), nb_colonnes, cases)
+
+    def vers_matrice(self):
+        """
+        Convertit le plan en liste de listes d'entiers.
+
+        :rtype: list[list[int]]
+        """
+        return [list(self.ligne(ligne)) for ligne in range(self.nb_lignes)]
+
+    def copier(self):
+        """
+        Copie le plan en mémoire (bytearray), par exemple pour rejouer une partie sur un plan intact.
+
+        :rtype: Plan
+        """
+        return Plan(self.nb_lignes, self.nb_colonnes, bytearray(self.cases))
+
+    def superposer(self):
+        """
+        Crée une vue modifiable du plan qui ne copie pas ses cases : les cases modifiées sont gardées à part
+        (voir Superposition), le plan d'origine n'est jamais modifié.
+
+        :rtype: Plan
+
+        .. note:: la mémoire utilisée est proportionnelle au nombre de cases modifiées, pas à la taille du plan
+        """
+        return Plan(self.nb_lignes, self.nb_colonnes, Superposition(self.cases))
+
+    def indice(self, position):
+        """
+        Calcule l'indice à plat d'une position.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+        :rtype: int
+        """
+        return position[0] * self.nb_colonnes + position[1]
+
+    def contient(self, position):
+        """
+        Indique si une position est dans le plan.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+        :rtype: bool
+        """
+        return 0 <= position[0] < self.nb_lignes and 0 <= position[1] < self.nb_colonnes
+
+    def ligne(self, ligne):
+        """
+        Renvoie les octets d'une ligne du plan.
+
+        :param ligne: numéro de la ligne
+        :type ligne: int
+        :rtype: bytes
+        """
+        debut = ligne * self.nb_colonnes
+        return bytes(self.cases[debut:debut + self.nb_colonnes])
+
+    def indices(self, type_case):
+        """
+        Renvoie les indices à plat de toutes les cases d'un type donné.
+
+        :param type_case: type de case recherché
+        :type type_case: int
+        :rtype: list[int]
+
+        .. note:: la recherche se fait avec bytes.find, sans boucle python sur les cases
+        """
+        octets = self.cases if isinstance(self.cases, bytearray) else bytes(self.cases)
+        motif = bytes((type_case,))
+        resultat = []
+        indice = octets.find(motif)
+        while indice != -1:
+            resultat.append(indice)
+            indice = octets.find(motif, indice + 1)
+        return resultat
+
+    def tableau(self):
+        """
+        Renvoie une vue NumPy (uint8, nb_lignes x nb_colonnes) des cases, sans copie.
+
+        :rtype: numpy.ndarray
+
+        .. warning:: nécessite NumPy, importé seulement à l'appel (dépendance optionnelle)
+        .. note:: la vue partage la mémoire du plan : la modifier modifie le plan
+        """
+        import numpy
+        return numpy.frombuffer(self.cases, dtype=numpy.uint8).reshape(self.nb_lignes, self.nb_colonnes)
+
+    def __getitem__(self, position):
+        return self.cases[position[0] * self.nb_colonnes + position[1]]
+
+    def __setitem__(self, position, type_case):
+        self.cases[position[0] * self.nb_colonnes + position[1]] = type_case
+
+    def fermer(self):
+        """
+        Libère la projection en mémoire du fichier binaire, s'il y en a une.
+        """
+        if self.projection is not None:
+            self.cases.release()
+            self.projection.close()
+            self.projection = None
+
+
+class Superposition:
+    """
+    Cases d'un plan partagé, vues à travers une couche de cases modifiées propre à une partie.
+
+    Se lit et s'écrit comme les cases d'un plan (indices à plat) ; les écritures ne vont que dans la couche,
+    les cases partagées ne sont jamais modifiées.
+
+    :param base: cases partagées, en lecture seule
+    :type base: bytes or bytearray or memoryview
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.modifications = {}  # indice -> type de la case modifiée
+
+    def __len__(self):
+        return len(self.base)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            debut, fin, _ = indice.indices(len(self.base))
+            octets = bytearray(self.base[debut:fin])
+            for modifiee, type_case in self.modifications.items():
+                if debut <= modifiee < fin:
+                    octets[modifiee - debut] = type_case
+            return octets
+        type_case = self.modifications.get(indice)
+        return self.base[indice] if type_case is None else type_case
+
+    def __setitem__(self, indice, type_case):
+        self.modifications[indice] = type_case
+
+    def __bytes__(self):
+        return bytes(self[:])
+
+
+# ======================================================================================================================
+# IV. LECTURE ET ECRITURE DES FICHIERS
+# ======================================================================================================================
+
+def lire_plan_texte(fichier):
+    """
+    Lit un plan au format texte (cases séparées par des espaces, une ligne du plan par ligne du fichier).
+
+    :param fichier: chemin du fichier texte du plan du chateau
+    :type fichier: str
+    :return: le plan
+    :rtype: Plan
+    :raise ValueError: si une case n'est pas un chiffre, si les lignes n'ont pas toutes le même nombre de cases
+                       ou si le plan est vide
+
+    .. note:: chaque ligne est convertie en bloc (join puis translate), sans créer d'entier par case
+    """
+    cases = bytearray()
+    nb_lignes = nb_colonnes = 0
+    with open(fichier, 'rb') as fichier_in:
+        for numero, ligne in enumerate(fichier_in, 1):
+            jetons = ligne.split()
+            if not jetons:  # ligne vide (fin de fichier)
+                continue
+            rangee = b''.join(jetons)
+            if len(rangee) != len(jetons) or rangee.translate(None, CHIFFRES):
+                raise ValueError(f'{fichier}, ligne {numero} : les cases doivent être des chiffres')
+            if nb_lignes == 0:
+                nb_colonnes = len(jetons)
+            elif len(jetons) != nb_colonnes:
+                raise ValueError(f'{fichier}, ligne {numero} : {len(jetons)} cases au lieu de {nb_colonnes}')
+            cases += rangee.translate(TABLE_CHIFFRES)
+            nb_lignes += 1
+    if not nb_lignes:
+        raise ValueError(f'{fichier} : plan vide')
+    return Plan(nb_lignes, nb_colonnes, cases)
+
+
+def ouvrir_plan_binaire(fichier, decalage=0):
+    """
+    Ouvre un plan au format binaire en le projetant en mémoire.
+
+    :param fichier: chemin du fichier binaire du plan du chateau
+    :param decalage: position de l'en-tête du plan dans le fichier (plan inclus dans un autre fichier)
+    :type fichier: str
+    :type decalage: int
+    :return: le plan, dont les cases sont lues à la demande depuis le fichier
+    :rtype: Plan
+
+    :raise ValueError: si l'en-tête n'est pas celui d'un plan binaire de la version courante, si le plan est
+                       vide, ou si le fichier est trop court pour les cases annoncées
+
+    .. note:: - la projection est en copie à l'écriture : les modifications du plan ne touchent pas le
+                fichier, et seules les pages modifiées sont copiées en mémoire
+              - la projection est refermée si le fichier est refusé
+    """
+    with open(fichier, 'rb') as fichier_in:
+        projection = mmap.mmap(fichier_in.fileno(), 0, access=mmap.ACCESS_COPY)
+    try:
+        if len(projection) < decalage + ENTETE.size:
+            raise ValueError(f'{fichier} n\'est pas un plan binaire (en-tête tronqué)')
+        signature, version, nb_lignes, nb_colonnes = ENTETE.unpack_from(projection, decalage)
+        if signature != SIGNATURE or version != VERSION:
+            raise ValueError(f'{fichier} n\'est pas un plan binaire (version {VERSION})')
+        if not nb_lignes or not nb_colonnes:
+            raise ValueError(f'{fichier} : plan vide')
+        debut = decalage + ENTETE.size
+        if len(projection) < debut + nb_lignes * nb_colonnes:
+            raise ValueError(f'{fichier} : plan tronqué ({nb_lignes} x {nb_colonnes} cases annoncées)')
+    except ValueError:
+        projection.close()
+        raise
+    cases = memoryview(projection)[debut:debut + nb_lignes * nb_colonnes]
+    return Plan(nb_lignes, nb_colonnes, cases, projection)
+
+
+def ecrire_plan_binaire(plan, fichier):
+    """
+    Enregistre un plan au format binaire.
+
+    :param plan: le plan à enregistrer
+    :param fichier: chemin du fichier binaire
+    :type plan: Plan
+    :type fichier: str
+    """
+    with open(fichier, 'wb') as fichier_out:
+        ecrire_section_plan(plan, fichier_out)
+
+
+def ecrire_section_plan(plan, fichier_out):
+    """
+    Ecrit l'en-tête et les cases d'un plan au format binaire dans un fichier déjà ouvert.
+
+    :param plan: le plan à enregistrer
+    :param fichier_out: fichier binaire ouvert en écriture
+    :type plan: Plan
+    :type fichier_out: io.BufferedWriter
+
+    .. note:: les cases d'une superposition (Plan.superposer) sont écrites avec leurs modifications
+    """
+    fichier_out.write(ENTETE.pack(SIGNATURE, VERSION, plan.nb_lignes, plan.nb_colonnes))
+    cases = plan.cases
+    fichier_out.write(bytes(cases) if isinstance(cases, Superposition) else cases)
+
+
+def lire_plan(fichier):
+    """
+    Lit un plan au format binaire (reconnu à sa signature) ou texte.
+
+    :param fichier: chemin du fichier du plan du chateau
+    :type fichier: str
+    :return: le plan
+    :rtype: Plan
+    """
+    with open(fichier, 'rb') as fichier_in:
+        signature = fichier_in.read(len(SIGNATURE))
+    if signature == SIGNATURE:
+        return ouvrir_plan_binaire(fichier)
+    return lire_plan_texte(fichier)
+
+
+# ======================================================================================================================
+# V. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit('usage : python -m lancelot.plan plan.txt plan.bin')
+    ecrire_plan_binaire(lire_plan_texte(sys.argv[1]), sys.argv[2])
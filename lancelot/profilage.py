@@ -0,0 +1,208 @@
+"""
+    PROJET LANCELOT - profilage des parties
+    =======================================
+
+    Instrumentation des chemins critiques pour le mode --profile du jeu :
+        - nombre d'appels, durée cumulée, médiane (p50) et 99e centile (p99) de afficher_plan, deplacer,
+          case_def, tracer_case, tracer_annonce, tracer_inventaire et de chaque image (dessiner) ;
+        - nombre d'appels aux primitives du canevas de turtle (create_*, itemconfigure, coords, move...)
+          et aux rafraîchissements de l'écran ;
+        - nombre d'items du canevas après chaque image ;
+        - latence entre l'appui sur une touche et l'image qui montre le déplacement.
+
+    Les méthodes sont remplacées, sur les objets instrumentés seulement, par des versions chronométrées :
+    sans profilage rien n'est remplacé, le surcoût est nul.
+
+    Dependencies : aucune
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import json
+import time
+from collections import Counter, deque
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+METHODES_PARTIE = ('deplacer', 'case_def')
+METHODES_RENDU = ('afficher_plan', 'tracer_case', 'tracer_annonce', 'tracer_inventaire')
+PRIMITIVES = ('create_rectangle', 'create_oval', 'create_text', 'create_image', 'itemconfigure', 'coords', 'move',
+              'delete', 'tag_raise')
+
+
+# ======================================================================================================================
+# III. STATISTIQUES
+# ======================================================================================================================
+
+def statistiques(durees):
+    """
+    Résume une liste de durées.
+
+    :param durees: durées en secondes
+    :type durees: list[float]
+    :return: nombre, cumul, p50 et p99 (en millisecondes), et maximum
+    :rtype: dict[str, float]
+    """
+    if not durees:
+        return {'appels': 0, 'cumul_ms': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    triees = sorted(durees)
+    return {'appels': len(triees), 'cumul_ms': sum(triees) * 1000,
+            'p50_ms': triees[(len(triees) - 1) // 2] * 1000,
+            'p99_ms': triees[int(0.99 * (len(triees) - 1))] * 1000, 'max_ms': triees[-1] * 1000}
+
+
+# ======================================================================================================================
+# IV. PROFILEUR
+# ======================================================================================================================
+
+class Profileur:
+    """
+    Collecte les mesures d'une partie instrumentée.
+    """
+
+    def __init__(self):
+        self.debut = time.perf_counter()
+        self.durees = {}  # nom de la fonction -> durées de ses appels
+        self.primitives = Counter()  # nom de la primitive -> nombre d'appels
+        self.items = []  # nombre d'items du canevas après chaque image
+        self.latences = []  # secondes entre l'appui sur une touche et l'image du déplacement
+        self.appuis = deque()  # instants des appuis dont le déplacement n'est pas encore affiché
+        self.deplacements = 0  # déplacements appliqués depuis la dernière image
+
+    def chronometrer(self, objet, nom):
+        """
+        Remplace une méthode d'un objet par une version chronométrée.
+
+        :param objet: objet instrumenté
+        :param nom: nom de la méthode
+        :type nom: str
+        """
+        fonction = getattr(objet, nom)
+        durees = self.durees.setdefault(nom, [])
+
+        def chronometree(*arguments, **options):
+            debut = time.perf_counter()
+            try:
+                return fonction(*arguments, **options)
+            finally:
+                durees.append(time.perf_counter() - debut)
+
+        setattr(objet, nom, chronometree)
+
+    def compter(self, objet, nom):
+        """
+        Remplace une méthode d'un objet par une version qui compte ses appels.
+
+        :param objet: objet instrumenté
+        :param nom: nom de la méthode
+        :type nom: str
+        """
+        fonction = getattr(objet, nom)
+        primitives = self.primitives
+
+        def comptee(*arguments, **options):
+            primitives[nom] += 1
+            return fonction(*arguments, **options)
+
+        setattr(objet, nom, comptee)
+
+    def instrumenter_partie(self, partie):
+        """
+        Instrumente les règles du moteur.
+
+        :param partie: partie à instrumenter
+        :type partie: Partie
+        """
+        for nom in METHODES_PARTIE:
+            self.chronometrer(partie, nom)
+        deplacer = partie.deplacer
+
+        def deplacer_compte(mouvement):
+            self.deplacements += 1
+            return deplacer(mouvement)
+
+        partie.deplacer = deplacer_compte
+
+    def instrumenter_rendu(self, rendu):
+        """
+        Instrumente le rendu, ses images et les primitives de son canevas.
+
+        :param rendu: rendu à instrumenter (avant afficher_plan)
+        :type rendu: Rendu
+        """
+        for nom in METHODES_RENDU:
+            self.chronometrer(rendu, nom)
+        canevas = rendu.canevas
+        for nom in PRIMITIVES:
+            if hasattr(canevas, nom):
+                self.compter(canevas, nom)
+        self.compter(rendu, 'rafraichir')
+        self.chronometrer(rendu, 'dessiner')
+        dessiner = rendu.dessiner
+
+        def dessiner_mesure():
+            dessiner()
+            fin = time.perf_counter()
+            for _ in range(min(self.deplacements, len(self.appuis))):  # déplacements montrés par cette image
+                self.latences.append(fin - self.appuis.popleft())
+            self.deplacements = 0
+            self.items.append(len(canevas.find_all()))
+
+        rendu.dessiner = dessiner_mesure
+
+    def horodater(self, gestionnaire):
+        """
+        Enveloppe un gestionnaire d'appui sur une touche pour noter l'instant de l'appui.
+
+        :param gestionnaire: fonction événementielle du clavier
+        :type gestionnaire: callable
+        :rtype: callable
+        """
+        def gestionnaire_horodate():
+            self.appuis.append(time.perf_counter())
+            return gestionnaire()
+
+        return gestionnaire_horodate
+
+    def rapport(self):
+        """
+        Renvoie le rapport des mesures de la session.
+
+        :rtype: dict
+        """
+        return {'duree_s': time.perf_counter() - self.debut,
+                'fonctions': {nom: statistiques(durees) for nom, durees in self.durees.items()},
+                'primitives': dict(self.primitives),
+                'items': {'images': len(self.items), 'max': max(self.items, default=0),
+                          'final': self.items[-1] if self.items else 0},
+                'latence': statistiques(self.latences)}
+
+    def ecrire(self, fichier):
+        """
+        Ecrit le rapport en JSON.
+
+        :param fichier: chemin du rapport
+        :type fichier: str
+        """
+        with open(fichier, 'w', encoding='UTF-8') as fichier_out:
+            json.dump(self.rapport(), fichier_out, indent=2)
+
+    def resume(self):
+        """
+        Met en forme le rapport pour la console.
+
+        :rtype: str
+        """
+        rapport = self.rapport()
+        lignes = [f'Session de {rapport["duree_s"]:.1f} s',
+                  f'{"fonction":<20}{"appels":>10}{"cumul ms":>12}{"p50 ms":>10}{"p99 ms":>10}{"max ms":>10}']
+        for nom, stats in list(rapport['fonctions'].items()) + [('latence touche', rapport['latence'])]:
+            lignes.append(f'{nom:<20}{stats["appels"]:>10}{stats["cumul_ms"]:>12.1f}{stats["p50_ms"]:>10.3f}'
+                          f'{stats["p99_ms"]:>10.3f}{stats["max_ms"]:>10.3f}')
+        lignes.append('primitives : ' + ', '.join(f'{nom} {nombre}' for nom, nombre in
+                                                  sorted(rapport['primitives'].items())))
+        lignes.append('items du canevas : {max} au plus, {final} à la fin'.format(**rapport['items']))
+        return '\n'.join(lignes)
@@ -0,0 +1,518 @@
+"""
+    PROJET LANCELOT - rendu en mode retenu
+    ======================================
+
+    Affichage du plan sur le canevas Tk de turtle en mode retenu : chaque case, le personnage, l'annonce et
+    les entrées de l'inventaire sont des items du canevas créés une seule fois, puis modifiés sur place
+    (couleur, coordonnées, texte). Les changements notifiés par le moteur sont accumulés et appliqués en une
+    fois par dessiner(), suivi d'un unique rafraîchissement de l'écran par image.
+
+    Le plan est vu à travers une caméra qui suit le personnage avec des cases de dimension fixe (au moins
+    PAS_MINIMAL pixels). Il est découpé en tuiles de TAILLE_TUILE x TAILLE_TUILE cases : seules les tuiles
+    visibles ont des items sur le canevas. Leurs lignes sont lues dans le plan au moment où elles entrent dans
+    la vue (à la demande depuis le disque pour un plan binaire projeté en mémoire), et leurs items sont
+    supprimés quand elles en sortent.
+
+    Le nombre d'items du canevas dépend donc de la taille de la fenêtre et non de celle du plan, et le coût
+    d'une image ne dépend que du nombre de cases modifiées et des tuiles qui entrent dans la vue.
+
+    Avec une vision (brouillard de guerre, voir vision.py), les cases hors du champ de la torche sont des items
+    cachés, que Tk ne dessine pas : seul un fond COULEUR_BROUILLARD couvre la zone du plan, et seules les cases
+    dont la visibilité change sont retracées à chaque déplacement.
+
+    Les gardes en ronde (gardes.py) n'ont d'items que dans la vue : à chaque image, seuls les gardes déplacés
+    dans la vue (ou qui viennent d'en sortir) sont retracés, et tous ceux de la vue quand la caméra bouge.
+
+    Dependencies : CONFIGS.py (le canevas et la fonction de rafraîchissement sont fournis par le front-end)
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+from .CONFIGS import ZONE_PLAN_MINI, ZONE_PLAN_MAXI, POINT_AFFICHAGE_ANNONCES, POINT_AFFICHAGE_INVENTAIRE, \
+    PAS_MINIMAL, TAILLE_TUILE, COULEUR_CASES, COULEURS, COULEUR_EXTERIEUR, COULEUR_BROUILLARD, COULEUR_PERSONNAGE, \
+    RATIO_PERSONNAGE, POSITION_DEPART, COULEUR_GARDE
+
+
+# ======================================================================================================================
+# II. DEFINITION DES FONCTIONS DE CALCUL
+# ======================================================================================================================
+
+def calculer_pas(plan):
+    """
+    Calcule la dimension à donner aux cases pour l'affichage du plan.
+
+    :param plan: plan du chateau
+    :type plan: Plan
+    :return: la longueur des côté des cases qui composent le plan
+    :rtype: int
+
+    .. warning:: utilise CONFIGS.py (ZONE_PLAN_MINI, ZONE_PLAN_MAXI)
+    """
+    nb_lignes = plan.nb_lignes
+    nb_colonnes = plan.nb_colonnes
+    lx_affichage = abs(ZONE_PLAN_MAXI[0] - ZONE_PLAN_MINI[0])  # longueur sur l'axe des x de la zone d'affichage
+    ly_affichage = abs(ZONE_PLAN_MAXI[1] - ZONE_PLAN_MINI[1])  # longueur sur l'axe des y de la zone d'affichage
+    return min(lx_affichage // nb_colonnes,
+               ly_affichage // nb_lignes)  # calcul le pas selon x et y, renvoie le plus petit
+
+
+def coordonnees(case, pas):
+    """
+    Calcule les coordonnées en pixels turtle du coin inférieur gauche d'une case définie
+    par ses coordonnées.
+
+    :param case: coordonnées matricielles de la case sur le plan
+    :param pas: longueur des côtés de la case
+    :type case: tuple[int, int]
+    :type pas : int
+    :return: coordonnées (turtle) du coin inférieur gauche de la case
+    :rtype: tuple[int, int]
+
+    .. warning:: utilise CONFIGS.py (ZONE_PLAN_MINI, ZONE_PLAN_MAXI)
+    """
+    x_case = ZONE_PLAN_MINI[0] + case[1] * pas
+    y_case = ZONE_PLAN_MAXI[1] - (1 + case[0]) * pas
+    return x_case, y_case
+
+
+# ======================================================================================================================
+# III. RENDU EN MODE RETENU
+# ======================================================================================================================
+
+class Rendu:
+    """
+    Rendu retenu et par tuiles du plan, du personnage, des annonces et de l'inventaire sur un canevas Tk.
+
+    :param canevas: canevas Tk de turtle (turtle.getcanvas()) ou tout objet offrant la même interface
+    :param rafraichir: fonction de rafraîchissement de l'écran (turtle.update)
+    :param vision: champ de vision de la torche (None : tout le plan est visible)
+    :type canevas: tkinter.Canvas
+    :type rafraichir: callable
+    :type vision: vision.Vision or None
+
+    .. note:: - les coordonnées turtle (x, y) correspondent aux coordonnées canevas (x, -y)
+              - items étiquetés 'plan' (cases), 'garde', 'perso' et 'interface' (cadre, annonces, inventaire),
+                empilés dans cet ordre
+    """
+
+    def __init__(self, canevas, rafraichir, vision=None):
+        self.canevas = canevas
+        self.rafraichir = rafraichir
+        self.vision = vision
+        self.plan = None
+        self.pas = 0
+        self.nb_lignes_vues = 0  # dimensions de la vue, en cases
+        self.nb_colonnes_vues = 0
+        self.origine = (0, 0)  # case du plan affichée dans le coin haut gauche de la vue
+        self.tuiles = {}  # (ligne, colonne) de la tuile -> items de ses cases, ligne par ligne
+        self.item_perso = None
+        self.item_annonce = None
+        self.items_inventaire = []
+        self.cases_sales = {}  # position -> type de case à appliquer à la prochaine image
+        self.position_perso = None
+        self.perso_sale = False
+        self.gardes = None  # gardes en ronde (gardes.Gardes), connus au premier tic
+        self.items_gardes = {}  # indice du garde -> item, pour les gardes dans la vue
+        self.gardes_sales = False
+        self.gardes_a_placer = False  # tous les gardes de la vue sont à placer (premier tic des gardes)
+
+    # Niveau 1 : création des items
+    # -----------------------------
+
+    def afficher_plan(self, plan, position=POSITION_DEPART):
+        """
+        Crée les items des tuiles visibles, du cadre, de l'annonce, de l'inventaire et du personnage,
+        puis rafraîchit l'écran.
+
+        :param plan: plan du chateau
+        :param position: position initiale du personnage
+        :type plan: Plan
+        :type position: tuple[int, int]
+
+        .. warning:: utilise CONFIGS.py (ZONE_PLAN_MINI, ZONE_PLAN_MAXI, PAS_MINIMAL, COULEUR_PERSONNAGE,
+                     RATIO_PERSONNAGE, COULEUR_BROUILLARD)
+        .. note:: le pas est calculé une fois pour toutes : celui qui fait tenir tout le plan dans la zone
+                  d'affichage, sans descendre sous PAS_MINIMAL (le plan défile alors avec le personnage)
+        """
+        self.plan = plan
+        self.pas = pas = max(calculer_pas(plan), PAS_MINIMAL)
+        self.nb_colonnes_vues = abs(ZONE_PLAN_MAXI[0] - ZONE_PLAN_MINI[0]) // pas
+        self.nb_lignes_vues = abs(ZONE_PLAN_MAXI[1] - ZONE_PLAN_MINI[1]) // pas
+        self.origine = self.cadrer(position)
+        self.tuiles = {}
+        if self.vision is not None:  # fond du brouillard, sous les cases (cachées tant qu'elles ne sont pas vues)
+            self.vision.eclairer(position)
+            self.canevas.create_rectangle(ZONE_PLAN_MINI[0], -ZONE_PLAN_MAXI[1], ZONE_PLAN_MAXI[0], -ZONE_PLAN_MINI[1],
+                                          fill=COULEUR_BROUILLARD, outline='')
+        self.mettre_a_jour_tuiles()
+        rayon = RATIO_PERSONNAGE * pas / 2
+        self.item_perso = self.canevas.create_oval(-rayon, -rayon, rayon, rayon, fill=COULEUR_PERSONNAGE,
+                                                   outline='', tags='perso')
+        self.creer_cadre()
+        self.creer_annonce('Vous devez mener le point rouge jusqu\'à la sortie jaune.')
+        self.creer_inventaire()
+        self.tracer_perso(position)
+        self.dessiner()
+
+    def changer_plan(self, plan, position):
+        """
+        Remplace le plan affiché (changement d'étage) : les items des tuiles de l'ancien plan sont supprimés et
+        ceux des tuiles visibles du nouveau plan créés ; le personnage et l'interface sont conservés.
+
+        :param plan: nouveau plan
+        :param position: position du personnage sur le nouveau plan
+        :type plan: Plan
+        :type position: tuple[int, int]
+
+        .. warning:: utilise CONFIGS.py (ZONE_PLAN_MINI, ZONE_PLAN_MAXI, PAS_MINIMAL)
+        """
+        self.canevas.delete('plan')
+        self.canevas.delete('garde')  # les gardes sont ceux de l'ancien plan
+        self.tuiles = {}
+        self.items_gardes = {}
+        self.gardes = None
+        self.cases_sales.clear()
+        self.plan = plan
+        self.pas = pas = max(calculer_pas(plan), PAS_MINIMAL)
+        self.nb_colonnes_vues = abs(ZONE_PLAN_MAXI[0] - ZONE_PLAN_MINI[0]) // pas
+        self.nb_lignes_vues = abs(ZONE_PLAN_MAXI[1] - ZONE_PLAN_MINI[1]) // pas
+        self.origine = self.cadrer(position)
+        if self.vision is not None:
+            self.vision.changer_plan(plan)
+            self.vision.eclairer(position)
+        self.mettre_a_jour_tuiles()
+        self.tracer_perso(position)
+
+    def creer_cadre(self):
+        """
+        Crée le cadre qui masque les cases des tuiles débordant de la zone d'affichage du plan.
+
+        .. warning:: utilise CONFIGS.py (ZONE_PLAN_MINI, ZONE_PLAN_MAXI, COULEUR_EXTERIEUR)
+        """
+        x_mini, y_mini = ZONE_PLAN_MINI
+        x_maxi, y_maxi = ZONE_PLAN_MAXI
+        loin = 100000  # au-delà des bords de la fenêtre
+        for x_0, y_0, x_1, y_1 in ((-loin, -loin, x_mini, loin), (x_maxi, -loin, loin, loin),
+                                   (x_mini, -loin, x_maxi, -y_maxi), (x_mini, -y_mini, x_maxi, loin)):
+            self.canevas.create_rectangle(x_0, y_0, x_1, y_1, fill=COULEUR_EXTERIEUR, outline=COULEUR_EXTERIEUR,
+                                          tags='interface')
+
+    def creer_annonce(self, texte):
+        """
+        Crée la zone d'affichage des annonces et son texte.
+
+        :param texte: annonce initiale
+        :type texte: str
+
+        .. warning:: utilise CONFIGS.py (POINT_AFFICHAGE_ANNONCES, POINT_AFFICHAGE_INVENTAIRE)
+        """
+        x_annonce, y_annonce = POINT_AFFICHAGE_ANNONCES
+        long_annonce = abs(x_annonce) * 2
+        largeur_annonce = y_annonce - POINT_AFFICHAGE_INVENTAIRE[1]
+        self.canevas.create_rectangle(x_annonce, -y_annonce, x_annonce + long_annonce, -y_annonce + largeur_annonce,
+                                      fill=COULEUR_CASES, outline=COULEUR_EXTERIEUR, tags='interface')
+        self.item_annonce = self.canevas.create_text(-1, -(y_annonce - 4 * largeur_annonce / 5), text=texte,
+                                                     anchor='s', fill='black', font=('Arial', 10, 'bold'),
+                                                     tags='interface')
+
+    def creer_inventaire(self):
+        """
+        Crée le titre de la zone d'affichage de l'inventaire.
+
+        .. warning:: utilise CONFIGS.py (POINT_AFFICHAGE_INVENTAIRE)
+        """
+        self.items_inventaire = []
+        self.canevas.create_text(POINT_AFFICHAGE_INVENTAIRE[0] - 1, -(POINT_AFFICHAGE_INVENTAIRE[1] - 40),
+                                 text='        Inventaire :', anchor='sw', fill='black', font=('Arial', 8, 'bold'),
+                                 tags='interface')
+
+    # Niveau 2 : caméra et tuiles
+    # ---------------------------
+
+    def cadrer(self, position):
+        """
+        Calcule l'origine de la vue centrée sur une position, sans sortir du plan.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+        :return: case du plan à afficher dans le coin haut gauche de la vue
+        :rtype: tuple[int, int]
+        """
+        ligne_max = max(self.plan.nb_lignes - self.nb_lignes_vues, 0)
+        colonne_max = max(self.plan.nb_colonnes - self.nb_colonnes_vues, 0)
+        return (min(max(position[0] - self.nb_lignes_vues // 2, 0), ligne_max),
+                min(max(position[1] - self.nb_colonnes_vues // 2, 0), colonne_max))
+
+    def tuiles_visibles(self):
+        """
+        Calcule l'ensemble des tuiles qui recouvrent la vue.
+
+        :return: coordonnées (ligne, colonne) des tuiles visibles
+        :rtype: set[tuple[int, int]]
+
+        .. warning:: utilise CONFIGS.py (TAILLE_TUILE)
+        """
+        ligne_0, colonne_0 = self.origine
+        ligne_fin = min(ligne_0 + self.nb_lignes_vues, self.plan.nb_lignes) - 1
+        colonne_fin = min(colonne_0 + self.nb_colonnes_vues, self.plan.nb_colonnes) - 1
+        return {(tuile_ligne, tuile_colonne)
+                for tuile_ligne in range(ligne_0 // TAILLE_TUILE, ligne_fin // TAILLE_TUILE + 1)
+                for tuile_colonne in range(colonne_0 // TAILLE_TUILE, colonne_fin // TAILLE_TUILE + 1)}
+
+    def creer_tuile(self, tuile):
+        """
+        Lit les lignes d'une tuile dans le plan et crée les items de ses cases.
+
+        :param tuile: coordonnées (ligne, colonne) de la tuile
+        :type tuile: tuple[int, int]
+
+        .. warning:: utilise CONFIGS.py (TAILLE_TUILE, COULEURS, COULEUR_EXTERIEUR)
+        """
+        canevas, plan, pas, vision = self.canevas, self.plan, self.pas, self.vision
+        ligne_0, colonne_0 = self.origine
+        colonne_debut = tuile[1] * TAILLE_TUILE
+        colonne_fin = min(colonne_debut + TAILLE_TUILE, plan.nb_colonnes)
+        etiquettes = ('plan', f'tuile_{tuile[0]}_{tuile[1]}')
+        items = []
+        for ligne in range(tuile[0] * TAILLE_TUILE, min((tuile[0] + 1) * TAILLE_TUILE, plan.nb_lignes)):
+            debut = ligne * plan.nb_colonnes
+            rangee = plan.cases[debut + colonne_debut:debut + colonne_fin]  # seule la ligne de la tuile est lue
+            items_ligne = []
+            for colonne, type_case in enumerate(rangee, colonne_debut):
+                x_case, y_case = coordonnees((ligne - ligne_0, colonne - colonne_0), pas)
+                etat = 'normal' if vision is None or debut + colonne in vision.visibles else 'hidden'
+                items_ligne.append(canevas.create_rectangle(x_case, -y_case - pas, x_case + pas, -y_case,
+                                                            fill=COULEURS[type_case], outline=COULEUR_EXTERIEUR,
+                                                            state=etat, tags=etiquettes))
+            items.append(items_ligne)
+        self.tuiles[tuile] = items
+
+    def mettre_a_jour_tuiles(self):
+        """
+        Supprime les items des tuiles sorties de la vue et crée ceux des tuiles qui y sont entrées.
+        """
+        visibles = self.tuiles_visibles()
+        for tuile in [tuile for tuile in self.tuiles if tuile not in visibles]:
+            self.canevas.delete(f'tuile_{tuile[0]}_{tuile[1]}')
+            del self.tuiles[tuile]
+        nouvelles = visibles.difference(self.tuiles)
+        for tuile in nouvelles:
+            self.creer_tuile(tuile)
+        if nouvelles and self.item_perso is not None:  # les nouvelles cases passent sous le perso et le cadre
+            self.canevas.tag_raise('garde')
+            self.canevas.tag_raise('perso')
+            self.canevas.tag_raise('interface')
+
+    def deplacer_camera(self, origine):
+        """
+        Fait défiler la vue jusqu'à une nouvelle origine.
+
+        :param origine: case du plan à afficher dans le coin haut gauche de la vue
+        :type origine: tuple[int, int]
+
+        .. note:: les items des tuiles déjà visibles sont translatés, pas recréés
+        """
+        delta_ligne, delta_colonne = origine[0] - self.origine[0], origine[1] - self.origine[1]
+        self.canevas.move('plan', -delta_colonne * self.pas, -delta_ligne * self.pas)
+        self.origine = origine
+        self.mettre_a_jour_tuiles()
+
+    def item_case(self, position):
+        """
+        Renvoie l'item d'une case, ou None si sa tuile n'est pas affichée.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+        :rtype: int or None
+
+        .. warning:: utilise CONFIGS.py (TAILLE_TUILE)
+        """
+        items = self.tuiles.get((position[0] // TAILLE_TUILE, position[1] // TAILLE_TUILE))
+        if items is None:
+            return None
+        return items[position[0] % TAILLE_TUILE][position[1] % TAILLE_TUILE]
+
+    # Niveau 3 : changements à appliquer à la prochaine image
+    # -------------------------------------------------------
+
+    def tracer_case(self, position, type_case):
+        """
+        Marque une case à recolorer à la prochaine image.
+
+        :param position: position en coordonnées matricielles
+        :param type_case: nouveau type de la case [0, 5]
+        :type position: tuple[int, int]
+        :type type_case: int
+        """
+        self.cases_sales[position] = type_case
+
+    def tracer_perso(self, position):
+        """
+        Marque le personnage à déplacer à la prochaine image.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+        """
+        self.position_perso = position
+        self.perso_sale = True
+
+    def tracer_gardes(self, gardes):
+        """
+        Marque les gardes déplacés à retracer à la prochaine image (tous ceux de la vue s'ils sont nouveaux).
+
+        :param gardes: gardes en ronde
+        :type gardes: gardes.Gardes
+        """
+        if gardes is not self.gardes:
+            self.gardes = gardes
+            self.gardes_a_placer = True
+        self.gardes_sales = True
+
+    def tracer_annonce(self, texte):
+        """
+        Remplace le texte de l'annonce (l'item texte est modifié sur place).
+
+        :param texte: texte à écrire dans la zone d'affichage des annonces
+        :type texte: str
+        """
+        self.canevas.itemconfigure(self.item_annonce, text=texte)
+
+    def tracer_inventaire(self, inventaire):
+        """
+        Ajoute les nouvelles entrées de l'inventaire (un item texte par entrée, créé une seule fois).
+
+        :param inventaire: inventaire du personnage
+        :type inventaire: list[str]
+
+        .. warning:: utilise CONFIGS.py (POINT_AFFICHAGE_INVENTAIRE)
+        """
+        for n_entree in range(len(self.items_inventaire) + 1, len(inventaire) + 1):
+            self.items_inventaire.append(
+                self.canevas.create_text(POINT_AFFICHAGE_INVENTAIRE[0] - 1,
+                                         -(POINT_AFFICHAGE_INVENTAIRE[1] - 50 - 20 * n_entree),
+                                         text=f' N°{n_entree} : {inventaire[n_entree - 1]}', anchor='sw',
+                                         fill='black', font=('Arial', 8, 'normal'), tags='interface'))
+
+    def observer(self, evenement, *arguments):
+        """
+        Observateur du moteur : enregistre les changements notifiés par la partie.
+
+        :param evenement: nom de l'événement ('case', 'perso', 'annonce', 'inventaire', 'plan' ou 'gardes')
+        :param arguments: arguments de l'événement
+        :type evenement: str
+
+        .. seealso:: moteur.Partie.abonner()
+        """
+        if evenement == 'case':
+            self.tracer_case(*arguments)
+        elif evenement == 'perso':
+            self.tracer_perso(arguments[0])
+        elif evenement == 'annonce':
+            self.tracer_annonce(arguments[0])
+        elif evenement == 'inventaire':
+            self.tracer_inventaire(arguments[0])
+        elif evenement == 'plan':
+            self.changer_plan(*arguments)
+        elif evenement == 'gardes':
+            self.tracer_gardes(arguments[0])
+
+    # Niveau 4 : image
+    # ----------------
+
+    def rayon_sprite(self):
+        """
+        Renvoie le rayon en pixels du personnage et des gardes.
+
+        :rtype: float
+
+        .. warning:: utilise CONFIGS.py (RATIO_PERSONNAGE)
+        """
+        return RATIO_PERSONNAGE * self.pas / 2
+
+    def placer_gardes(self, tous):
+        """
+        Crée, déplace ou supprime les items des gardes selon leur position dans la vue.
+
+        :param tous: True pour replacer tous les gardes de la vue (la caméra ou le champ de la torche a
+                     changé), False pour ne replacer que ceux déplacés au dernier tic
+        :type tous: bool
+
+        .. warning:: utilise CONFIGS.py (COULEUR_GARDE)
+        .. note:: un garde déplacé qui vient de sortir de la vue est cherché sur une case de marge
+        """
+        canevas, gardes, items, vision = self.canevas, self.gardes, self.items_gardes, self.vision
+        (ligne_0, colonne_0), nb_lignes, nb_colonnes = self.origine, self.nb_lignes_vues, self.nb_colonnes_vues
+        if tous:
+            indices = gardes.dans_zone(self.origine, nb_lignes, nb_colonnes)
+            gardes_vus = set(indices)
+            for indice in [indice for indice in items if indice not in gardes_vus]:
+                canevas.delete(items.pop(indice))
+        else:
+            indices = gardes.dans_zone((ligne_0 - 1, colonne_0 - 1), nb_lignes + 2, nb_colonnes + 2, deplaces=True)
+        pas = self.pas
+        rayon = self.rayon_sprite()
+        crees = False
+        for indice in indices:
+            position = gardes.position(indice)
+            ligne, colonne = position[0] - ligne_0, position[1] - colonne_0
+            item = items.get(indice)
+            if not (0 <= ligne < nb_lignes and 0 <= colonne < nb_colonnes) \
+                    or vision is not None and not vision.est_visible(position):
+                if item is not None:
+                    canevas.delete(items.pop(indice))
+                continue
+            x_case, y_case = coordonnees((ligne, colonne), pas)
+            x_centre, y_centre = x_case + pas / 2, -(y_case + pas / 2)
+            if item is None:
+                items[indice] = canevas.create_oval(x_centre - rayon, y_centre - rayon, x_centre + rayon,
+                                                    y_centre + rayon, fill=COULEUR_GARDE, outline='', tags='garde')
+                crees = True
+            else:
+                canevas.coords(item, x_centre - rayon, y_centre - rayon, x_centre + rayon, y_centre + rayon)
+        if crees:  # les nouveaux gardes passent sous le perso et le cadre
+            canevas.tag_raise('perso')
+            canevas.tag_raise('interface')
+        self.gardes_sales = self.gardes_a_placer = False
+
+    def dessiner(self):
+        """
+        Fait suivre le personnage par la caméra, applique les changements en attente aux items du canevas
+        et rafraîchit l'écran une seule fois.
+
+        .. warning:: utilise CONFIGS.py (COULEURS)
+        .. note:: - les cases modifiées hors de la vue sont ignorées : leur tuile relira le plan en y entrant
+                  - avec une vision, les cases dont la visibilité a changé sont retracées (montrées ou cachées)
+                  - tous les gardes de la vue sont replacés quand la caméra ou le champ de la torche change
+        """
+        canevas, vision = self.canevas, self.vision
+        tous_gardes = self.gardes_a_placer or self.perso_sale and vision is not None
+        if self.perso_sale and vision is not None:
+            cases, nb_colonnes = self.plan.cases, self.plan.nb_colonnes
+            for indice in vision.eclairer(self.position_perso):
+                self.cases_sales[divmod(indice, nb_colonnes)] = cases[indice]
+        if self.perso_sale:
+            origine = self.cadrer(self.position_perso)
+            if origine != self.origine:
+                self.deplacer_camera(origine)
+                tous_gardes = True
+            pas = self.pas
+            rayon = self.rayon_sprite()
+            x_case, y_case = coordonnees((self.position_perso[0] - origine[0],
+                                          self.position_perso[1] - origine[1]), pas)
+            x_centre, y_centre = x_case + pas / 2, -(y_case + pas / 2)
+            canevas.coords(self.item_perso, x_centre - rayon, y_centre - rayon, x_centre + rayon, y_centre + rayon)
+            self.perso_sale = False
+        for position, type_case in self.cases_sales.items():
+            item = self.item_case(position)
+            if item is None:
+                continue
+            if vision is None:
+                canevas.itemconfigure(item, fill=COULEURS[type_case])
+            else:
+                canevas.itemconfigure(item, fill=COULEURS[type_case],
+                                      state='normal' if vision.est_visible(position) else 'hidden')
+        self.cases_sales.clear()
+        if self.gardes is not None and (self.gardes_sales or tous_gardes):
+            self.placer_gardes(tous_gardes)
+        self.rafraichir()
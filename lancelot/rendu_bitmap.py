@@ -0,0 +1,460 @@
+"""
+    PROJET LANCELOT - rendu bitmap du plan
+    ======================================
+
+    Variante de rendu.py pour les très grands plans : au lieu d'un item du canevas par case, le plan est
+    rastérisé dans des images Tk (PhotoImage), un pixel par case, et la vue n'est qu'une image de la taille
+    de la zone d'affichage dans laquelle la région visible est copiée et agrandie par Tk.
+
+    Chaque case est d'abord traduite en un code d'affichage (COULEUR_BROUILLARD hors du champ de la torche,
+    puis couloir, case vue, mur, escalier, porte, objet et sortie, par importance croissante). Des mipmaps sont
+    précalculées : au niveau k, un pixel représente un bloc de 2^k x 2^k cases et prend le code le plus
+    important du bloc, pour que murs, portes et objets restent visibles dans les vues d'ensemble.
+
+    Zoomer ne fait que choisir une autre mipmap (ou un autre facteur d'agrandissement du niveau 0) et faire
+    défiler la vue ne fait que recopier une région : le coût d'une image dépend de la taille de la fenêtre,
+    pas de celle du plan. Une case modifiée ne change qu'un pixel par niveau, retracé quand son niveau est
+    affiché.
+
+    Le personnage, les annonces et l'inventaire restent des items du canevas, comme dans rendu.py.
+
+    Dependencies : tkinter, CONFIGS.py, moteur.py, rendu.py, NumPy (optionnel)
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import weakref
+
+from .CONFIGS import ZONE_PLAN_MINI, ZONE_PLAN_MAXI, PAS_MINIMAL, COULEURS, COULEUR_BROUILLARD, COULEUR_PERSONNAGE, \
+    POSITION_DEPART
+from .moteur import COULOIR, MUR, SORTIE, PORTE, OBJET, VUE, ESCALIER
+from .rendu import Rendu, calculer_pas, coordonnees
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : mipmaps calculées en python pur
+    np = None
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+BROUILLARD = 0  # code des cases hors du champ de la torche
+TYPES_PAR_IMPORTANCE = (COULOIR, VUE, MUR, ESCALIER, PORTE, OBJET, SORTIE)  # codes 1 à 7
+CODES = bytes(TYPES_PAR_IMPORTANCE.index(type_case) + 1 if type_case in TYPES_PAR_IMPORTANCE
+              else TYPES_PAR_IMPORTANCE.index(MUR) + 1 for type_case in range(256))  # type de case -> code
+COULEURS_CODES = [COULEUR_BROUILLARD] + [COULEURS[type_case] for type_case in TYPES_PAR_IMPORTANCE]
+ECHELLE_MAXI = 5  # zoom maximal : 2^5 pixels par case
+RAYON_PERSO_MINI = 3  # rayon du personnage en pixels, quand les cases sont plus petites
+
+
+# ======================================================================================================================
+# III. RASTERISATION ET MIPMAPS
+# ======================================================================================================================
+
+def reduire(codes, nb_lignes, nb_colonnes):
+    """
+    Calcule le niveau de mipmap suivant : chaque bloc de 2 x 2 pixels devient un pixel de code maximal.
+
+    :param codes: codes d'affichage du niveau, ligne par ligne
+    :param nb_lignes: nombre de lignes du niveau
+    :param nb_colonnes: nombre de colonnes du niveau
+    :type codes: bytes or bytearray
+    :type nb_lignes: int
+    :type nb_colonnes: int
+    :return: les codes du niveau réduit et ses dimensions
+    :rtype: tuple[bytearray, int, int]
+
+    .. note:: une dernière ligne ou colonne impaire est réduite avec elle-même
+    """
+    if np is not None:
+        tableau = np.frombuffer(bytes(codes), dtype=np.uint8).reshape(nb_lignes, nb_colonnes)
+        if nb_lignes % 2:
+            tableau = np.vstack((tableau, tableau[-1:]))
+        if nb_colonnes % 2:
+            tableau = np.hstack((tableau, tableau[:, -1:]))
+        reduit = np.maximum(np.maximum(tableau[0::2, 0::2], tableau[0::2, 1::2]),
+                            np.maximum(tableau[1::2, 0::2], tableau[1::2, 1::2]))
+        return bytearray(reduit.tobytes()), reduit.shape[0], reduit.shape[1]
+    lignes = []
+    for ligne in range(0, nb_lignes, 2):
+        haut = codes[ligne * nb_colonnes:(ligne + 1) * nb_colonnes]
+        bas = codes[(ligne + 1) * nb_colonnes:(ligne + 2) * nb_colonnes] if ligne + 1 < nb_lignes else haut
+        paire = bytes(map(max, haut, bas))  # max est appelé par map en C, sans boucle python
+        if nb_colonnes % 2:
+            paire += paire[-1:]
+        lignes.append(bytes(map(max, paire[0::2], paire[1::2])))
+    return bytearray(b''.join(lignes)), (nb_lignes + 1) // 2, (nb_colonnes + 1) // 2
+
+
+def construire_niveaux(codes, nb_lignes, nb_colonnes):
+    """
+    Calcule toutes les mipmaps d'un plan, jusqu'à un pixel.
+
+    :param codes: codes d'affichage des cases, ligne par ligne
+    :param nb_lignes: nombre de lignes du plan
+    :param nb_colonnes: nombre de colonnes du plan
+    :type codes: bytearray
+    :type nb_lignes: int
+    :type nb_colonnes: int
+    :return: codes et dimensions de chaque niveau, du niveau 0 (une case par pixel) au plus réduit
+    :rtype: list[tuple[bytearray, int, int]]
+    """
+    niveaux = [(codes, nb_lignes, nb_colonnes)]
+    while nb_lignes > 1 or nb_colonnes > 1:
+        codes, nb_lignes, nb_colonnes = reduire(codes, nb_lignes, nb_colonnes)
+        niveaux.append((codes, nb_lignes, nb_colonnes))
+    return niveaux
+
+
+def image_ppm(codes, nb_lignes, nb_colonnes, palette):
+    """
+    Rastérise des codes d'affichage en une image PPM binaire (P6), un pixel par code.
+
+    :param codes: codes d'affichage, ligne par ligne
+    :param nb_lignes: hauteur de l'image
+    :param nb_colonnes: largeur de l'image
+    :param palette: couleur (rouge, vert, bleu) de chaque code, composantes de 0 à 255
+    :type codes: bytes or bytearray
+    :type nb_lignes: int
+    :type nb_colonnes: int
+    :type palette: list[tuple[int, int, int]]
+    :rtype: bytes
+
+    .. note:: chaque composante est obtenue par un bytes.translate() de tous les codes à la fois
+    """
+    pixels = bytearray(3 * len(codes))
+    for composante in range(3):
+        table = bytes(palette[code][composante] if code < len(palette) else 0 for code in range(256))
+        pixels[composante::3] = codes.translate(table)
+    return b'P6 %d %d 255\n' % (nb_colonnes, nb_lignes) + pixels
+
+
+# ======================================================================================================================
+# IV. RENDU BITMAP
+# ======================================================================================================================
+
+class RenduBitmap(Rendu):
+    """
+    Rendu du plan par images Tk et mipmaps, avec zoom ; même interface que Rendu.
+
+    :param canevas: canevas Tk de turtle (turtle.getcanvas())
+    :param rafraichir: fonction de rafraîchissement de l'écran (turtle.update)
+    :param vision: champ de vision de la torche (None : tout le plan est visible)
+    :type canevas: tkinter.Canvas
+    :type rafraichir: callable
+    :type vision: vision.Vision or None
+
+    .. note:: - l'échelle est une puissance de deux : 2^echelle pixels par case (echelle < 0 : vue réduite,
+                une mipmap de niveau -echelle copiée telle quelle)
+              - l'image de la vue est étiquetée 'plan', sous le personnage et l'interface
+    """
+
+    def __init__(self, canevas, rafraichir, vision=None):
+        super().__init__(canevas, rafraichir, vision)
+        self.niveaux = []  # (codes, nb_lignes, nb_colonnes) de chaque mipmap
+        self.images = []  # PhotoImage de chaque mipmap
+        self.sales = []  # par niveau : pixels (ligne, colonne) modifiés, pas encore retracés dans son image
+        self.palette = []  # couleur (rouge, vert, bleu) de chaque code
+        self.couleurs = []  # couleur '#rrggbb' de chaque code
+        self.preparations = weakref.WeakKeyDictionary()  # plan préparé -> mipmaps et leurs images PPM
+        self.echelle = 0
+        self.echelle_mini = 0  # échelle de la vue d'ensemble (tout le plan dans la zone d'affichage)
+        self.image_vue = None
+        self.vue_sale = False
+
+    # Niveau 1 : création des images
+    # ------------------------------
+
+    def creer_image(self, donnees=None, largeur=None, hauteur=None):
+        """
+        Crée une image Tk, à partir d'une image PPM ou vide.
+
+        :param donnees: image PPM binaire (None : image vide de dimensions fixées)
+        :param largeur: largeur de l'image vide, en pixels
+        :param hauteur: hauteur de l'image vide, en pixels
+        :type donnees: bytes or None
+        :type largeur: int or None
+        :type hauteur: int or None
+        :rtype: tkinter.PhotoImage
+
+        .. note:: tkinter n'est importé qu'ici : importer ce module ne charge pas Tk
+        """
+        import tkinter
+        if donnees is not None:
+            return tkinter.PhotoImage(master=self.canevas, data=donnees, format='PPM')
+        return tkinter.PhotoImage(master=self.canevas, width=largeur, height=hauteur)
+
+    def preparer(self, plan):
+        """
+        Rastérise à l'avance un plan et ses mipmaps, par exemple dans un fil d'exécution de préchargement :
+        au changement de plan, il ne restera qu'à créer les images Tk.
+
+        :param plan: plan à préparer
+        :type plan: Plan
+
+        .. warning:: à appeler après afficher_plan() (la palette doit être connue) et sans vision : le
+                     brouillard dépend de la position d'arrivée
+        .. note:: - n'appelle pas Tk : peut être exécutée hors du fil de Tk
+                  - une préparation est reprise une seule fois, par rasteriser()
+        """
+        niveaux = construire_niveaux(bytearray(bytes(plan.cases).translate(CODES)), plan.nb_lignes, plan.nb_colonnes)
+        self.preparations[plan] = niveaux, [image_ppm(*niveau, self.palette) for niveau in niveaux]
+
+    def rasteriser(self, plan, position):
+        """
+        Rastérise un plan et ses mipmaps (ou reprend sa préparation) et crée leurs images Tk.
+
+        :param plan: plan du chateau
+        :param position: position du personnage
+        :type plan: Plan
+        :type position: tuple[int, int]
+
+        .. warning:: utilise CONFIGS.py (ZONE_PLAN_MINI, ZONE_PLAN_MAXI)
+        """
+        self.plan = plan
+        preparation = self.preparations.pop(plan, None) if self.vision is None else None
+        if preparation is not None:
+            self.niveaux, images_ppm = preparation
+        else:
+            if self.vision is None:
+                codes = bytes(plan.cases).translate(CODES)
+            else:  # tout est dans le brouillard, sauf le champ de la torche
+                cases = plan.cases
+                codes = bytearray(plan.nb_lignes * plan.nb_colonnes)
+                for indice in self.vision.eclairer(position):
+                    codes[indice] = CODES[cases[indice]]
+            self.niveaux = construire_niveaux(bytearray(codes), plan.nb_lignes, plan.nb_colonnes)
+            images_ppm = [image_ppm(*niveau, self.palette) for niveau in self.niveaux]
+        self.images = [self.creer_image(donnees) for donnees in images_ppm]
+        self.sales = [set() for _ in self.niveaux]
+        largeur = abs(ZONE_PLAN_MAXI[0] - ZONE_PLAN_MINI[0])
+        hauteur = abs(ZONE_PLAN_MAXI[1] - ZONE_PLAN_MINI[1])
+        self.echelle_mini = ECHELLE_MAXI
+        while self.echelle_mini > 1 - len(self.niveaux) and (plan.nb_colonnes * 2 ** self.echelle_mini > largeur or
+                                                             plan.nb_lignes * 2 ** self.echelle_mini > hauteur):
+            self.echelle_mini -= 1
+
+    def afficher_plan(self, plan, position=POSITION_DEPART):
+        """
+        Rastérise le plan et ses mipmaps, crée l'image de la vue, l'interface et le personnage, puis
+        rafraîchit l'écran.
+
+        :param plan: plan du chateau
+        :param position: position initiale du personnage
+        :type plan: Plan
+        :type position: tuple[int, int]
+
+        .. warning:: utilise CONFIGS.py (ZONE_PLAN_MINI, ZONE_PLAN_MAXI, PAS_MINIMAL, COULEUR_PERSONNAGE,
+                     COULEURS, COULEUR_BROUILLARD)
+        .. note:: l'échelle initiale est la plus grande puissance de deux qui ne dépasse pas le pas de rendu.py
+        """
+        self.palette = [tuple(composante >> 8 for composante in self.canevas.winfo_rgb(couleur))
+                        for couleur in COULEURS_CODES]
+        self.couleurs = ['#%02x%02x%02x' % couleur for couleur in self.palette]
+        self.rasteriser(plan, position)
+        self.image_vue = self.creer_image(largeur=abs(ZONE_PLAN_MAXI[0] - ZONE_PLAN_MINI[0]),
+                                          hauteur=abs(ZONE_PLAN_MAXI[1] - ZONE_PLAN_MINI[1]))
+        self.canevas.create_image(ZONE_PLAN_MINI[0], -ZONE_PLAN_MAXI[1], image=self.image_vue, anchor='nw',
+                                  tags='plan')
+        self.item_perso = self.canevas.create_oval(0, 0, 0, 0, fill=COULEUR_PERSONNAGE, outline='', tags='perso')
+        self.creer_annonce('Vous devez mener le point rouge jusqu\'à la sortie jaune.')
+        self.creer_inventaire()
+        self.tracer_perso(position)
+        self.changer_echelle(min(max(calculer_pas(plan), PAS_MINIMAL).bit_length() - 1, ECHELLE_MAXI))
+        self.dessiner()
+
+    def changer_plan(self, plan, position):
+        """
+        Remplace le plan affiché (changement d'étage), en gardant l'échelle si le nouveau plan le permet.
+
+        :param plan: nouveau plan
+        :param position: position du personnage sur le nouveau plan
+        :type plan: Plan
+        :type position: tuple[int, int]
+
+        .. note:: si le plan a été préparé (preparer()), seules les images Tk sont créées
+        """
+        self.cases_sales.clear()
+        self.canevas.delete('garde')  # les gardes sont ceux de l'ancien plan
+        self.items_gardes = {}
+        self.gardes = None
+        if self.vision is not None:
+            self.vision.changer_plan(plan)
+        self.rasteriser(plan, position)
+        self.tracer_perso(position)
+        self.changer_echelle(self.echelle)
+
+    # Niveau 2 : échelle et caméra
+    # ----------------------------
+
+    def changer_echelle(self, echelle):
+        """
+        Change le zoom de la vue, entre la vue d'ensemble et ECHELLE_MAXI.
+
+        :param echelle: nouvelle échelle (2^echelle pixels par case)
+        :type echelle: int
+
+        .. warning:: utilise CONFIGS.py (ZONE_PLAN_MINI, ZONE_PLAN_MAXI)
+        .. note:: ne fait que choisir la mipmap et le facteur d'agrandissement de la prochaine copie de la vue
+        """
+        self.echelle = echelle = min(max(echelle, self.echelle_mini), ECHELLE_MAXI)
+        self.pas = 2 ** echelle
+        largeur = abs(ZONE_PLAN_MAXI[0] - ZONE_PLAN_MINI[0])
+        hauteur = abs(ZONE_PLAN_MAXI[1] - ZONE_PLAN_MINI[1])
+        if echelle >= 0:
+            self.nb_colonnes_vues, self.nb_lignes_vues = largeur >> echelle, hauteur >> echelle
+        else:
+            self.nb_colonnes_vues, self.nb_lignes_vues = largeur << -echelle, hauteur << -echelle
+        self.origine = self.cadrer(self.position_perso)
+        self.perso_sale = True
+        self.vue_sale = True
+
+    def zoomer(self, sens):
+        """
+        Zoome d'un cran (sens = 1) ou dézoome d'un cran (sens = -1) ; effet à la prochaine image.
+
+        :param sens: 1 pour agrandir, -1 pour réduire
+        :type sens: int
+        """
+        self.changer_echelle(self.echelle + sens)
+
+    def cadrer(self, position):
+        """
+        Calcule l'origine de la vue centrée sur une position, alignée sur les pixels de la mipmap affichée.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+        :return: case du plan à afficher dans le coin haut gauche de la vue
+        :rtype: tuple[int, int]
+        """
+        niveau = max(-self.echelle, 0)
+        ligne, colonne = super().cadrer(position)
+        return ligne >> niveau << niveau, colonne >> niveau << niveau
+
+    def item_case(self, position):
+        """
+        Les cases n'ont pas d'item dans le rendu bitmap.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+        :rtype: None
+        """
+        return None
+
+    # Niveau 3 : pixels et copie de la vue
+    # ------------------------------------
+
+    def colorer(self, position, code):
+        """
+        Change le code d'une case et propage le changement aux mipmaps, tant qu'il modifie leur pixel.
+
+        :param position: position en coordonnées matricielles
+        :param code: nouveau code d'affichage de la case
+        :type position: tuple[int, int]
+        :type code: int
+        """
+        ligne, colonne = position
+        codes, nb_lignes, nb_colonnes = self.niveaux[0]
+        if codes[ligne * nb_colonnes + colonne] == code:
+            return
+        codes[ligne * nb_colonnes + colonne] = code
+        self.sales[0].add(position)
+        for niveau in range(1, len(self.niveaux)):
+            codes_fins, nb_lignes_fines, nb_colonnes_fines = codes, nb_lignes, nb_colonnes
+            codes, nb_lignes, nb_colonnes = self.niveaux[niveau]
+            ligne, colonne = ligne >> 1, colonne >> 1
+            code = max(codes_fins[ligne_fine * nb_colonnes_fines + colonne_fine]
+                       for ligne_fine in range(2 * ligne, min(2 * ligne + 2, nb_lignes_fines))
+                       for colonne_fine in range(2 * colonne, min(2 * colonne + 2, nb_colonnes_fines)))
+            if codes[ligne * nb_colonnes + colonne] == code:
+                break
+            codes[ligne * nb_colonnes + colonne] = code
+            self.sales[niveau].add((ligne, colonne))
+
+    def retracer(self, niveau):
+        """
+        Retrace dans l'image d'une mipmap les pixels modifiés depuis son dernier affichage.
+
+        :param niveau: niveau de la mipmap
+        :type niveau: int
+        """
+        codes, _, nb_colonnes = self.niveaux[niveau]
+        image, couleurs = self.images[niveau], self.couleurs
+        for ligne, colonne in self.sales[niveau]:
+            image.put(couleurs[codes[ligne * nb_colonnes + colonne]], to=(colonne, ligne))
+        self.sales[niveau].clear()
+
+    def copier_vue(self):
+        """
+        Copie dans l'image de la vue la région visible de la mipmap de l'échelle courante, agrandie par Tk.
+        """
+        niveau = max(-self.echelle, 0)
+        zoom = 2 ** max(self.echelle, 0)
+        _, nb_lignes, nb_colonnes = self.niveaux[niveau]
+        vue = self.image_vue
+        x_0, y_0 = self.origine[1] >> niveau, self.origine[0] >> niveau
+        x_1 = min(x_0 - (-vue.width() // zoom), nb_colonnes)
+        y_1 = min(y_0 - (-vue.height() // zoom), nb_lignes)
+        vue.blank()
+        vue.tk.call(vue, 'copy', self.images[niveau], '-from', x_0, y_0, x_1, y_1, '-to', 0, 0, '-zoom', zoom, zoom)
+        self.vue_sale = False
+
+    def rayon_sprite(self):
+        """
+        Renvoie le rayon en pixels du personnage et des gardes, jamais sous RAYON_PERSO_MINI.
+
+        :rtype: float
+        """
+        return max(super().rayon_sprite(), RAYON_PERSO_MINI)
+
+    def placer_perso(self):
+        """
+        Place l'item du personnage sur sa case, à l'échelle courante.
+        """
+        pas = self.pas
+        rayon = self.rayon_sprite()
+        x_case, y_case = coordonnees((self.position_perso[0] - self.origine[0],
+                                      self.position_perso[1] - self.origine[1]), pas)
+        x_centre, y_centre = x_case + pas / 2, -(y_case + pas / 2)
+        self.canevas.coords(self.item_perso, x_centre - rayon, y_centre - rayon, x_centre + rayon, y_centre + rayon)
+
+    # Niveau 4 : image
+    # ----------------
+
+    def dessiner(self):
+        """
+        Applique les changements en attente aux mipmaps, fait suivre le personnage par la caméra, recopie la
+        vue si elle a changé et rafraîchit l'écran une seule fois.
+
+        .. note:: seuls les pixels de la mipmap affichée sont retracés ; ceux des autres niveaux le seront
+                  quand leur échelle sera choisie
+        """
+        vision = self.vision
+        tous_gardes = self.gardes_a_placer or self.perso_sale and vision is not None
+        if self.perso_sale and vision is not None:
+            cases, nb_colonnes = self.plan.cases, self.plan.nb_colonnes
+            for indice in vision.eclairer(self.position_perso):
+                self.cases_sales[divmod(indice, nb_colonnes)] = cases[indice]
+        for position, type_case in self.cases_sales.items():
+            self.colorer(position, CODES[type_case] if vision is None or vision.est_visible(position)
+                         else BROUILLARD)
+        self.cases_sales.clear()
+        if self.perso_sale:
+            origine = self.cadrer(self.position_perso)
+            if origine != self.origine:
+                self.origine = origine
+                self.vue_sale = True
+            self.placer_perso()
+            self.perso_sale = False
+        niveau = max(-self.echelle, 0)
+        if self.sales[niveau]:
+            self.retracer(niveau)
+            self.vue_sale = True
+        if self.vue_sale:
+            tous_gardes = True  # origine ou échelle changée
+            self.copier_vue()
+        if self.gardes is not None and (self.gardes_sales or tous_gardes):
+            self.placer_gardes(tous_gardes)
+        self.rafraichir()
@@ -0,0 +1,317 @@
+"""
+    PROJET LANCELOT - sauvegarde incrémentale
+    =========================================
+
+    Sauvegarde de la progression d'une partie sans jamais réécrire tout le plan.
+
+    Chaque changement notifié par le moteur (case_def, déplacement du personnage, objet ajouté à
+    l'inventaire) est ajouté à un journal : la sauvegarde automatique coûte O(changements) par déplacement.
+    Quand le journal devient long, un instantané compacté est écrit : les cases qui diffèrent du niveau
+    d'origine (une seule entrée par case), la position et l'inventaire ; le journal repart alors de zéro.
+    La restauration charge l'instantané puis rejoue la fin du journal.
+
+    Format de l'instantané (fichier .sav, petit-boutiste) :
+        - en-tête : signature b'LSAV', version (1 octet), 3 octets de remplissage, génération (uint32),
+          empreinte crc32 du plan d'origine (uint32), ligne et colonne du personnage (uint32),
+          nombre de cases modifiées (uint64), nombre d'objets de l'inventaire (uint32) ;
+        - indices à plat des cases modifiées (uint64, croissants), puis leurs types (un octet chacun) ;
+        - objets de l'inventaire, en UTF-8 précédés de leur longueur (uint32).
+    Format du journal (fichier .jnl) :
+        - en-tête : signature b'LJNL', version, 3 octets de remplissage, génération (uint32), empreinte crc32
+          du plan d'origine (uint32) ;
+        - enregistrements : case (1, indice uint64, type uint8), personnage (2, ligne, colonne uint32),
+          objet (3, longueur uint32, texte UTF-8).
+    Le journal n'est rejoué que s'il est de la même génération que l'instantané : un arrêt entre l'écriture
+    d'un instantané et la remise à zéro du journal ne fait donc rien appliquer deux fois. Un enregistrement
+    incomplet en fin de journal (arrêt pendant une écriture) est ignoré. Les deux fichiers portent l'empreinte du
+    plan : une sauvegarde d'un autre niveau (ou abîmée) est refusée avant que quoi que ce soit ne soit appliqué.
+
+    Dependencies : moteur.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import os
+import struct
+import zlib
+from array import array
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+SIGNATURE_INSTANTANE = b'LSAV'
+SIGNATURE_JOURNAL = b'LJNL'
+VERSION = 2
+# signature, version, génération, empreinte, position (ligne, colonne), nombre de cases, nombre d'objets
+ENTETE_INSTANTANE = struct.Struct('<4sB3xIIIIQI')
+ENTETE_JOURNAL = struct.Struct('<4sB3xII')  # signature, version, génération, empreinte
+ENTIER = struct.Struct('<I')
+
+ENREGISTREMENT_CASE = struct.Struct('<BQB')  # 1, indice à plat, type de case
+ENREGISTREMENT_PERSO = struct.Struct('<BII')  # 2, ligne, colonne
+ENREGISTREMENT_OBJET = struct.Struct('<BI')  # 3, longueur du texte (suivi du texte)
+CASE, PERSO, OBJET = 1, 2, 3
+
+INTERVALLE_INSTANTANE = 50000  # enregistrements du journal au-delà desquels un instantané est écrit
+
+
+# ======================================================================================================================
+# III. SAUVEGARDE
+# ======================================================================================================================
+
+class Sauvegarde:
+    """
+    Sauvegarde incrémentale d'une partie : restaure la progression enregistrée (s'il y en a une), puis
+    journalise les changements de la partie.
+
+    :param partie: partie dans l'état initial de son niveau
+    :param fichier: chemin de la sauvegarde, sans extension (fichier + '.sav' et fichier + '.jnl')
+    :param intervalle: nombre d'enregistrements du journal au-delà duquel un instantané est écrit
+    :type partie: Partie
+    :type fichier: str
+    :type intervalle: int
+    :raise ValueError: si la sauvegarde existante a été faite sur un autre plan ou est illisible (la partie
+                       n'est alors pas modifiée, voir effacer())
+
+    .. note:: les changements sont accumulés en mémoire et écrits par ecrire(), à appeler après chaque
+              déplacement (ou chaque tic de la boucle de jeu)
+    """
+
+    def __init__(self, partie, fichier, intervalle=INTERVALLE_INSTANTANE):
+        self.partie = partie
+        self.fichier_instantane = fichier + '.sav'
+        self.fichier_journal = fichier + '.jnl'
+        self.intervalle = intervalle
+        self.empreinte = zlib.crc32(partie.plan.cases)
+        self.modifications = {}  # indice -> type actuel des cases modifiées depuis le niveau
+        self.generation = 0
+        self.tampon = bytearray()  # enregistrements pas encore écrits dans le journal
+        self.nb_enregistrements = 0  # enregistrements du journal depuis le dernier instantané
+        self.restauree = self.restaurer()  # True si une progression enregistrée a été rechargée
+        self.journal = open(self.fichier_journal, 'ab')
+        if self.journal.tell() == 0:
+            self.journal.write(ENTETE_JOURNAL.pack(SIGNATURE_JOURNAL, VERSION, self.generation, self.empreinte))
+            self.journal.flush()
+        partie.abonner(self.observer)
+
+    # Journal
+    # -------
+
+    def observer(self, evenement, *arguments):
+        """
+        Observateur du moteur : ajoute les changements de la partie au journal.
+
+        :param evenement: nom de l'événement ('case', 'perso', 'annonce' ou 'inventaire')
+        :param arguments: arguments de l'événement
+        :type evenement: str
+        """
+        if evenement == 'case':
+            (ligne, colonne), type_case = arguments
+            indice = ligne * self.partie.plan.nb_colonnes + colonne
+            self.tampon += ENREGISTREMENT_CASE.pack(CASE, indice, type_case)
+            self.modifications[indice] = type_case
+        elif evenement == 'perso':
+            self.tampon += ENREGISTREMENT_PERSO.pack(PERSO, *arguments[0])
+        elif evenement == 'inventaire':
+            texte = arguments[0][-1].encode('UTF-8')
+            self.tampon += ENREGISTREMENT_OBJET.pack(OBJET, len(texte))
+            self.tampon += texte
+        else:
+            return
+        self.nb_enregistrements += 1
+
+    def ecrire(self):
+        """
+        Ecrit dans le journal les changements accumulés, puis un instantané si le journal est devenu long.
+        """
+        if self.tampon:
+            self.journal.write(self.tampon)
+            self.journal.flush()
+            self.tampon.clear()
+        if self.nb_enregistrements >= self.intervalle:
+            self.instantane()
+
+    def fermer(self):
+        """
+        Ecrit les derniers changements et ferme le journal.
+        """
+        self.ecrire()
+        self.journal.close()
+
+    # Instantanés et restauration
+    # ---------------------------
+
+    def instantane(self):
+        """
+        Ecrit un instantané compacté de la partie, puis remet le journal à zéro.
+
+        .. note:: l'instantané est écrit dans un fichier temporaire puis renommé
+        """
+        partie = self.partie
+        self.tampon.clear()  # ses changements sont déjà dans l'état de la partie
+        self.generation += 1
+        indices = array('Q', sorted(self.modifications))
+        types = bytes(self.modifications[indice] for indice in indices)
+        fichier_temporaire = self.fichier_instantane + '.tmp'
+        with open(fichier_temporaire, 'wb') as fichier_out:
+            fichier_out.write(ENTETE_INSTANTANE.pack(SIGNATURE_INSTANTANE, VERSION, self.generation, self.empreinte,
+                                                     *partie.position, len(indices), len(partie.inventaire)))
+            fichier_out.write(indices.tobytes())
+            fichier_out.write(types)
+            for objet in partie.inventaire:
+                texte = objet.encode('UTF-8')
+                fichier_out.write(ENTIER.pack(len(texte)))
+                fichier_out.write(texte)
+        os.replace(fichier_temporaire, self.fichier_instantane)
+        self.journal.seek(0)
+        self.journal.truncate()
+        self.journal.write(ENTETE_JOURNAL.pack(SIGNATURE_JOURNAL, VERSION, self.generation, self.empreinte))
+        self.journal.flush()
+        self.nb_enregistrements = 0
+
+    def restaurer(self):
+        """
+        Charge le dernier instantané puis rejoue la fin du journal, sans notifier les observateurs.
+
+        Les deux fichiers sont entièrement lus et vérifiés avant que la partie ne soit modifiée.
+
+        :return: True si une sauvegarde a été restaurée
+        :rtype: bool
+        :raise ValueError: si l'instantané ou le journal a été fait sur un autre plan ou est illisible
+        """
+        partie = self.partie
+        nb_cases_plan = partie.plan.nb_lignes * partie.plan.nb_colonnes
+        instantane = self.lire_instantane() if os.path.exists(self.fichier_instantane) else None
+        enregistrements, fin_valide = self.lire_journal() if os.path.exists(self.fichier_journal) else ([], None)
+        for nature, valeur in enregistrements:
+            if nature == CASE and valeur[0] >= nb_cases_plan:
+                raise ValueError(f'{self.fichier_journal} : case {valeur[0]} hors du plan')
+
+        # application : rien ne peut plus échouer
+        cases = partie.plan.cases
+        if instantane is not None:
+            modifications, position, inventaire = instantane
+            for indice, type_case in modifications:
+                self.modifications[indice] = type_case
+                cases[indice] = type_case
+            partie.inventaire[:] = inventaire
+            partie.position = position
+        for nature, valeur in enregistrements:
+            if nature == CASE:
+                indice, type_case = valeur
+                self.modifications[indice] = type_case
+                cases[indice] = type_case
+            elif nature == PERSO:
+                partie.position = valeur
+            else:
+                partie.inventaire.append(valeur)
+        self.nb_enregistrements = len(enregistrements)
+        if fin_valide is not None:  # le journal reprend après le dernier enregistrement complet
+            with open(self.fichier_journal, 'r+b') as fichier_out:
+                fichier_out.truncate(fin_valide)
+        return instantane is not None or bool(enregistrements)
+
+    def lire_instantane(self):
+        """
+        Lit et vérifie l'instantané ; fixe la génération de la sauvegarde.
+
+        :return: les cases modifiées (indice, type), la position et l'inventaire
+        :rtype: tuple[list[tuple[int, int]], tuple[int, int], list[str]]
+        :raise ValueError: si l'instantané a été fait sur un autre plan ou est illisible
+        """
+        plan = self.partie.plan
+        with open(self.fichier_instantane, 'rb') as fichier_in:
+            donnees = fichier_in.read()
+        if len(donnees) < ENTETE_INSTANTANE.size:
+            raise ValueError(f'{self.fichier_instantane} n\'est pas une sauvegarde (version {VERSION})')
+        signature, version, generation, empreinte, ligne, colonne, nb_cases, nb_objets = \
+            ENTETE_INSTANTANE.unpack_from(donnees)
+        if signature != SIGNATURE_INSTANTANE or version != VERSION:
+            raise ValueError(f'{self.fichier_instantane} n\'est pas une sauvegarde (version {VERSION})')
+        if empreinte != self.empreinte:
+            raise ValueError(f'{self.fichier_instantane} : sauvegarde d\'un autre niveau')
+        decalage = ENTETE_INSTANTANE.size
+        if len(donnees) < decalage + 9 * nb_cases:
+            raise ValueError(f'{self.fichier_instantane} : sauvegarde tronquée')
+        indices = array('Q')
+        indices.frombytes(donnees[decalage:decalage + 8 * nb_cases])
+        decalage += 8 * nb_cases
+        if nb_cases and indices[-1] >= plan.nb_lignes * plan.nb_colonnes:  # indices croissants
+            raise ValueError(f'{self.fichier_instantane} : case {indices[-1]} hors du plan')
+        modifications = list(zip(indices, donnees[decalage:decalage + nb_cases]))
+        decalage += nb_cases
+        inventaire = []
+        try:
+            for _ in range(nb_objets):
+                longueur, = ENTIER.unpack_from(donnees, decalage)
+                decalage += ENTIER.size
+                if decalage + longueur > len(donnees):
+                    raise ValueError(f'{self.fichier_instantane} : sauvegarde tronquée')
+                inventaire.append(str(donnees[decalage:decalage + longueur], 'UTF-8'))
+                decalage += longueur
+        except (struct.error, UnicodeDecodeError) as erreur:
+            raise ValueError(f'{self.fichier_instantane} : sauvegarde illisible ({erreur})') from None
+        self.generation = generation
+        return modifications, (ligne, colonne), inventaire
+
+    def lire_journal(self):
+        """
+        Lit et vérifie le journal. Un journal d'une génération déjà comprise dans l'instantané est supprimé.
+
+        :return: les enregistrements (nature, valeur) et la fin du dernier enregistrement complet (None si le
+                 journal est complet)
+        :rtype: tuple[list[tuple[int, object]], int or None]
+        :raise ValueError: si le journal a été fait sur un autre plan ou n'est pas un journal
+        """
+        with open(self.fichier_journal, 'rb') as fichier_in:
+            donnees = fichier_in.read()
+        if len(donnees) < ENTETE_JOURNAL.size:  # arrêt pendant l'écriture de l'en-tête
+            os.remove(self.fichier_journal)
+            return [], None
+        signature, version, generation, empreinte = ENTETE_JOURNAL.unpack_from(donnees)
+        if signature != SIGNATURE_JOURNAL or version != VERSION:
+            raise ValueError(f'{self.fichier_journal} n\'est pas un journal de sauvegarde (version {VERSION})')
+        if empreinte != self.empreinte:
+            raise ValueError(f'{self.fichier_journal} : sauvegarde d\'un autre niveau')
+        if generation != self.generation:
+            os.remove(self.fichier_journal)  # journal d'une génération déjà comprise dans l'instantané
+            return [], None
+        enregistrements = []
+        decalage = ENTETE_JOURNAL.size
+        while decalage < len(donnees):
+            nature = donnees[decalage]
+            if nature == CASE and decalage + ENREGISTREMENT_CASE.size <= len(donnees):
+                _, indice, type_case = ENREGISTREMENT_CASE.unpack_from(donnees, decalage)
+                enregistrements.append((CASE, (indice, type_case)))
+                decalage += ENREGISTREMENT_CASE.size
+            elif nature == PERSO and decalage + ENREGISTREMENT_PERSO.size <= len(donnees):
+                _, ligne, colonne = ENREGISTREMENT_PERSO.unpack_from(donnees, decalage)
+                enregistrements.append((PERSO, (ligne, colonne)))
+                decalage += ENREGISTREMENT_PERSO.size
+            elif nature == OBJET and decalage + ENREGISTREMENT_OBJET.size <= len(donnees):
+                _, longueur = ENREGISTREMENT_OBJET.unpack_from(donnees, decalage)
+                debut = decalage + ENREGISTREMENT_OBJET.size
+                if debut + longueur > len(donnees):
+                    break
+                try:
+                    enregistrements.append((OBJET, str(donnees[debut:debut + longueur], 'UTF-8')))
+                except UnicodeDecodeError as erreur:
+                    raise ValueError(f'{self.fichier_journal} : journal illisible ({erreur})') from None
+                decalage = debut + longueur
+            else:  # enregistrement incomplet : fin du journal
+                break
+        return enregistrements, decalage if decalage < len(donnees) else None
+
+
+def effacer(fichier):
+    """
+    Supprime une sauvegarde (instantané et journal), par exemple après qu'elle a été refusée.
+
+    :param fichier: chemin de la sauvegarde, sans extension
+    :type fichier: str
+    """
+    for extension in ('.sav', '.jnl'):
+        if os.path.exists(fichier + extension):
+            os.remove(fichier + extension)
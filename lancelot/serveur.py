@@ -0,0 +1,322 @@
+"""
+    PROJET LANCELOT - serveur de parties
+    ====================================
+
+    Serveur asyncio qui héberge de nombreuses parties simultanées du même chateau dans un seul processus.
+
+    Le niveau est chargé une seule fois et partagé, en lecture seule, par toutes les sessions. Chaque session
+    joue sur une superposition du plan (Plan.superposer) qui ne garde que les cases modifiées par case_def
+    (portes ouvertes, objets ramassés, cases vues) : la mémoire d'une session est proportionnelle au nombre
+    de déplacements joués, pas à la taille du plan.
+
+    Protocole (TCP, une commande ou un message par ligne, UTF-8) :
+        client -> serveur :
+            - une suite de lettres G/D/H/B (ex. 'DDBB') : déplacements ;
+            - 'REPONSE texte' : réponse à la question en attente, la porte est alors retentée ;
+            - 'ETAT' : position et inventaire ;
+            - 'QUITTER' : fin de la session.
+        serveur -> client :
+            - 'CASE ligne colonne type', 'PERSO ligne colonne', 'ANNONCE texte', 'INVENTAIRE objet' :
+              événements du moteur ;
+            - 'QUESTION texte' : une porte bloque le passage, les déplacements suivants de la ligne sont ignorés ;
+            - 'ETAT n objets : objet1, objet2...' : réponse à 'ETAT' ;
+            - 'ERREUR texte' : commande invalide, ou erreur du moteur pendant la commande (la session continue) ;
+            - 'GAGNE' : la partie est gagnée ;
+            - 'POSITION ligne colonne' : dernière ligne de la réponse à chaque commande.
+
+    Le niveau est validé (validateur.py) au démarrage du serveur : un niveau qui contient des erreurs n'est pas
+    servi.
+
+    Usage : python -m lancelot.serveur [--hote 127.0.0.1] [--port 8765]           (serveur)
+            python -m lancelot.serveur --client [--hote 127.0.0.1] [--port 8765]  (client local interactif)
+
+    Dependencies : CONFIGS.py, moteur.py, niveau.py, validateur.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import argparse
+import asyncio
+import sys
+
+from .CONFIGS import POSITION_DEPART, fichier_plan, fichier_objets, fichier_questions, fichier_niveau
+from .moteur import Partie, LETTRES_MOUVEMENTS, PORTE
+from .niveau import charger_niveau
+from .validateur import valider_niveau, ERREUR
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+HOTE = '127.0.0.1'
+PORT = 8765
+MOUVEMENTS_LETTRES = {lettre: mouvement for mouvement, lettre in LETTRES_MOUVEMENTS.items()}
+
+
+# ======================================================================================================================
+# III. SESSIONS
+# ======================================================================================================================
+
+class Session:
+    """
+    Partie d'un joueur connecté, sur une superposition du plan partagé.
+
+    :param plan: plan partagé du chateau (jamais modifié)
+    :param dict_objet: dictionnaire position -> objet (partagé)
+    :param dict_porte: dictionnaire position -> (question, réponse) (partagé)
+    :param envoyer: fonction qui envoie une ligne de texte au joueur
+    :type plan: Plan
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :type envoyer: callable
+    """
+
+    def __init__(self, plan, dict_objet, dict_porte, envoyer):
+        self.envoyer = envoyer
+        self.partie = Partie(plan.superposer(), dict_objet, dict_porte, POSITION_DEPART, self.repondre)
+        self.partie.abonner(self.observer)
+        self.reponse = None  # réponse du joueur à donner à la prochaine question
+        self.mouvement_bloque = None  # mouvement arrêté par une porte, retenté à la réponse
+
+    def repondre(self, question, porte):
+        """
+        Fournisseur de réponses du moteur : donne la réponse reçue du joueur, une seule fois.
+
+        :param question: question posée par le garde de la porte
+        :param porte: position de la porte
+        :type question: str
+        :type porte: tuple[int, int]
+        :rtype: str or None
+        """
+        reponse, self.reponse = self.reponse, None
+        return reponse
+
+    def observer(self, evenement, *arguments):
+        """
+        Observateur du moteur : transmet les événements de rendu au joueur.
+
+        :param evenement: nom de l'événement
+        :param arguments: arguments de l'événement
+        :type evenement: str
+        """
+        if evenement == 'case':
+            (ligne, colonne), type_case = arguments
+            self.envoyer(f'CASE {ligne} {colonne} {type_case}')
+        elif evenement == 'perso':
+            self.envoyer('PERSO {} {}'.format(*arguments[0]))
+        elif evenement == 'annonce':
+            self.envoyer(f'ANNONCE {arguments[0]}')
+        elif evenement == 'inventaire':
+            self.envoyer(f'INVENTAIRE {arguments[0][-1]}')
+
+    def deplacer(self, mouvement):
+        """
+        Applique un déplacement ; si une porte bloque le passage et qu'aucune réponse n'est prête, envoie
+        sa question au joueur et retient le mouvement.
+
+        :param mouvement: mouvement demandé
+        :type mouvement: tuple[int, int]
+        :return: False si le déplacement attend la réponse à une question
+        :rtype: bool
+        """
+        partie = self.partie
+        plan = partie.plan
+        cible = (partie.position[0] + mouvement[0], partie.position[1] + mouvement[1])
+        if self.reponse is None and plan.contient(cible) and plan[cible] == PORTE and not partie.gagne:
+            self.mouvement_bloque = mouvement
+            self.envoyer(f'QUESTION {partie.dict_porte[cible][0]}')
+            return False
+        partie.deplacer(mouvement)
+        return True
+
+    def executer(self, commande):
+        """
+        Exécute une commande du joueur.
+
+        :param commande: ligne reçue, sans le saut de ligne
+        :type commande: str
+        :return: False si la session doit se terminer
+        :rtype: bool
+
+        .. note:: une erreur du moteur (niveau incohérent) est renvoyée au joueur par une ligne 'ERREUR', la
+                  session continue
+        """
+        mot, _, texte = commande.partition(' ')
+        if mot == 'QUITTER':
+            return False
+        try:
+            self.traiter(mot, texte, commande)
+        except Exception as erreur:  # l'erreur d'une session ne doit pas couper sa connexion
+            self.reponse = self.mouvement_bloque = None
+            self.envoyer(f'ERREUR moteur : {type(erreur).__name__} : {erreur}')
+        if self.partie.gagne:
+            self.envoyer('GAGNE')
+        self.envoyer('POSITION {} {}'.format(*self.partie.position))
+        return True
+
+    def traiter(self, mot, texte, commande):
+        """
+        Applique une commande du joueur, autre que 'QUITTER'.
+
+        :param mot: premier mot de la commande
+        :param texte: suite de la commande, après le premier espace
+        :param commande: commande entière
+        :type mot: str
+        :type texte: str
+        :type commande: str
+        """
+        if mot == 'REPONSE':
+            if self.mouvement_bloque is None:
+                self.envoyer('ERREUR aucune question en attente')
+            else:
+                mouvement, self.mouvement_bloque = self.mouvement_bloque, None
+                self.reponse = texte
+                self.deplacer(mouvement)
+                self.reponse = None
+        elif mot == 'ETAT':
+            self.envoyer(f'ETAT {len(self.partie.inventaire)} objets : ' + ', '.join(self.partie.inventaire))
+        elif commande and not commande.strip('GDHB'):
+            self.mouvement_bloque = None
+            for lettre in commande:
+                if not self.deplacer(MOUVEMENTS_LETTRES[lettre]):
+                    break
+        else:
+            self.envoyer(f'ERREUR commande inconnue : {commande}')
+
+
+# ======================================================================================================================
+# IV. SERVEUR ET CLIENT
+# ======================================================================================================================
+
+class Serveur:
+    """
+    Serveur de parties : un niveau partagé, une session par connexion.
+
+    :param plan: plan du chateau, partagé en lecture seule par toutes les sessions
+    :param dict_objet: dictionnaire position -> objet
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :type plan: Plan
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    """
+
+    def __init__(self, plan, dict_objet, dict_porte):
+        self.plan = plan
+        self.dict_objet = dict_objet
+        self.dict_porte = dict_porte
+        self.sessions = set()
+
+    async def gerer_connexion(self, lecteur, ecrivain):
+        """
+        Fait vivre la session d'un joueur connecté, jusqu'à 'QUITTER' ou la déconnexion.
+
+        :param lecteur: flux de lecture de la connexion
+        :param ecrivain: flux d'écriture de la connexion
+        :type lecteur: asyncio.StreamReader
+        :type ecrivain: asyncio.StreamWriter
+        """
+        session = Session(self.plan, self.dict_objet, self.dict_porte,
+                          lambda ligne: ecrivain.write(ligne.encode('UTF-8') + b'\n'))
+        self.sessions.add(session)
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                continuer = session.executer(ligne.decode('UTF-8', 'replace').strip())
+                await ecrivain.drain()
+                if not continuer:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+            ecrivain.close()
+
+    async def servir(self, hote=HOTE, port=PORT):
+        """
+        Ecoute les connexions des joueurs, indéfiniment.
+
+        :param hote: adresse d'écoute
+        :param port: port d'écoute
+        :type hote: str
+        :type port: int
+        """
+        serveur = await asyncio.start_server(self.gerer_connexion, hote, port)
+        async with serveur:
+            await serveur.serve_forever()
+
+
+async def client(hote=HOTE, port=PORT, commandes=None):
+    """
+    Client local : envoie des commandes au serveur et renvoie (ou affiche) ses réponses.
+
+    :param hote: adresse du serveur
+    :param port: port du serveur
+    :param commandes: commandes à envoyer (None : lues au clavier, réponses affichées au fil de l'eau)
+    :type hote: str
+    :type port: int
+    :type commandes: list[str] or None
+    :return: les lignes reçues pour chaque commande
+    :rtype: list[list[str]]
+    """
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    boucle = asyncio.get_running_loop()
+    recues = []
+    try:
+        numero = 0
+        while True:
+            if commandes is None:
+                commande = (await boucle.run_in_executor(None, sys.stdin.readline)).strip()
+                if not commande:
+                    commande = 'QUITTER'
+            elif numero < len(commandes):
+                commande = commandes[numero]
+            else:
+                commande = 'QUITTER'
+            numero += 1
+            ecrivain.write(commande.encode('UTF-8') + b'\n')
+            await ecrivain.drain()
+            if commande == 'QUITTER':
+                break
+            reponse = []
+            while True:  # une réponse se termine par la ligne POSITION
+                ligne = (await lecteur.readline()).decode('UTF-8').rstrip('\n')
+                if not ligne:
+                    raise ConnectionError('connexion fermée par le serveur')
+                reponse.append(ligne)
+                if commandes is None:
+                    print(ligne)
+                if ligne.startswith('POSITION'):
+                    break
+            recues.append(reponse)
+    finally:
+        ecrivain.close()
+    return recues
+
+
+# ======================================================================================================================
+# V. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description='Serveur de parties (ou client local avec --client).')
+    analyseur.add_argument('--hote', default=HOTE, help=f'adresse (défaut : {HOTE})')
+    analyseur.add_argument('--port', type=int, default=PORT, help=f'port (défaut : {PORT})')
+    analyseur.add_argument('--client', action='store_true', help='client local interactif')
+    arguments = analyseur.parse_args()
+    if arguments.client:
+        asyncio.run(client(arguments.hote, arguments.port))
+    else:
+        plan_partage, objets, portes = charger_niveau(fichier_plan, fichier_objets, fichier_questions, fichier_niveau)
+        erreurs = [probleme for probleme in valider_niveau(plan_partage, objets, portes) if probleme.gravite == ERREUR]
+        for _, case, message in erreurs:
+            print(f'erreur : {message}' + (f' {case}' if case is not None else ''))
+        if erreurs:
+            analyseur.exit(1, 'niveau invalide : serveur non démarré\n')
+        print(f'Serveur de parties sur {arguments.hote}:{arguments.port}')
+        try:
+            asyncio.run(Serveur(plan_partage, objets, portes).servir(arguments.hote, arguments.port))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,262 @@
+"""
+    PROJET LANCELOT - solveur de niveaux
+    ====================================
+
+    Recherche du plus court chemin de POSITION_DEPART à la sortie, en tenant compte des portes à ouvrir
+    et des indices (objets) nécessaires pour répondre à leurs questions.
+
+    Une porte dépend des objets qui définissent les indices cités dans sa question : l'objet
+    'indice2 = 2' définit indice2, donc la porte 'indice2 + indice4 = ?' dépend de cet objet et de celui
+    qui définit indice4. Une porte ne peut être ouverte qu'une fois tous ses objets ramassés.
+
+    La recherche ne se fait pas case par case mais entre points d'intérêt (départ, sorties, portes, objets
+    utiles) : la distance entre deux points d'intérêt est calculée par un parcours en largeur du plan
+    dans lequel les portes et les sorties arrêtent le parcours, puis mise en cache. Un algorithme de Dijkstra
+    explore ensuite les états (point d'intérêt, portes ouvertes, objets ramassés) sur ce graphe réduit.
+
+    Usage : python -m lancelot.solveur [plan dico_objets dico_portes]  (par défaut, les fichiers de CONFIGS.py)
+
+    Dependencies : CONFIGS.py, indices.py, moteur.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import heapq
+import sys
+from collections import deque
+
+from .CONFIGS import POSITION_DEPART, fichier_plan, fichier_objets, fichier_questions
+from .indices import dependances_portes
+from .moteur import lire_matrice, creer_dictionnaire, MUR, SORTIE, PORTE, OBJET, GAUCHE, DROITE, HAUT, BAS, \
+    LETTRES_MOUVEMENTS
+
+
+# ======================================================================================================================
+# II. SOLVEUR
+# ======================================================================================================================
+
+class Solveur:
+    """
+    Solveur d'un niveau, qui garde en cache les distances entre points d'intérêt.
+
+    :param plan: plan du chateau
+    :param dict_objet: dictionnaire position -> objet
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :param exiger_indices: si False, toute porte peut être ouverte sans ses objets (joueur qui devine)
+    :type plan: Plan
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :type exiger_indices: bool
+    """
+
+    def __init__(self, plan, dict_objet, dict_porte, exiger_indices=True):
+        self.plan = plan
+        self.dependances = dependances_portes(dict_objet, dict_porte) if exiger_indices else {}
+        nb_colonnes = plan.nb_colonnes
+        self.portes = plan.indices(PORTE)
+        self.sorties = plan.indices(SORTIE)
+        utiles = set().union(*self.dependances.values())
+        self.objets = [ligne * nb_colonnes + colonne for ligne, colonne in sorted(utiles)
+                       if plan.contient((ligne, colonne)) and plan[ligne, colonne] == OBJET]
+        self.rang_porte = {indice: rang for rang, indice in enumerate(self.portes)}
+        self.rang_objet = {indice: rang for rang, indice in enumerate(self.objets)}
+        self.besoins = {}  # indice de la porte -> masque des objets nécessaires (None : porte impossible à ouvrir)
+        for (ligne, colonne), positions in self.dependances.items():
+            indices = [position[0] * nb_colonnes + position[1] for position in positions]
+            self.besoins[ligne * nb_colonnes + colonne] = None if any(i not in self.rang_objet for i in indices) \
+                else sum(1 << self.rang_objet[i] for i in indices)
+        self.cache_distances = {}
+
+    def voisins(self, indice):
+        """
+        Renvoie les indices des cases voisines (haut, bas, gauche, droite) qui ne sont pas des murs.
+
+        :param indice: indice à plat de la case
+        :type indice: int
+        :rtype: list[int]
+        """
+        cases, nb_colonnes = self.plan.cases, self.plan.nb_colonnes
+        ligne, colonne = divmod(indice, nb_colonnes)
+        resultat = []
+        if ligne > 0 and cases[indice - nb_colonnes] != MUR:
+            resultat.append(indice - nb_colonnes)
+        if ligne < self.plan.nb_lignes - 1 and cases[indice + nb_colonnes] != MUR:
+            resultat.append(indice + nb_colonnes)
+        if colonne > 0 and cases[indice - 1] != MUR:
+            resultat.append(indice - 1)
+        if colonne < nb_colonnes - 1 and cases[indice + 1] != MUR:
+            resultat.append(indice + 1)
+        return resultat
+
+    def parcourir(self, source, cible=None):
+        """
+        Parcours en largeur depuis une case ; les portes et les sorties sont atteintes mais pas traversées.
+
+        :param source: indice à plat de la case de départ
+        :param cible: indice à plat d'une case à laquelle s'arrêter (None : parcourir tout ce qui est accessible)
+        :type source: int
+        :type cible: int or None
+        :return: dictionnaire indice -> indice de la case précédente sur un plus court chemin
+        :rtype: dict[int, int]
+        """
+        cases = self.plan.cases
+        precedents = {source: source}
+        file = deque([source])
+        while file:
+            indice = file.popleft()
+            if indice == cible:
+                break
+            if indice != source and cases[indice] in (PORTE, SORTIE):
+                continue  # une porte ou une sortie arrête le parcours
+            for voisin in self.voisins(indice):
+                if voisin not in precedents:
+                    precedents[voisin] = indice
+                    file.append(voisin)
+        return precedents
+
+    def distances(self, source):
+        """
+        Renvoie (depuis le cache si possible) les distances d'un point d'intérêt aux autres.
+
+        :param source: indice à plat du point d'intérêt de départ
+        :type source: int
+        :return: dictionnaire indice d'un point d'intérêt -> nombre de déplacements
+        :rtype: dict[int, int]
+        """
+        if source not in self.cache_distances:
+            cases = self.plan.cases
+            interets = set(self.portes) | set(self.sorties) | set(self.objets)
+            interets.discard(source)
+            resultat = {}
+            distance = {source: 0}
+            file = deque([source])
+            while file and len(resultat) < len(interets):
+                indice = file.popleft()
+                if indice in interets:
+                    resultat[indice] = distance[indice]
+                if indice != source and cases[indice] in (PORTE, SORTIE):
+                    continue
+                for voisin in self.voisins(indice):
+                    if voisin not in distance:
+                        distance[voisin] = distance[indice] + 1
+                        file.append(voisin)
+            self.cache_distances[source] = resultat
+        return self.cache_distances[source]
+
+    def chercher_etapes(self, depart):
+        """
+        Cherche la suite de points d'intérêt la plus courte du départ jusqu'à une sortie.
+
+        :param depart: indice à plat de la case de départ
+        :type depart: int
+        :return: la longueur du chemin et la suite des points d'intérêt visités, ou None si le niveau
+                 n'a pas de solution
+        :rtype: tuple[int, list[int]] or None
+        """
+        cases = self.plan.cases
+        etat_depart = (depart, 0, 0)  # (point d'intérêt, portes ouvertes, objets ramassés)
+        meilleur = {etat_depart: 0}
+        precedent = {etat_depart: None}
+        tas = [(0, etat_depart)]
+        while tas:
+            cout, etat = heapq.heappop(tas)
+            if cout > meilleur[etat]:
+                continue
+            indice, ouvertes, ramasses = etat
+            if cases[indice] == SORTIE:
+                etapes = []
+                while etat is not None:
+                    etapes.append(etat[0])
+                    etat = precedent[etat]
+                return cout, etapes[::-1]
+            for cible, distance in self.distances(indice).items():
+                nouvelles_ouvertes, nouveaux_ramasses = ouvertes, ramasses
+                if cible in self.rang_porte:
+                    bit = 1 << self.rang_porte[cible]
+                    if not ouvertes & bit:
+                        besoins = self.besoins.get(cible, 0)
+                        if besoins is None or besoins & ramasses != besoins:
+                            continue  # il manque des indices pour ouvrir cette porte
+                        nouvelles_ouvertes = ouvertes | bit
+                elif cible in self.rang_objet:
+                    nouveaux_ramasses = ramasses | (1 << self.rang_objet[cible])
+                suivant = (cible, nouvelles_ouvertes, nouveaux_ramasses)
+                if cout + distance < meilleur.get(suivant, cout + distance + 1):
+                    meilleur[suivant] = cout + distance
+                    precedent[suivant] = etat
+                    heapq.heappush(tas, (cout + distance, suivant))
+        return None
+
+    def chemin(self, source, cible):
+        """
+        Reconstitue les mouvements d'un plus court chemin entre deux points d'intérêt.
+
+        :param source: indice à plat de la case de départ
+        :param cible: indice à plat de la case d'arrivée
+        :type source: int
+        :type cible: int
+        :rtype: list[tuple[int, int]]
+        """
+        nb_colonnes = self.plan.nb_colonnes
+        precedents = self.parcourir(source, cible)
+        mouvements = []
+        indice = cible
+        while indice != source:
+            avant = precedents[indice]
+            mouvements.append({-nb_colonnes: HAUT, nb_colonnes: BAS, -1: GAUCHE, 1: DROITE}[indice - avant])
+            indice = avant
+        return mouvements[::-1]
+
+    def resoudre(self, depart=POSITION_DEPART):
+        """
+        Calcule la plus courte suite de mouvements du départ jusqu'à une sortie.
+
+        :param depart: position de départ
+        :type depart: tuple[int, int]
+        :return: la liste des mouvements, ou None si le niveau n'a pas de solution
+        :rtype: list[tuple[int, int]] or None
+        """
+        resultat = self.chercher_etapes(self.plan.indice(depart))
+        if resultat is None:
+            return None
+        etapes = resultat[1]
+        mouvements = []
+        for source, cible in zip(etapes, etapes[1:]):
+            mouvements.extend(self.chemin(source, cible))
+        return mouvements
+
+
+def resoudre(plan, dict_objet, dict_porte, depart=POSITION_DEPART, exiger_indices=True):
+    """
+    Calcule la plus courte suite de mouvements qui mène du départ à la sortie.
+
+    :param plan: plan du chateau
+    :param dict_objet: dictionnaire position -> objet
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :param depart: position de départ
+    :param exiger_indices: si False, toute porte peut être ouverte sans ses objets
+    :type plan: Plan
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :type depart: tuple[int, int]
+    :type exiger_indices: bool
+    :return: la liste des mouvements, ou None si le niveau n'a pas de solution
+    :rtype: list[tuple[int, int]] or None
+
+    .. seealso:: Solveur
+    """
+    return Solveur(plan, dict_objet, dict_porte, exiger_indices).resoudre(depart)
+
+
+# ======================================================================================================================
+# III. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    fichiers = sys.argv[1:4] if len(sys.argv) == 4 else (fichier_plan, fichier_objets, fichier_questions)
+    solution = resoudre(lire_matrice(fichiers[0]), creer_dictionnaire(fichiers[1]), creer_dictionnaire(fichiers[2]))
+    if solution is None:
+        sys.exit('Niveau sans solution.')
+    print(f'Solution en {len(solution)} déplacements :')
+    print(''.join(LETTRES_MOUVEMENTS[mouvement] for mouvement in solution))
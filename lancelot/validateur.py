@@ -0,0 +1,242 @@
+"""
+    PROJET LANCELOT - validation des niveaux
+    ========================================
+
+    Analyse structurelle d'un niveau avant sa mise en ligne :
+        - étiquetage des composantes connexes du plan (cases qui ne sont pas des murs, portes comprises) ;
+        - objets, portes et sorties inaccessibles depuis POSITION_DEPART ;
+        - entrées des dictionnaires sans case du bon type (objet dans dico_objets.txt, porte dans
+          dico_portes.txt) ;
+        - cases objet ou porte sans entrée dans leur dictionnaire (KeyError dans le jeu dès que le
+          personnage y arrive) ;
+        - entrées mal formées : clé qui n'est pas une position, objet qui n'est pas un texte, porte qui n'est
+          pas un couple (question, réponse).
+
+    Avec NumPy, l'étiquetage est vectorisé (tronçons de lignes, puis union-find par accrochage des racines
+    et compression de chemins) ; sans NumPy, il se fait par un parcours en largeur en python pur, suffisant
+    pour les petits plans.
+
+    Usage : python -m lancelot.validateur [plan dico_objets dico_portes]  (par défaut, les fichiers de CONFIGS.py)
+            code de sortie 1 si le niveau contient des erreurs
+
+    Dependencies : CONFIGS.py, moteur.py, NumPy (optionnel)
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+import sys
+from array import array
+from collections import deque, namedtuple
+
+from .CONFIGS import POSITION_DEPART, fichier_plan, fichier_objets, fichier_questions
+from .moteur import lire_matrice, creer_dictionnaire, MUR, SORTIE, PORTE, OBJET, ESCALIER
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : étiquetage en python pur
+    np = None
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+ERREUR = 'erreur'
+AVERTISSEMENT = 'avertissement'
+
+Probleme = namedtuple('Probleme', 'gravite position message')
+
+
+# ======================================================================================================================
+# III. ETIQUETAGE DES COMPOSANTES CONNEXES
+# ======================================================================================================================
+
+def etiqueter_numpy(plan):
+    """
+    Etiquette les composantes connexes des cases qui ne sont pas des murs (version vectorisée).
+
+    Les cases ouvertes consécutives d'une même ligne forment des tronçons, numérotés par une somme cumulée.
+    Les tronçons reliés verticalement sont ensuite fusionnés par union-find : à chaque passe, la racine la
+    plus grande de chaque lien est accrochée à la plus petite, puis les chemins sont compressés.
+
+    :param plan: plan du chateau
+    :type plan: Plan
+    :return: étiquette de chaque case (à plat), -1 pour les murs ; les cases d'une même composante
+             ont pour étiquette le plus petit indice de la composante
+    :rtype: numpy.ndarray
+
+    .. warning:: nécessite NumPy
+    """
+    nb_colonnes = plan.nb_colonnes
+    ouvertes = (plan.tableau() != MUR).ravel()
+    type_indice = np.int32 if ouvertes.size < 2 ** 31 else np.int64
+    precedente_ouverte = np.zeros_like(ouvertes)
+    precedente_ouverte[1:] = ouvertes[:-1]
+    precedente_ouverte[::nb_colonnes] = False  # la première case d'une ligne n'a pas de voisine à gauche
+    debuts = ouvertes & ~precedente_ouverte
+    premieres_cases = np.flatnonzero(debuts)  # première case de chaque tronçon
+    troncons = np.cumsum(debuts, dtype=type_indice) - 1  # numéro du tronçon de chaque case ouverte
+    del precedente_ouverte, debuts
+    verticales = np.flatnonzero(ouvertes[:-nb_colonnes] & ouvertes[nb_colonnes:])
+    liens_haut, liens_bas = troncons[verticales], troncons[verticales + nb_colonnes]
+    del verticales
+    distincts = np.ones(liens_haut.size, dtype=bool)  # un seul lien par couple de tronçons superposés
+    distincts[1:] = (liens_haut[1:] != liens_haut[:-1]) | (liens_bas[1:] != liens_bas[:-1])
+    liens_haut, liens_bas = liens_haut[distincts], liens_bas[distincts]
+    parent = np.arange(premieres_cases.size, dtype=type_indice)
+    while liens_haut.size:
+        racines_haut, racines_bas = parent[liens_haut], parent[liens_bas]
+        separes = racines_haut != racines_bas
+        if not separes.any():
+            break
+        liens_haut, liens_bas = liens_haut[separes], liens_bas[separes]  # les liens réglés sont oubliés
+        racines_haut, racines_bas = racines_haut[separes], racines_bas[separes]
+        np.minimum.at(parent, np.maximum(racines_haut, racines_bas), np.minimum(racines_haut, racines_bas))
+        while True:  # compression : chaque tronçon pointe directement sur sa racine
+            grand_parent = parent[parent]
+            if np.array_equal(grand_parent, parent):
+                break
+            parent = grand_parent
+    etiquettes = np.full(ouvertes.size, -1, dtype=type_indice)
+    etiquettes[ouvertes] = premieres_cases[parent[troncons[ouvertes]]]
+    return etiquettes
+
+
+def etiqueter_python(plan):
+    """
+    Etiquette les composantes connexes des cases qui ne sont pas des murs (version python pur).
+
+    :param plan: plan du chateau
+    :type plan: Plan
+    :return: étiquette de chaque case (à plat), -1 pour les murs ; les cases d'une même composante
+             ont pour étiquette le plus petit indice de la composante
+    :rtype: array.array
+    """
+    cases, nb_colonnes = plan.cases, plan.nb_colonnes
+    etiquettes = array('q', [-1]) * len(cases)
+    for origine in range(len(cases)):
+        if cases[origine] == MUR or etiquettes[origine] != -1:
+            continue
+        etiquettes[origine] = origine
+        file = deque([origine])
+        while file:
+            indice = file.popleft()
+            colonne = indice % nb_colonnes
+            for voisin, possible in ((indice - nb_colonnes, indice >= nb_colonnes),
+                                     (indice + nb_colonnes, indice + nb_colonnes < len(cases)),
+                                     (indice - 1, colonne > 0), (indice + 1, colonne < nb_colonnes - 1)):
+                if possible and cases[voisin] != MUR and etiquettes[voisin] == -1:
+                    etiquettes[voisin] = origine
+                    file.append(voisin)
+    return etiquettes
+
+
+def etiqueter(plan):
+    """
+    Etiquette les composantes connexes du plan, avec NumPy s'il est disponible.
+
+    :param plan: plan du chateau
+    :type plan: Plan
+    :return: étiquette de chaque case (à plat), -1 pour les murs
+    :rtype: numpy.ndarray or array.array
+    """
+    return etiqueter_numpy(plan) if np is not None else etiqueter_python(plan)
+
+
+# ======================================================================================================================
+# IV. VALIDATION
+# ======================================================================================================================
+
+def est_position(cle):
+    """
+    Indique si une clé de dictionnaire est une position (ligne, colonne).
+
+    :param cle: clé lue dans dico_objets ou dico_portes
+    :rtype: bool
+    """
+    return isinstance(cle, tuple) and len(cle) == 2 and all(type(nombre) is int for nombre in cle)
+
+
+def valider_niveau(plan, dict_objet, dict_porte, depart=POSITION_DEPART):
+    """
+    Cherche les problèmes structurels d'un niveau.
+
+    :param plan: plan du chateau
+    :param dict_objet: dictionnaire position -> objet
+    :param dict_porte: dictionnaire position -> (question, réponse)
+    :param depart: position de départ du personnage
+    :type plan: Plan
+    :type dict_objet: dict[tuple[int, int], str]
+    :type dict_porte: dict[tuple[int, int], tuple[str, str]]
+    :type depart: tuple[int, int]
+    :return: les problèmes trouvés, les erreurs en premier
+    :rtype: list[Probleme]
+    """
+    problemes = []
+    nb_colonnes = plan.nb_colonnes
+    if bytes(plan.cases).translate(None, bytes(range(ESCALIER + 1))):
+        problemes.append(Probleme(ERREUR, None, 'le plan contient des cases de type inconnu'))
+    if not plan.contient(depart) or plan[depart] == MUR:
+        problemes.append(Probleme(ERREUR, depart, 'le départ est hors du plan ou dans un mur'))
+        return problemes
+    etiquettes = etiqueter(plan)
+    composante_depart = etiquettes[plan.indice(depart)]
+    sorties = plan.indices(SORTIE)
+    if not sorties:
+        problemes.append(Probleme(ERREUR, None, 'le plan n\'a pas de sortie'))
+    elif all(etiquettes[indice] != composante_depart for indice in sorties):
+        problemes.append(Probleme(ERREUR, None, 'aucune sortie n\'est accessible depuis le départ'))
+    for type_case, nom, dictionnaire, fichier in ((OBJET, 'objet', dict_objet, 'dico_objets'),
+                                                  (PORTE, 'porte', dict_porte, 'dico_portes')):
+        cases_du_type = plan.indices(type_case)
+        for indice in cases_du_type:
+            position = divmod(indice, nb_colonnes)
+            if position not in dictionnaire:
+                problemes.append(Probleme(ERREUR, position, f'case {nom} sans entrée dans {fichier}'))
+            if etiquettes[indice] != composante_depart:
+                problemes.append(Probleme(AVERTISSEMENT, position, f'{nom} inaccessible depuis le départ'))
+        for position, valeur in dictionnaire.items():
+            if not est_position(position):
+                problemes.append(Probleme(ERREUR, None,
+                                          f'clé de {fichier} qui n\'est pas une position : {position!r}'))
+                continue
+            if type_case == OBJET and not isinstance(valeur, str):
+                problemes.append(Probleme(ERREUR, position, f'objet de {fichier} qui n\'est pas un texte'))
+            elif type_case == PORTE and not (isinstance(valeur, tuple) and len(valeur) == 2
+                                             and all(isinstance(texte, str) for texte in valeur)):
+                problemes.append(Probleme(ERREUR, position,
+                                          f'porte de {fichier} qui n\'est pas un couple (question, réponse)'))
+            if not plan.contient(position) or plan[position] != type_case:
+                problemes.append(Probleme(AVERTISSEMENT, position,
+                                          f'entrée de {fichier} sans case {nom} à cette position'))
+    problemes.sort(key=lambda probleme: probleme.gravite != ERREUR)
+    return problemes
+
+
+def compter_composantes(plan):
+    """
+    Compte les composantes connexes du plan (cases qui ne sont pas des murs, portes comprises).
+
+    :param plan: plan du chateau
+    :type plan: Plan
+    :rtype: int
+    """
+    etiquettes = etiqueter(plan)
+    if np is not None:
+        return int(np.count_nonzero(etiquettes == np.arange(etiquettes.size)))
+    return sum(1 for indice, etiquette in enumerate(etiquettes) if etiquette == indice)
+
+
+# ======================================================================================================================
+# V. CORE
+# ======================================================================================================================
+
+if __name__ == '__main__':
+    fichiers = sys.argv[1:4] if len(sys.argv) == 4 else (fichier_plan, fichier_objets, fichier_questions)
+    liste_problemes = valider_niveau(lire_matrice(fichiers[0]), creer_dictionnaire(fichiers[1]),
+                                     creer_dictionnaire(fichiers[2]))
+    for gravite, case, message in liste_problemes:
+        print(f'{gravite} : {message}' + (f' {case}' if case is not None else ''))
+    if any(probleme.gravite == ERREUR for probleme in liste_problemes):
+        sys.exit(1)
+    print('Niveau valide.')
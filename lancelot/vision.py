@@ -0,0 +1,145 @@
+"""
+    PROJET LANCELOT - champ de vision de la torche
+    ==============================================
+
+    Brouillard de guerre : seules les cases en ligne de vue du personnage, à moins de RAYON_TORCHE cases,
+    sont éclairées. Le champ de vision est calculé par ombrage récursif (recursive shadowcasting) : chacun
+    des huit octants autour du personnage est balayé ligne par ligne, et chaque mur (ou porte fermée) coupe
+    le secteur de pentes encore visible en deux sous-secteurs explorés récursivement.
+
+    Le calcul ne visite que les cases à portée de la torche : O(rayon²) par déplacement, quelle que soit la
+    taille du plan. Seules les cases dont la visibilité a changé sont renvoyées, pour être retracées.
+
+    Dependencies : moteur.py
+"""
+
+# ======================================================================================================================
+# I. IMPORTATION DES MODULES
+# ======================================================================================================================
+from .moteur import MUR, PORTE
+
+
+# ======================================================================================================================
+# II. DECLARATION DES CONSTANTES
+# ======================================================================================================================
+OPAQUES = bytes(1 if type_case in (MUR, PORTE) else 0 for type_case in range(256))  # type de case -> bloque la vue
+OCTANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1))  # (xx, xy, yx, yy) de chaque octant
+
+
+# ======================================================================================================================
+# III. OMBRAGE RECURSIF
+# ======================================================================================================================
+
+def champ_de_vision(plan, position, rayon):
+    """
+    Calcule les cases visibles depuis une position, à moins de rayon cases.
+
+    :param plan: plan du chateau
+    :param position: position de l'observateur
+    :param rayon: portée de la vue, en cases
+    :type plan: Plan
+    :type position: tuple[int, int]
+    :type rayon: int
+    :return: indices à plat des cases visibles (murs et portes qui bornent la vue compris)
+    :rtype: set[int]
+    """
+    cases, nb_lignes, nb_colonnes = plan.cases, plan.nb_lignes, plan.nb_colonnes
+    ligne_0, colonne_0 = position
+    rayon_carre = rayon * rayon
+    visibles = {ligne_0 * nb_colonnes + colonne_0}
+
+    def balayer(rangee, debut, fin, xx, xy, yx, yy):
+        # balaie un octant à partir de la rangée donnée, entre les pentes debut et fin (debut >= fin)
+        if debut < fin:
+            return
+        nouveau_debut = debut
+        for distance in range(rangee, rayon + 1):
+            delta_y = -distance
+            bloque = False
+            for delta_x in range(-distance, 1):
+                pente_gauche = (delta_x - 0.5) / (delta_y + 0.5)
+                pente_droite = (delta_x + 0.5) / (delta_y - 0.5)
+                if debut < pente_droite:
+                    continue
+                if fin > pente_gauche:
+                    break
+                colonne = colonne_0 + delta_x * xx + delta_y * xy
+                ligne = ligne_0 + delta_x * yx + delta_y * yy
+                if 0 <= ligne < nb_lignes and 0 <= colonne < nb_colonnes:
+                    indice = ligne * nb_colonnes + colonne
+                    opaque = OPAQUES[cases[indice]]
+                    if delta_x * delta_x + delta_y * delta_y <= rayon_carre:
+                        visibles.add(indice)
+                else:
+                    opaque = True  # hors du plan : comme un mur
+                if bloque:
+                    if opaque:
+                        nouveau_debut = pente_droite
+                    else:
+                        bloque = False
+                        debut = nouveau_debut
+                elif opaque and distance < rayon:
+                    bloque = True
+                    balayer(distance + 1, debut, pente_gauche, xx, xy, yx, yy)
+                    nouveau_debut = pente_droite
+            if bloque:
+                break
+
+    for octant in OCTANTS:
+        balayer(1, 1.0, 0.0, *octant)
+    return visibles
+
+
+# ======================================================================================================================
+# IV. VISION INCREMENTALE
+# ======================================================================================================================
+
+class Vision:
+    """
+    Champ de vision de la torche du personnage, mis à jour à chaque déplacement.
+
+    :param plan: plan du chateau
+    :param rayon: rayon de la torche, en cases
+    :type plan: Plan
+    :type rayon: int
+    """
+
+    def __init__(self, plan, rayon):
+        self.plan = plan
+        self.rayon = rayon
+        self.visibles = set()  # indices à plat des cases éclairées
+
+    def changer_plan(self, plan):
+        """
+        Passe à un autre plan (changement d'étage) : plus aucune case n'est éclairée.
+
+        :param plan: nouveau plan
+        :type plan: Plan
+        """
+        self.plan = plan
+        self.visibles = set()
+
+    def eclairer(self, position):
+        """
+        Recalcule le champ de vision depuis la position du personnage.
+
+        :param position: position du personnage
+        :type position: tuple[int, int]
+        :return: indices à plat des cases dont la visibilité a changé
+        :rtype: set[int]
+        """
+        visibles = champ_de_vision(self.plan, position, self.rayon)
+        changees = visibles.symmetric_difference(self.visibles)
+        self.visibles = visibles
+        return changees
+
+    def est_visible(self, position):
+        """
+        Indique si une case est éclairée.
+
+        :param position: position en coordonnées matricielles
+        :type position: tuple[int, int]
+        :rtype: bool
+        """
+        return position[0] * self.plan.nb_colonnes + position[1] in self.visibles
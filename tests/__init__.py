@@ -0,0 +1,41 @@
+"""
+    PROJET LANCELOT - tests
+    =======================
+
+    Tests du paquet, sans fenêtre (turtle et Tk ne sont jamais chargés) : moteur, solveur et validateur,
+    formats des plans et des niveaux compilés, sauvegarde incrémentale, journal de relecture, serveur, et
+    chemins NumPy comparés à leur version python pur.
+
+    Usage : python -m pytest tests   ou   python -m unittest discover -s tests -t .
+
+    Dependencies : lancelot, NumPy (optionnel : les tests des chemins vectorisés sont alors ignorés)
+"""
+
+import os
+
+from lancelot.moteur import Partie, lire_matrice, creer_dictionnaire, reponses_fixes
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FICHIER_PLAN = os.path.join(RACINE, 'plan_chateau.txt')
+FICHIER_OBJETS = os.path.join(RACINE, 'dico_objets.txt')
+FICHIER_PORTES = os.path.join(RACINE, 'dico_portes.txt')
+
+
+def charger_exemple():
+    """
+    Charge le niveau d'exemple livré avec le jeu.
+
+    :return: le plan, le dictionnaire des objets et le dictionnaire des portes
+    :rtype: tuple[Plan, dict, dict]
+    """
+    return lire_matrice(FICHIER_PLAN), creer_dictionnaire(FICHIER_OBJETS), creer_dictionnaire(FICHIER_PORTES)
+
+
+def partie_exemple():
+    """
+    Crée une partie sur le niveau d'exemple, les portes recevant leurs bonnes réponses.
+
+    :rtype: Partie
+    """
+    plan, dict_objet, dict_porte = charger_exemple()
+    return Partie(plan, dict_objet, dict_porte, fournisseur=reponses_fixes(dict_porte))
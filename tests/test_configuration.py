@@ -0,0 +1,60 @@
+"""
+    PROJET LANCELOT - tests de la configuration d'une session
+    =========================================================
+
+    Dependencies : lancelot (configuration.py)
+"""
+
+import os
+import tempfile
+import unittest
+
+from lancelot.configuration import Configuration, charger_configuration
+
+from . import RACINE
+
+
+class TestConfiguration(unittest.TestCase):
+    """
+    Lecture des fichiers de configuration, valides ou non.
+    """
+
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dossier.cleanup)
+
+    def charger(self, contenu):
+        fichier = os.path.join(self.dossier.name, 'reglages.py')
+        with open(fichier, 'w', encoding='UTF-8') as fichier_out:
+            fichier_out.write(contenu)
+        return charger_configuration(fichier)
+
+    def test_defaut(self):
+        self.assertEqual(charger_configuration(), Configuration())
+        self.assertEqual(self.charger(''), Configuration())
+
+    def test_reglages(self):
+        configuration = self.charger("RAYON_TORCHE = 6  # brouillard de guerre\n"
+                                     "fichier_plan = 'autre.txt'\nPOSITION_DEPART = [2, 3]\n")
+        self.assertEqual(configuration.rayon_torche, 6)
+        self.assertEqual(configuration.fichier_plan, 'autre.txt')
+        self.assertEqual(configuration.position_depart, (2, 3))
+        self.assertEqual(configuration.periode_tick, Configuration().periode_tick)
+
+    def test_configs_livre(self):
+        # les constantes de fenêtre et de couleurs de CONFIGS.py sont ignorées
+        self.assertEqual(charger_configuration(os.path.join(RACINE, 'lancelot', 'CONFIGS.py')), Configuration())
+
+    def test_refus(self):
+        for contenu in ('X = (\n', 'rayon_torche += 1\n', 'print(1)\n', 'INCONNU = 1\n', 'rayon_torche = 2 * 3\n',
+                        "rayon_torche = '6'\n", 'rayon_torche = True\n', 'position_depart = (1, 2, 3)\n',
+                        "position_depart = (1, 'a')\n", 'rendu_bitmap = 1\n'):
+            with self.subTest(contenu=contenu):
+                with self.assertRaises(ValueError) as contexte:
+                    self.charger(contenu)
+                self.assertIsNone(contexte.exception.__cause__)
+                self.assertIn('ligne 1', str(contexte.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
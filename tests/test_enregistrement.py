@@ -0,0 +1,81 @@
+"""
+    PROJET LANCELOT - tests de l'enregistrement et de la relecture des parties
+    ==========================================================================
+
+    Dependencies : lancelot (enregistrement.py, moteur.py, solveur.py)
+"""
+
+import os
+import tempfile
+import unittest
+
+from lancelot.enregistrement import Enregistreur, rejouer, lire_journal, etat_final, empreinte_plan, tracer_texte
+from lancelot.moteur import Partie, GAUCHE, DROITE
+from lancelot.solveur import resoudre
+
+from . import charger_exemple, partie_exemple
+
+
+class TestEnregistrement(unittest.TestCase):
+    """
+    Aller-retour partie enregistrée -> journal JSON -> partie rejouée.
+    """
+
+    def enregistrer(self, mouvements):
+        partie = partie_exemple()
+        enregistreur = Enregistreur(partie)
+        for mouvement in mouvements:
+            enregistreur.deplacer(mouvement)
+        descripteur, fichier = tempfile.mkstemp(suffix='.json')
+        os.close(descripteur)
+        self.addCleanup(os.remove, fichier)
+        enregistreur.sauvegarder(fichier)
+        return partie, lire_journal(fichier)
+
+    def rejouer(self, journal, **options):
+        plan, dict_objet, dict_porte = charger_exemple()
+        self.assertEqual(journal['plan'], empreinte_plan(plan))
+        return rejouer(Partie(plan, dict_objet, dict_porte, tuple(journal['depart'])), journal, **options)
+
+    def test_partie_gagnee(self):
+        solution = resoudre(*charger_exemple())
+        partie, journal = self.enregistrer(solution)
+        self.assertEqual(len(journal['mouvements']), len(solution))
+        self.assertTrue(journal['final']['gagne'])
+        self.assertEqual(etat_final(self.rejouer(journal)), journal['final'])
+        self.assertEqual(etat_final(partie), journal['final'])
+
+    def test_mauvaises_reponses_rejouees(self):
+        partie = partie_exemple()
+        partie.fournisseur = lambda question, porte: 'faux'
+        enregistreur = Enregistreur(partie)
+        for mouvement in resoudre(*charger_exemple()):
+            enregistreur.deplacer(mouvement)
+        journal = enregistreur.journal()
+        self.assertIn('faux', journal['reponses'])
+        rejouee = self.rejouer(journal)
+        self.assertEqual(etat_final(rejouee), journal['final'])
+        self.assertFalse(rejouee.gagne)
+
+    def test_images(self):
+        mouvements = [DROITE] * 3 + [GAUCHE] * 2
+        _, journal = self.enregistrer(mouvements)
+        images = []
+        self.rejouer(journal, images=(0, 3, 99), capturer=lambda numero, partie: images.append(
+            (numero, partie.position)))
+        depart = tuple(journal['depart'])
+        self.assertEqual([numero for numero, _ in images], [0, 3])
+        self.assertEqual(images[0][1], depart)
+        self.assertIn('@', tracer_texte(self.rejouer(journal)))
+
+    def test_journal_invalide(self):
+        descripteur, fichier = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.remove, fichier)
+        with os.fdopen(descripteur, 'w', encoding='UTF-8') as fichier_out:
+            fichier_out.write('{"version": 1, "mouvements": "DX", "reponses": []}')
+        with self.assertRaises(ValueError):
+            lire_journal(fichier)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+    PROJET LANCELOT - tests des chateaux à étages
+    =============================================
+
+    Chateau de trois étages écrit dans un dossier temporaire, parcouru avec un cache de deux étages : l'étage
+    du rez-de-chaussée est évincé puis rechargé avec ses changements.
+
+    Dependencies : lancelot (etages.py, moteur.py)
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from lancelot.etages import Chateau, lire_escaliers
+from lancelot.moteur import BAS, DROITE, GAUCHE, VUE, ESCALIER
+from lancelot.plan import Plan
+
+PLANS = {0: ('1 0 1 1 1', '1 0 0 6 1', '1 1 1 1 1'),
+         1: ('1 1 1 1 1', '1 6 0 6 1', '1 1 1 1 1'),
+         2: ('1 1 1 1 1', '1 6 0 4 1', '1 1 1 2 1')}
+ESCALIERS = ('(0, (1, 3)), (1, (1, 1))', '(1, (1, 3)), (2, (1, 1))')  # chemins inverses ajoutés à la lecture
+
+
+class TestChateau(unittest.TestCase):
+    """
+    Montée, descente et reprise des changements d'un étage sorti du cache.
+    """
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.dossier = dossier.name
+        for etage, lignes in PLANS.items():
+            dossier_etage = os.path.join(self.dossier, f'etage_{etage}')
+            os.mkdir(dossier_etage)
+            for nom, contenu in (('plan_chateau.txt', '\n'.join(lignes) + '\n'), ('dico_portes.txt', ''),
+                                 ('dico_objets.txt', "(1, 3), 'épée'\n" if etage == 2 else '')):
+                with open(os.path.join(dossier_etage, nom), 'w', encoding='UTF-8') as fichier_out:
+                    fichier_out.write(contenu)
+        self.ecrire_escaliers(ESCALIERS)
+
+    def ecrire_escaliers(self, lignes):
+        with open(os.path.join(self.dossier, 'escaliers.txt'), 'w', encoding='UTF-8') as fichier_out:
+            fichier_out.write('\n'.join(lignes) + '\n')
+
+    def test_escaliers(self):
+        escaliers = lire_escaliers(os.path.join(self.dossier, 'escaliers.txt'))
+        self.assertEqual(escaliers[(1, (1, 1))], (0, (1, 3)))
+        self.assertEqual(escaliers[(2, (1, 1))], (1, (1, 3)))
+        self.ecrire_escaliers(['(0, (1, 3)), (1, 1)'])
+        with self.assertRaises(ValueError):
+            lire_escaliers(os.path.join(self.dossier, 'escaliers.txt'))
+
+    def test_parcours(self):
+        chateau = Chateau(self.dossier, taille_cache=2)
+        self.addCleanup(chateau.fermer)
+        partie = chateau.commencer(0, (0, 1))
+        chateau.precharger()
+        annonces = []
+        partie.abonner(lambda evenement, *arguments: annonces.append(arguments[0]) if evenement == 'annonce' else None)
+        for mouvement in (BAS, DROITE, DROITE):  # escalier du rez-de-chaussée
+            partie.deplacer(mouvement)
+        self.assertEqual((chateau.etage, partie.position), (1, (1, 1)))
+        for mouvement in (DROITE, DROITE):
+            partie.deplacer(mouvement)
+        self.assertEqual((chateau.etage, partie.position), (2, (1, 1)))
+        self.assertNotIn(0, chateau.cache)  # évincé : deux étages au plus
+        self.assertLessEqual(len(chateau.cache), 2)
+        for mouvement in (DROITE, GAUCHE):  # retour sur l'escalier : étage 1
+            partie.deplacer(mouvement)
+        self.assertEqual((chateau.etage, partie.position), (1, (1, 3)))
+        for mouvement in (GAUCHE, GAUCHE):
+            partie.deplacer(mouvement)
+        self.assertEqual((chateau.etage, partie.position), (0, (1, 3)))
+        self.assertEqual(partie.plan[(1, 2)], VUE)  # changements réappliqués au rechargement
+        self.assertEqual(partie.plan[(1, 3)], ESCALIER)
+        self.assertIn('Etage 2', annonces)
+
+    def test_victoire(self):
+        chateau = Chateau(self.dossier, taille_cache=3)
+        self.addCleanup(chateau.fermer)
+        partie = chateau.commencer(0, (0, 1))
+        for mouvement in (BAS, DROITE, DROITE, DROITE, DROITE, DROITE, DROITE, BAS):
+            partie.deplacer(mouvement)
+        self.assertEqual(partie.inventaire, ['épée'])
+        self.assertTrue(partie.gagne)
+
+    def test_fermer(self):
+        chateau = Chateau(self.dossier)
+        chateau.commencer(0, (0, 1))
+        chateau.precharger()
+        self.assertEqual(sorted(chateau.cache), [0, 1])
+        chateau.fermer()
+        self.assertEqual(chateau.cache, {})
+        with self.assertRaises(RuntimeError):  # plus aucun préchargement
+            chateau.precharger()
+
+    def test_fermer_etages_evinces(self):
+        charges, fermes = [], []
+        charger, fermer = Chateau.charger, Plan.fermer
+
+        def charger_et_noter(chateau, etage):
+            charge = charger(chateau, etage)
+            charges.append(charge.plan)
+            return charge
+
+        with mock.patch.object(Chateau, 'charger', charger_et_noter), \
+                mock.patch.object(Plan, 'fermer', lambda plan: (fermes.append(plan), fermer(plan))):
+            chateau = Chateau(self.dossier, taille_cache=2)
+            partie = chateau.commencer(0, (0, 1))
+            chateau.precharger()
+            for mouvement in (BAS, DROITE, DROITE, DROITE, DROITE):  # jusqu'à l'étage 2 : le 0 est évincé
+                partie.deplacer(mouvement)
+            chateau.fermer()
+        self.assertEqual(len(charges), 3)
+        self.assertEqual(set(map(id, charges)) - set(map(id, fermes)), set())  # chaque plan chargé est fermé
+
+    def test_etage_introuvable(self):
+        self.ecrire_escaliers(['(0, (1, 3)), (5, (1, 1))'])
+        chateau = Chateau(self.dossier)
+        self.addCleanup(chateau.fermer)
+        partie = chateau.commencer(0, (0, 1))
+        partie.deplacer(BAS)
+        partie.deplacer(DROITE)
+        with self.assertRaises(ValueError):
+            partie.deplacer(DROITE)
+
+
+if __name__ == '__main__':
+    unittest.main()
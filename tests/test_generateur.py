@@ -0,0 +1,109 @@
+"""
+    PROJET LANCELOT - tests de la génération procédurale de chateaux
+    ================================================================
+
+    Dependencies : lancelot (generateur.py, moteur.py, plan.py, solveur.py, validateur.py)
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from lancelot.generateur import generer_chateau, lignes_eller
+from lancelot.moteur import creer_dictionnaire, MUR, PORTE, SORTIE
+from lancelot.plan import lire_plan
+from lancelot.solveur import resoudre
+from lancelot.validateur import valider_niveau, ERREUR
+
+
+class TestEller(unittest.TestCase):
+    """
+    Labyrinthe parfait : un seul chemin entre deux cellules.
+    """
+
+    def test_arbre_couvrant(self):
+        for largeur, hauteur, graine in ((1, 1, 0), (1, 6, 1), (7, 1, 2), (9, 8, 3)):
+            lignes = list(lignes_eller(largeur, hauteur, random.Random(graine)))
+            self.assertEqual(len(lignes), hauteur)
+            self.assertFalse(any(lignes[-1][1]))  # aucun passage sous la dernière ligne
+            # passages = cellules - 1 et une seule composante : les passages forment un arbre couvrant
+            passages = sum(sum(droite) + sum(bas) for droite, bas in lignes)
+            self.assertEqual(passages, largeur * hauteur - 1)
+            parents = list(range(largeur * hauteur))
+
+            def racine(cellule):
+                while parents[cellule] != cellule:
+                    cellule = parents[cellule]
+                return cellule
+
+            for ligne, (droite, bas) in enumerate(lignes):
+                for colonne in range(largeur):
+                    cellule = ligne * largeur + colonne
+                    if colonne < largeur - 1 and droite[colonne]:
+                        parents[racine(cellule)] = racine(cellule + 1)
+                    if bas[colonne]:
+                        parents[racine(cellule)] = racine(cellule + largeur)
+            self.assertEqual(len({racine(cellule) for cellule in range(largeur * hauteur)}), 1)
+
+
+class TestGenererChateau(unittest.TestCase):
+    """
+    Chateaux générés : déterministes, valides et solubles.
+    """
+
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dossier.cleanup)
+
+    def generer(self, nom, *arguments, binaire=False):
+        fichiers = [os.path.join(self.dossier.name, f'{nom}_{fichier}')
+                    for fichier in ('plan.bin' if binaire else 'plan.txt', 'objets.txt', 'portes.txt')]
+        dimensions = generer_chateau(*fichiers, *arguments, binaire=binaire)
+        contenus = []
+        for fichier in fichiers:
+            with open(fichier, 'rb') as fichier_in:
+                contenus.append(fichier_in.read())
+        return dimensions, fichiers, contenus
+
+    def test_deterministe(self):
+        _, _, premier = self.generer('a', 31, 41, 4, 7)
+        _, _, second = self.generer('b', 31, 41, 4, 7)
+        _, _, autre = self.generer('c', 31, 41, 4, 8)
+        self.assertEqual(premier, second)  # même graine, même chateau
+        self.assertNotEqual(premier[0], autre[0])
+
+    def test_texte_et_binaire(self):
+        _, (texte, _, _), contenus_texte = self.generer('t', 21, 21, 3, 5)
+        _, (binaire, _, _), contenus_binaire = self.generer('b', 21, 21, 3, 5, binaire=True)
+        self.assertEqual(contenus_texte[1:], contenus_binaire[1:])
+        plan_texte, plan_binaire = lire_plan(texte), lire_plan(binaire)
+        try:
+            self.assertEqual(bytes(plan_texte.cases), bytes(plan_binaire.cases))
+        finally:
+            plan_binaire.fermer()
+
+    def test_dimensions(self):
+        self.assertEqual(self.generer('d', 20, 30, 100, 0)[0], (19, 29, 8))  # impairs, portes limitées
+        self.assertEqual(self.generer('p', 2, 2, 3, 0)[0], (3, 3, 0))
+
+    def test_valide_et_soluble(self):
+        for graine in range(3):
+            with self.subTest(graine=graine):
+                (nb_lignes, nb_colonnes, nb_portes), (fichier_plan, fichier_objets, fichier_portes), _ = \
+                    self.generer(f'g{graine}', 25, 35, 5, graine)
+                plan = lire_plan(fichier_plan)
+                dict_objet, dict_porte = creer_dictionnaire(fichier_objets), creer_dictionnaire(fichier_portes)
+                self.assertEqual((plan.nb_lignes, plan.nb_colonnes), (nb_lignes, nb_colonnes))
+                self.assertEqual(len(dict_porte), nb_portes)
+                self.assertEqual(len(dict_objet), nb_portes)
+                self.assertEqual(bytes(plan.cases).count(SORTIE), 1)
+                self.assertTrue(all(plan[porte] == PORTE for porte in dict_porte))
+                self.assertEqual(plan[(0, 0)], MUR)
+                self.assertEqual([probleme for probleme in valider_niveau(plan, dict_objet, dict_porte)
+                                  if probleme.gravite == ERREUR], [])
+                self.assertIsNotNone(resoudre(plan, dict_objet, dict_porte))  # indices exigés
+
+
+if __name__ == '__main__':
+    unittest.main()
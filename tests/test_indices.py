@@ -0,0 +1,87 @@
+"""
+    PROJET LANCELOT - tests de l'index des indices et de l'aide du jeu
+    ==================================================================
+
+    Dependencies : lancelot (indices.py, moteur.py)
+"""
+
+import unittest
+
+from lancelot.indices import IndexIndices, Aide, dependances_portes
+from lancelot.moteur import Partie, COULOIR, MUR, PORTE
+
+from . import charger_exemple
+
+
+class TestIndexIndices(unittest.TestCase):
+    """
+    Dépendances entre portes et indices du niveau d'exemple, puis niveaux faussés.
+    """
+
+    def test_exemple(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        index = IndexIndices(plan, dict_objet, dict_porte)
+        self.assertEqual(index.noms[(23, 10)], ('indice2', 'indice4'))
+        self.assertEqual(index.noms[(3, 4)], ())
+        self.assertEqual(sorted(index.ordre), sorted(dict_porte))
+        self.assertEqual(index.problemes(), [])
+        for porte, prealables in index.prerequis.items():  # chaque porte vient après ses prérequis
+            self.assertTrue(all(index.ordre.index(prealable) < index.ordre.index(porte) for prealable in prealables))
+        self.assertEqual(dependances_portes(dict_objet, dict_porte), index.dependances)
+
+    def test_indice_manquant(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        dict_porte[(3, 4)] = ('indice1 + indice9 = ?', '0')
+        index = IndexIndices(plan, dict_objet, dict_porte)
+        self.assertEqual(index.manquants, {(3, 4): ['indice9']})
+        self.assertTrue(any('indice9' in probleme for probleme in index.problemes()))
+
+    def test_cycle(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        # l'objet définissant indice1 est enfermé derrière la porte qui le demande
+        porte = (9, 14)
+        objet = next(position for position, texte in dict_objet.items() if texte.startswith('indice1'))
+        plan = plan.copier()
+        ligne, colonne = objet
+        for voisine in ((ligne - 1, colonne), (ligne + 1, colonne), (ligne, colonne - 1), (ligne, colonne + 1)):
+            if plan.contient(voisine) and plan[voisine] != MUR:
+                plan[voisine] = MUR
+        plan[(ligne - 1, colonne)] = PORTE
+        dict_porte[(ligne - 1, colonne)] = dict_porte.pop(porte)
+        plan[porte] = COULOIR
+        index = IndexIndices(plan, dict_objet, dict_porte)
+        self.assertIn((ligne - 1, colonne), index.cycles)
+        self.assertNotIn((ligne - 1, colonne), index.ordre)
+
+
+class TestAide(unittest.TestCase):
+    """
+    Aide affichée devant chaque porte, au fil des objets ramassés.
+    """
+
+    def test_pour_porte(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        index = IndexIndices(plan, dict_objet, dict_porte)
+        partie = Partie(plan, dict_objet, dict_porte)
+        aide = Aide(index, partie)
+        self.assertEqual(aide.pour_porte((3, 4)), '')
+        self.assertEqual(aide.pour_porte((23, 10)), 'Indices à trouver : indice2, indice4')
+        partie.case_def(index.definitions['indice2'], COULOIR)  # objet ramassé
+        self.assertEqual(aide.pour_porte((23, 10)), 'Indices à trouver : indice4')
+        partie.case_def(index.definitions['indice4'], COULOIR)
+        self.assertEqual(aide.pour_porte((23, 10)), 'Vous avez tous les indices nécessaires.')
+
+    def test_meme_question_deux_portes(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        dict_porte[(3, 4)] = (dict_porte[(9, 14)][0], 'non')  # même question qu'une porte à indice
+        index = IndexIndices(plan, dict_objet, dict_porte)
+        partie = Partie(plan, dict_objet, dict_porte)
+        aide = Aide(index, partie)
+        self.assertEqual(aide.pour_porte((9, 14)), 'Indices à trouver : indice1')
+        partie.case_def(index.definitions['indice1'], COULOIR)
+        self.assertEqual(aide.pour_porte((3, 4)), 'Vous avez tous les indices nécessaires.')
+        self.assertEqual(aide.pour_porte((5, 10)), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
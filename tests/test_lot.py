@@ -0,0 +1,82 @@
+"""
+    PROJET LANCELOT - tests de la vérification des lots
+    ===================================================
+
+    Dependencies : lancelot (lot.py, plan.py)
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from lancelot import lot
+from lancelot.lot import verifier_niveau, verifier_lot, resumer, trouver_niveaux, NOM_OBJETS, NOM_PORTES
+from lancelot.plan import Plan, lire_plan, ecrire_plan_binaire
+
+from . import FICHIER_PLAN, FICHIER_OBJETS, FICHIER_PORTES
+
+
+class TestLot(unittest.TestCase):
+    """
+    Statut de chaque niveau d'un petit lot.
+    """
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.lot = dossier.name
+
+    def niveau(self, nom, binaire=False, portes=None):
+        dossier = os.path.join(self.lot, nom)
+        os.mkdir(dossier)
+        if binaire:
+            ecrire_plan_binaire(lire_plan(FICHIER_PLAN), os.path.join(dossier, 'plan_chateau.bin'))
+        else:
+            shutil.copy(FICHIER_PLAN, os.path.join(dossier, 'plan_chateau.txt'))
+        shutil.copy(FICHIER_OBJETS, os.path.join(dossier, NOM_OBJETS))
+        if portes is None:
+            shutil.copy(FICHIER_PORTES, os.path.join(dossier, NOM_PORTES))
+        else:
+            with open(os.path.join(dossier, NOM_PORTES), 'w', encoding='UTF-8') as fichier_out:
+                fichier_out.write(portes)
+        return dossier
+
+    def test_statuts(self):
+        self.niveau('texte')
+        self.niveau('binaire', binaire=True)
+        with open(FICHIER_PORTES, encoding='UTF-8') as fichier_in:
+            lignes = fichier_in.read().splitlines()
+        self.niveau('porte_mal_formee', portes='\n'.join(['(3, 4), ((1, 1), 5)'] + lignes[1:]))
+        self.niveau('illisible', portes='(3, 4) ?\n')
+        os.remove(os.path.join(self.niveau('sans_objets'), NOM_OBJETS))
+        niveaux = trouver_niveaux(self.lot)
+        self.assertEqual(len(niveaux), 5)
+        resultats = list(verifier_lot(niveaux, processus=2))
+        statuts = {os.path.basename(resultat['dossier']): resultat['statut'] for resultat in resultats}
+        self.assertEqual(statuts, {'texte': 'valide', 'binaire': 'valide', 'porte_mal_formee': 'erreurs',
+                                   'illisible': 'illisible', 'sans_objets': 'illisible'})
+        rapport = resumer(resultats, 1.0)
+        self.assertEqual(rapport['statuts']['valide'], 2)
+        self.assertEqual(rapport['resultats'][0]['deplacements'], 198)
+
+    def test_plantage(self):
+        dossier = self.niveau('texte')
+        with mock.patch.object(lot, 'resoudre', side_effect=TypeError('moteur')):
+            resultat = verifier_niveau(dossier)
+        self.assertEqual(resultat['statut'], 'plantage')
+        self.assertEqual(resultat['problemes'], ['TypeError : moteur'])
+
+    def test_plan_binaire_ferme(self):
+        dossier = self.niveau('binaire', binaire=True)
+        fermes = []
+        fermer = Plan.fermer
+        with mock.patch.object(Plan, 'fermer', lambda plan: (fermes.append(plan), fermer(plan))):
+            self.assertEqual(verifier_niveau(dossier)['statut'], 'valide')
+        self.assertEqual(len(fermes), 1)
+        self.assertIsNone(fermes[0].projection)
+
+
+if __name__ == '__main__':
+    unittest.main()
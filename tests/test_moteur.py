@@ -0,0 +1,154 @@
+"""
+    PROJET LANCELOT - tests du moteur, du solveur et du validateur
+    ==============================================================
+
+    Dependencies : lancelot (moteur.py, plan.py, solveur.py, validateur.py)
+"""
+
+import os
+import tempfile
+import unittest
+
+from lancelot.moteur import Partie, creer_dictionnaire, reponses_fixes
+from lancelot.moteur import MUR, VUE, COULOIR, OBJET, SORTIE, GAUCHE, DROITE, HAUT, BAS
+from lancelot.plan import Plan
+from lancelot.solveur import resoudre
+from lancelot.validateur import valider_niveau, ERREUR
+
+from . import charger_exemple, partie_exemple
+
+
+class TestPartieComplete(unittest.TestCase):
+    """
+    Partie entière jouée avec la solution du solveur.
+    """
+
+    def test_solution_gagne(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        solution = resoudre(plan, dict_objet, dict_porte)
+        self.assertIsNotNone(solution)
+        partie = partie_exemple()
+        for mouvement in solution:
+            self.assertFalse(partie.gagne)
+            partie.deplacer(mouvement)
+        self.assertTrue(partie.gagne)
+        self.assertEqual(partie.plan[partie.position], SORTIE)
+        self.assertTrue(partie.inventaire)
+        self.assertLessEqual(set(partie.inventaire), set(dict_objet.values()))
+        self.assertEqual(partie.deplacer(GAUCHE), partie.position)  # plus aucun mouvement depuis la sortie
+
+    def test_meme_question_deux_portes(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        dict_porte[(5, 10)] = (dict_porte[(3, 4)][0], '7')  # même question, autre réponse
+        partie = Partie(plan.copier(), dict_objet, dict_porte, fournisseur=reponses_fixes(dict_porte))
+        for mouvement in resoudre(plan, dict_objet, dict_porte):
+            partie.deplacer(mouvement)
+        self.assertTrue(partie.gagne)  # chaque porte a reçu sa propre réponse
+
+    def test_evenements(self):
+        partie = partie_exemple()
+        evenements = []
+        partie.abonner(lambda evenement, *arguments: evenements.append((evenement, arguments)))
+        depart = partie.position
+        for mouvement in resoudre(*charger_exemple()):
+            partie.deplacer(mouvement)
+        self.assertEqual(evenements[0], ('case', (depart, VUE)))
+        self.assertIn(('annonce', ('Bravo ! Vous avez gagné !',)), evenements)
+        self.assertEqual(sum(1 for evenement, _ in evenements if evenement == 'inventaire'), len(partie.inventaire))
+
+    def test_indices_allongent_la_solution(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        sans_indices = resoudre(plan, dict_objet, dict_porte, exiger_indices=False)
+        self.assertLessEqual(len(sans_indices), len(resoudre(plan, dict_objet, dict_porte)))
+
+
+class TestRegles(unittest.TestCase):
+    """
+    Règles de déplacement sur un petit plan.
+    """
+
+    def setUp(self):
+        #   0 1 2 3
+        # 0 . . # S
+        # 1 # o . .
+        self.plan = Plan.depuis_matrice([[COULOIR, COULOIR, MUR, SORTIE], [MUR, OBJET, COULOIR, COULOIR]])
+        self.partie = Partie(self.plan, {(1, 1): 'clef'}, {}, (0, 0))
+
+    def test_bords_et_murs(self):
+        partie = self.partie
+        self.assertEqual(partie.deplacer(HAUT), (0, 0))
+        self.assertEqual(partie.deplacer(GAUCHE), (0, 0))
+        self.assertEqual(partie.deplacer(BAS), (0, 0))
+        self.assertEqual(partie.deplacer(DROITE), (0, 1))
+        self.assertEqual(partie.deplacer(DROITE), (0, 1))
+        self.assertEqual(self.plan[(0, 0)], VUE)
+
+    def test_objet_puis_sortie(self):
+        partie = self.partie
+        for mouvement in (DROITE, BAS, DROITE, DROITE, HAUT):
+            partie.deplacer(mouvement)
+        self.assertEqual(partie.inventaire, ['clef'])
+        self.assertEqual(self.plan[(1, 1)], VUE)
+        self.assertTrue(partie.gagne)
+
+    def test_porte_mauvaise_reponse(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        partie = Partie(plan, dict_objet, dict_porte, fournisseur=lambda question, porte: 'faux')
+        for mouvement in resoudre(plan.copier(), dict_objet, dict_porte):
+            partie.deplacer(mouvement)
+        self.assertFalse(partie.gagne)
+
+
+class TestDictionnaires(unittest.TestCase):
+    """
+    Lecture des dictionnaires d'objets et de portes.
+    """
+
+    def ecrire(self, texte):
+        descripteur, fichier = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(descripteur, 'w', encoding='UTF-8') as fichier_out:
+            fichier_out.write(texte)
+        self.addCleanup(os.remove, fichier)
+        return fichier
+
+    def test_lecture(self):
+        fichier = self.ecrire("(1, 2), 'clef'\n\n(3, 4), ('question ?', 'oui')\n")
+        self.assertEqual(creer_dictionnaire(fichier), {(1, 2): 'clef', (3, 4): ('question ?', 'oui')})
+
+    def test_entrees_invalides(self):
+        for texte in ("(1, 2) 'clef'\n", "[1, 2], 'clef'\n", "(1, 2), 'clef', 3\n", "print('x'), 1\n"):
+            with self.subTest(texte=texte):
+                with self.assertRaisesRegex(ValueError, 'ligne 1'):
+                    creer_dictionnaire(self.ecrire(texte))
+
+
+class TestValidateur(unittest.TestCase):
+    """
+    Validation structurelle du niveau d'exemple.
+    """
+
+    def test_exemple_sans_erreur(self):
+        problemes = valider_niveau(*charger_exemple())
+        self.assertFalse([probleme for probleme in problemes if probleme.gravite == ERREUR])
+
+    def test_porte_sans_question(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        porte = min(dict_porte)
+        del dict_porte[porte]
+        problemes = valider_niveau(plan, dict_objet, dict_porte)
+        self.assertIn(porte, [probleme.position for probleme in problemes if probleme.gravite == ERREUR])
+
+    def test_valeurs_mal_formees(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        porte, objet = min(dict_porte), min(dict_objet)
+        for objets, portes in (({**dict_objet, objet: 5}, dict_porte), (dict_objet, {**dict_porte, porte: 5}),
+                               (dict_objet, {**dict_porte, porte: ('question ?',)}),
+                               (dict_objet, {**dict_porte, porte: ((1, 1), 5)}),
+                               ({**dict_objet, 'clef': 'x'}, dict_porte)):
+            with self.subTest(objets=objets, portes=portes):
+                self.assertTrue([probleme for probleme in valider_niveau(plan, objets, portes)
+                                 if probleme.gravite == ERREUR])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+    PROJET LANCELOT - tests des chemins NumPy
+    =========================================
+
+    Chaque chemin vectorisé est comparé à sa version python pur (ou au moteur) : étiquetage des
+    composantes connexes, tic des gardes en ronde, environnement vectorisé.
+
+    Dependencies : lancelot (validateur.py, gardes.py, environnement.py, generateur.py), NumPy
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from lancelot import gardes as module_gardes
+from lancelot.gardes import Gardes, placer_gardes
+from lancelot.generateur import generer_chateau
+from lancelot.moteur import Partie, creer_dictionnaire, lire_matrice, reponses_fixes, MUR, PORTE, SORTIE
+from lancelot.plan import Plan
+from lancelot.solveur import resoudre
+from lancelot.validateur import etiqueter_python
+
+from . import charger_exemple
+
+try:
+    import numpy as np
+    from lancelot.environnement import Environnement, ACTIONS
+    from lancelot.validateur import etiqueter_numpy
+except ImportError:
+    np = None
+
+
+def chateau_genere(taille, graine):
+    """
+    Génère un chateau de taille x taille cases.
+
+    :rtype: tuple[Plan, dict, dict]
+    """
+    with tempfile.TemporaryDirectory() as dossier:
+        fichiers = [os.path.join(dossier, nom) for nom in ('plan.txt', 'objets.txt', 'portes.txt')]
+        generer_chateau(*fichiers, taille, taille, taille // 4, graine=graine)
+        return lire_matrice(fichiers[0]), creer_dictionnaire(fichiers[1]), creer_dictionnaire(fichiers[2])
+
+
+@unittest.skipIf(np is None, 'NumPy n\'est pas installé')
+class TestEtiquetage(unittest.TestCase):
+    """
+    Union-find vectorisé contre parcours en largeur.
+    """
+
+    def test_exemple_et_chateaux_generes(self):
+        plans = [charger_exemple()[0]] + [chateau_genere(taille, taille)[0] for taille in (9, 31, 61)]
+        for plan in plans:
+            with self.subTest(taille=(plan.nb_lignes, plan.nb_colonnes)):
+                self.assertEqual(etiqueter_numpy(plan).tolist(), etiqueter_python(plan).tolist())
+
+    def test_plans_aleatoires(self):
+        hasard = random.Random(0)
+        for _ in range(30):
+            nb_lignes, nb_colonnes = hasard.randint(1, 12), hasard.randint(1, 12)
+            plan = Plan(nb_lignes, nb_colonnes, bytearray(hasard.choice((0, 0, MUR)) for _ in
+                                                          range(nb_lignes * nb_colonnes)))
+            self.assertEqual(etiqueter_numpy(plan).tolist(), etiqueter_python(plan).tolist())
+
+
+class TestGardes(unittest.TestCase):
+    """
+    Invariants du tic des gardes, avec et sans NumPy.
+    """
+
+    def verifier_tics(self, nb_tics=200):
+        plan, dict_objet, dict_porte = chateau_genere(41, 3)
+        partie = Partie(plan, dict_objet, dict_porte)
+        positions = placer_gardes(plan, 60, (partie.position,), graine=1)
+        self.assertEqual(len(set(positions)), len(positions))
+        gardes = Gardes(partie, positions, graine=2)
+        evenements = []
+        partie.abonner(lambda evenement, *arguments: evenements.append(evenement))
+        for _ in range(nb_tics):
+            avant = [gardes.position(garde) for garde in range(gardes.nombre)]
+            gardes.avancer()
+            apres = [gardes.position(garde) for garde in range(gardes.nombre)]
+            self.assertEqual(len(set(apres)), gardes.nombre)  # jamais deux gardes sur une case
+            self.assertNotIn(partie.position, apres)
+            for (ligne, colonne), (ligne_fin, colonne_fin) in zip(avant, apres):
+                self.assertLessEqual(abs(ligne - ligne_fin) + abs(colonne - colonne_fin), 1)
+                self.assertNotIn(plan[(ligne_fin, colonne_fin)], (MUR, PORTE))
+            deplaces = set(gardes.dans_zone((0, 0), plan.nb_lignes, plan.nb_colonnes, deplaces=True))
+            self.assertEqual(deplaces, {garde for garde in range(gardes.nombre) if avant[garde] != apres[garde]})
+        self.assertIn('gardes', evenements)
+        partie.changer_plan(plan.copier(), dict_objet, dict_porte, partie.position)
+        self.assertEqual(gardes.avancer(), 0)  # les gardes disparaissent avec leur plan
+
+    @unittest.skipIf(np is None, 'NumPy n\'est pas installé')
+    def test_numpy(self):
+        self.verifier_tics()
+
+    def test_python(self):
+        with mock.patch.object(module_gardes, 'np', None):
+            self.verifier_tics()
+
+    @unittest.skipIf(np is None, 'NumPy n\'est pas installé')
+    def test_fermer_libere_le_plan(self):
+        plan = Plan(3, 3, bytearray(9))
+        gardes = Gardes(Partie(plan, {}, {}, (0, 0)), [(2, 2)])
+        with self.assertRaises(BufferError):
+            bytearray.clear(plan.cases)  # la vue NumPy des gardes retient le tampon
+        gardes.fermer()
+        bytearray.clear(plan.cases)
+
+
+@unittest.skipIf(np is None, 'NumPy n\'est pas installé')
+class TestEnvironnement(unittest.TestCase):
+    """
+    Environnement vectorisé contre le moteur, copie par copie.
+    """
+
+    def test_solution(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        solution = resoudre(plan, dict_objet, dict_porte)
+        environnement = Environnement(plan, dict_objet, dict_porte, 3)
+        for numero, mouvement in enumerate(solution, 1):
+            _, recompenses, finies = environnement.pas(np.full(3, ACTIONS.index(mouvement)))
+            self.assertEqual(finies.all(), numero == len(solution))
+        self.assertTrue((recompenses > 0).all())
+        self.assertTrue((environnement.nb_pas == 0).all())  # remises au départ
+
+    def test_comme_le_moteur(self):
+        plan, dict_objet, dict_porte = chateau_genere(21, 5)
+        nombre = 8
+        environnement = Environnement(plan, dict_objet, dict_porte, nombre, exiger_indices=False)
+        parties = [Partie(plan.copier(), dict_objet, dict_porte, fournisseur=reponses_fixes(dict_porte))
+                   for _ in range(nombre)]
+        hasard = np.random.default_rng(0)
+        for _ in range(2000):
+            actions = hasard.integers(0, len(ACTIONS), nombre)
+            observations, _, finies = environnement.pas(actions)
+            for copie, partie in enumerate(parties):
+                partie.deplacer(ACTIONS[actions[copie]])
+                self.assertEqual(bool(finies[copie]), partie.plan[partie.position] == SORTIE)
+                if finies[copie]:
+                    parties[copie] = partie = Partie(plan.copier(), dict_objet, dict_porte,
+                                                     fournisseur=reponses_fixes(dict_porte))
+                self.assertEqual(tuple(observations[copie]), partie.position)
+                self.assertEqual(len(partie.inventaire), int(environnement.nb_objets()[copie]))
+        cases = environnement.cases.reshape(nombre, -1)
+        for copie, partie in enumerate(parties):
+            self.assertEqual(bytes(cases[copie]), bytes(partie.plan.cases))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+    PROJET LANCELOT - tests des formats de plan et de niveau
+    ========================================================
+
+    Dependencies : lancelot (moteur.py, niveau.py, plan.py)
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from lancelot.moteur import COULOIR, MUR, VUE
+from lancelot.moteur import creer_dictionnaire
+from lancelot.niveau import charger_niveau, compiler_niveau, ouvrir_niveau
+from lancelot.plan import Plan, lire_plan, ouvrir_plan_binaire, ecrire_plan_binaire
+
+from . import FICHIER_PLAN, FICHIER_OBJETS, FICHIER_PORTES, charger_exemple
+
+
+class TestFormatsPlan(unittest.TestCase):
+    """
+    Aller-retour entre le plan texte, le plan binaire et la matrice.
+    """
+
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dossier.cleanup)
+        self.plan = lire_plan(FICHIER_PLAN)
+
+    def chemin(self, nom):
+        return os.path.join(self.dossier.name, nom)
+
+    def test_matrice(self):
+        self.assertEqual(bytes(Plan.depuis_matrice(self.plan.vers_matrice()).cases), bytes(self.plan.cases))
+        with self.assertRaises(ValueError):
+            Plan.depuis_matrice([[COULOIR, MUR], [COULOIR]])
+
+    def test_binaire(self):
+        fichier = self.chemin('plan.bin')
+        ecrire_plan_binaire(self.plan, fichier)
+        binaire = lire_plan(fichier)  # reconnu à sa signature
+        try:
+            self.assertEqual((binaire.nb_lignes, binaire.nb_colonnes), (self.plan.nb_lignes, self.plan.nb_colonnes))
+            self.assertEqual(bytes(binaire.cases), bytes(self.plan.cases))
+            binaire[(0, 0)] = VUE  # projection en copie à l'écriture : le fichier ne change pas
+        finally:
+            binaire.fermer()
+        relu = ouvrir_plan_binaire(fichier)
+        self.assertEqual(bytes(relu.cases), bytes(self.plan.cases))
+        relu.fermer()
+
+    def test_binaire_refuse(self):
+        fichier = self.chemin('plan.bin')
+        ecrire_plan_binaire(self.plan, fichier)
+        with open(fichier, 'rb') as fichier_in:
+            donnees = fichier_in.read()
+        vide = Plan(0, 0, bytearray())
+        ecrire_plan_binaire(vide, self.chemin('vide.bin'))
+        with open(self.chemin('vide.bin'), 'rb') as fichier_in:
+            donnees_vide = fichier_in.read()
+        for nom, contenu in (('tronque.bin', donnees[:-1]), ('entete.bin', donnees[:5]), ('vide.bin', donnees_vide),
+                             ('signature.bin', b'XXXX' + donnees[4:])):
+            with self.subTest(fichier=nom):
+                with open(self.chemin(nom), 'wb') as fichier_out:
+                    fichier_out.write(contenu)
+                with self.assertRaises(ValueError):
+                    ouvrir_plan_binaire(self.chemin(nom))
+
+    def test_texte_refuse(self):
+        for contenu in ('0 1\n0\n', '0 x\n', '', '\n\n'):
+            with self.subTest(contenu=contenu):
+                with open(self.chemin('plan.txt'), 'w', encoding='UTF-8') as fichier_out:
+                    fichier_out.write(contenu)
+                with self.assertRaises(ValueError):
+                    lire_plan(self.chemin('plan.txt'))
+
+    def test_superposition(self):
+        superpose = self.plan.superposer()
+        superpose[(1, 1)] = VUE
+        self.assertEqual(superpose[(1, 1)], VUE)
+        self.assertNotEqual(self.plan[(1, 1)], VUE)  # la base n'est pas modifiée
+        self.assertEqual(len(bytes(superpose.cases)), len(self.plan.cases))
+        ecrire_plan_binaire(superpose, self.chemin('superpose.bin'))  # les cases modifiées sont écrites
+        relu = ouvrir_plan_binaire(self.chemin('superpose.bin'))
+        self.assertEqual(bytes(relu.cases), bytes(superpose.cases))
+        relu.fermer()
+
+
+class TestNiveauCompile(unittest.TestCase):
+    """
+    Compilation d'un niveau en un fichier unique et rechargement.
+    """
+
+    def test_aller_retour(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            fichier_niveau = os.path.join(dossier, 'niveau.lvl')
+            plan, dict_objet, dict_porte = charger_niveau(FICHIER_PLAN, FICHIER_OBJETS, FICHIER_PORTES,
+                                                          fichier_niveau)
+            plan_source, objets_source, portes_source = charger_exemple()
+            self.assertEqual(bytes(plan.cases), bytes(plan_source.cases))
+            self.assertEqual(dict_objet, objets_source)
+            self.assertEqual(dict_porte, portes_source)
+            plan.fermer()
+            date = os.path.getmtime(fichier_niveau)
+            charger_niveau(FICHIER_PLAN, FICHIER_OBJETS, FICHIER_PORTES, fichier_niveau)[0].fermer()
+            self.assertEqual(os.path.getmtime(fichier_niveau), date)  # sources inchangées : pas recompilé
+            with open(fichier_niveau, 'r+b') as fichier_out:
+                fichier_out.write(b'XXXX')
+            with self.assertRaises(ValueError):
+                ouvrir_niveau(fichier_niveau)
+
+    def test_copie_aux_dates_conservees(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            fichier_niveau = os.path.join(dossier, 'niveau.lvl')
+            charger_niveau(FICHIER_PLAN, FICHIER_OBJETS, FICHIER_PORTES, fichier_niveau)[0].fermer()
+            copie = os.path.join(dossier, 'objets.txt')
+            with open(FICHIER_OBJETS, encoding='UTF-8') as fichier_in:
+                lignes = fichier_in.read().splitlines()
+            with open(copie, 'w', encoding='UTF-8') as fichier_out:
+                fichier_out.write('\n'.join(lignes[1:]) + '\n')  # un objet de moins
+            shutil.copystat(FICHIER_OBJETS, copie)  # même date que la source compilée
+            plan, dict_objet, _ = charger_niveau(FICHIER_PLAN, copie, FICHIER_PORTES, fichier_niveau)
+            plan.fermer()
+            self.assertEqual(dict_objet, creer_dictionnaire(copie))
+
+    def test_plan_binaire_ferme_si_refuse(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            fichier_plan = os.path.join(dossier, 'plan.bin')
+            ecrire_plan_binaire(lire_plan(FICHIER_PLAN), fichier_plan)
+            portes = os.path.join(dossier, 'portes.txt')
+            with open(portes, 'w', encoding='UTF-8') as fichier_out:
+                fichier_out.write('(0, 0), 5\n')
+            fermes = []
+            fermer = Plan.fermer
+            with mock.patch.object(Plan, 'fermer', lambda plan: (fermes.append(plan), fermer(plan))):
+                with self.assertRaisesRegex(ValueError, 'question'):
+                    compiler_niveau(fichier_plan, FICHIER_OBJETS, portes, os.path.join(dossier, 'niveau.lvl'))
+            self.assertEqual(len(fermes), 1)
+            self.assertIsNone(fermes[0].projection)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+    PROJET LANCELOT - tests du profilage des parties
+    ================================================
+
+    Le rendu est instrumenté sur le canevas virtuel du banc d'essai : aucune fenêtre n'est ouverte.
+
+    Dependencies : lancelot (benchmark.py, profilage.py, rendu.py, solveur.py)
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from lancelot.benchmark import CanevasVirtuel
+from lancelot.profilage import Profileur, statistiques
+from lancelot.rendu import Rendu
+from lancelot.solveur import resoudre
+
+from . import charger_exemple, partie_exemple
+
+
+class TestStatistiques(unittest.TestCase):
+    """
+    Résumé d'une liste de durées.
+    """
+
+    def test_statistiques(self):
+        self.assertEqual(statistiques([])['appels'], 0)
+        stats = statistiques([0.003, 0.001, 0.002])
+        self.assertEqual(stats['appels'], 3)
+        self.assertAlmostEqual(stats['cumul_ms'], 6.0)
+        self.assertAlmostEqual(stats['p50_ms'], 2.0)
+        self.assertAlmostEqual(stats['max_ms'], 3.0)
+
+
+class TestProfileur(unittest.TestCase):
+    """
+    Partie et rendu instrumentés, de l'appui sur une touche à l'image.
+    """
+
+    def test_session(self):
+        profileur = Profileur()
+        partie = partie_exemple()
+        rendu = Rendu(CanevasVirtuel(), lambda: None)
+        profileur.instrumenter_partie(partie)
+        profileur.instrumenter_rendu(rendu)
+        rendu.afficher_plan(partie.plan, partie.position)
+        partie.abonner(rendu.observer)
+        for mouvement in resoudre(*charger_exemple())[:3]:
+            profileur.horodater(lambda: partie.deplacer(mouvement))()
+            rendu.dessiner()
+        rapport = profileur.rapport()
+        self.assertEqual(rapport['fonctions']['deplacer']['appels'], 3)
+        self.assertEqual(rapport['fonctions']['afficher_plan']['appels'], 1)
+        self.assertEqual(rapport['fonctions']['case_def']['appels'], 3)  # chaque case quittée devient vue
+        self.assertEqual(rapport['latence']['appels'], 3)  # chaque appui est montré par une image
+        self.assertGreater(rapport['primitives']['create_rectangle'], 0)
+        self.assertEqual(rapport['items']['final'], len(rendu.canevas.find_all()))
+        self.assertIn('latence touche', profileur.resume())
+        with tempfile.TemporaryDirectory() as dossier:
+            fichier = os.path.join(dossier, 'profil.json')
+            profileur.ecrire(fichier)
+            with open(fichier, encoding='UTF-8') as fichier_in:
+                self.assertEqual(json.load(fichier_in)['fonctions'].keys(), rapport['fonctions'].keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+    PROJET LANCELOT - tests du rendu bitmap et de ses mipmaps
+    =========================================================
+
+    Le rendu est joué sur le canevas virtuel du banc d'essai, avec des images factices à la place des images
+    Tk : aucune fenêtre n'est ouverte.
+
+    Dependencies : lancelot (benchmark.py, rendu_bitmap.py, solveur.py), NumPy (optionnel)
+"""
+
+import random
+import unittest
+from unittest import mock
+
+from lancelot import rendu_bitmap
+from lancelot.benchmark import CanevasVirtuel
+from lancelot.rendu_bitmap import RenduBitmap, CODES, construire_niveaux, image_ppm, reduire
+from lancelot.solveur import resoudre
+
+from . import charger_exemple, partie_exemple
+
+
+class ImageFactice:
+    """
+    Image aux dimensions fixées, qui ignore les tracés (interface de tkinter.PhotoImage utilisée par le rendu).
+    """
+
+    def __init__(self, largeur=1, hauteur=1):
+        self.largeur, self.hauteur = largeur, hauteur
+        self.tk = self
+
+    def width(self):
+        return self.largeur
+
+    def height(self):
+        return self.hauteur
+
+    def put(self, couleur, to):
+        pass
+
+    def blank(self):
+        pass
+
+    def call(self, *arguments):
+        pass
+
+
+class CanevasFactice(CanevasVirtuel):
+    """
+    Canevas virtuel qui connaît aussi les couleurs.
+    """
+
+    def winfo_rgb(self, couleur):
+        return tuple(sum(map(ord, couleur)) * facteur % 65536 for facteur in (257, 263, 269))
+
+
+class RenduBitmapFactice(RenduBitmap):
+    """
+    Rendu bitmap sur images factices.
+    """
+
+    def creer_image(self, donnees=None, largeur=None, hauteur=None):
+        return ImageFactice(largeur or 1, hauteur or 1)
+
+
+class TestMipmaps(unittest.TestCase):
+    """
+    Réduction des codes d'affichage, en python pur et avec NumPy.
+    """
+
+    def test_reduire(self):
+        hasard = random.Random(3)
+        for nb_lignes, nb_colonnes in ((1, 1), (4, 6), (5, 7), (1, 9)):
+            codes = bytearray(hasard.randrange(8) for _ in range(nb_lignes * nb_colonnes))
+            with mock.patch.object(rendu_bitmap, 'np', None):
+                python = reduire(codes, nb_lignes, nb_colonnes)
+            self.assertEqual(python[1:], ((nb_lignes + 1) // 2, (nb_colonnes + 1) // 2))
+            coin = max(codes[ligne * nb_colonnes + colonne] for ligne in range(min(2, nb_lignes))
+                       for colonne in range(min(2, nb_colonnes)))
+            self.assertEqual(python[0][0], coin)
+            self.assertEqual(reduire(codes, nb_lignes, nb_colonnes), python)
+            niveaux = construire_niveaux(codes, nb_lignes, nb_colonnes)
+            self.assertEqual(niveaux[-1][1:], (1, 1))
+            self.assertEqual(niveaux[-1][0][0], max(codes))
+
+    def test_image_ppm(self):
+        image = image_ppm(bytearray([0, 1, 1, 0]), 2, 2, [(1, 2, 3), (4, 5, 6)])
+        self.assertEqual(image, b'P6 2 2 255\n' + bytes([1, 2, 3, 4, 5, 6, 4, 5, 6, 1, 2, 3]))
+
+
+class TestRenduBitmap(unittest.TestCase):
+    """
+    Mipmaps tenues à jour case par case pendant une partie.
+    """
+
+    def test_partie(self):
+        partie = partie_exemple()
+        rendu = RenduBitmapFactice(CanevasFactice(), lambda: None)
+        rendu.afficher_plan(partie.plan, partie.position)
+        partie.abonner(rendu.observer)
+        echelle = rendu.echelle
+        for numero, mouvement in enumerate(resoudre(*charger_exemple())):
+            partie.deplacer(mouvement)
+            if numero % 5 == 0:
+                rendu.dessiner()
+            if numero == 50:
+                rendu.zoomer(-3)
+        rendu.dessiner()
+        plan = partie.plan
+        attendus = construire_niveaux(bytearray(bytes(plan.cases).translate(CODES)), plan.nb_lignes, plan.nb_colonnes)
+        self.assertEqual(rendu.niveaux, attendus)  # mises à jour incrémentales = rastérisation complète
+        self.assertEqual(rendu.echelle, max(rendu.echelle_mini, echelle - 3))
+        self.assertEqual(rendu.position_perso, partie.position)
+
+
+if __name__ == '__main__':
+    unittest.main()
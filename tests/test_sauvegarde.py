@@ -0,0 +1,104 @@
+"""
+    PROJET LANCELOT - tests de la sauvegarde incrémentale
+    =====================================================
+
+    Dependencies : lancelot (moteur.py, sauvegarde.py, solveur.py)
+"""
+
+import os
+import tempfile
+import unittest
+
+from lancelot.moteur import Partie, MUR
+from lancelot.sauvegarde import Sauvegarde, effacer
+from lancelot.solveur import resoudre
+
+from . import charger_exemple, partie_exemple
+
+
+class TestSauvegarde(unittest.TestCase):
+    """
+    Aller-retour partie -> sauvegarde (journal et instantanés) -> partie restaurée.
+    """
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.fichier = os.path.join(dossier.name, 'sauvegarde')
+        self.solution = resoudre(*charger_exemple())
+
+    def jouer(self, nb_mouvements, intervalle):
+        partie = partie_exemple()
+        sauvegarde = Sauvegarde(partie, self.fichier, intervalle)
+        self.assertFalse(sauvegarde.restauree)
+        for mouvement in self.solution[:nb_mouvements]:
+            partie.deplacer(mouvement)
+            sauvegarde.ecrire()
+        sauvegarde.fermer()
+        return partie
+
+    def restaurer(self, partie=None):
+        partie = partie or partie_exemple()
+        sauvegarde = Sauvegarde(partie, self.fichier)
+        self.addCleanup(sauvegarde.journal.close)
+        return partie, sauvegarde
+
+    def verifier_identiques(self, attendue, restauree):
+        self.assertEqual(restauree.position, attendue.position)
+        self.assertEqual(restauree.inventaire, attendue.inventaire)
+        self.assertEqual(bytes(restauree.plan.cases), bytes(attendue.plan.cases))
+
+    def test_journal_seul(self):
+        attendue = self.jouer(100, intervalle=10 ** 6)
+        self.assertFalse(os.path.exists(self.fichier + '.sav'))
+        restauree, sauvegarde = self.restaurer()
+        self.assertTrue(sauvegarde.restauree)
+        self.verifier_identiques(attendue, restauree)
+
+    def test_instantanes_et_journal(self):
+        attendue = self.jouer(150, intervalle=40)  # plusieurs instantanés, puis la fin dans le journal
+        self.assertTrue(os.path.exists(self.fichier + '.sav'))
+        restauree, _ = self.restaurer()
+        self.verifier_identiques(attendue, restauree)
+
+    def test_reprise_jusqu_a_la_victoire(self):
+        self.jouer(120, intervalle=40)
+        partie, sauvegarde = self.restaurer()
+        for mouvement in self.solution[120:]:
+            partie.deplacer(mouvement)
+            sauvegarde.ecrire()
+        self.assertTrue(partie.gagne)
+
+    def test_enregistrement_incomplet_ignore(self):
+        attendue = self.jouer(60, intervalle=10 ** 6)
+        taille = os.path.getsize(self.fichier + '.jnl')
+        with open(self.fichier + '.jnl', 'ab') as fichier_out:
+            fichier_out.write(b'\x01\x02')  # arrêt pendant l'écriture d'un enregistrement
+        restauree, _ = self.restaurer()
+        self.verifier_identiques(attendue, restauree)
+        self.assertEqual(os.path.getsize(self.fichier + '.jnl'), taille)
+
+    def test_autre_niveau_refuse(self):
+        for instantane in (True, False):
+            with self.subTest(instantane=instantane):
+                effacer(self.fichier)
+                self.jouer(100, intervalle=40 if instantane else 10 ** 6)
+                plan, dict_objet, dict_porte = charger_exemple()
+                plan[(0, 0)] = MUR if plan[(0, 0)] != MUR else 0
+                autre = Partie(plan, dict_objet, dict_porte)
+                avant = bytes(plan.cases)
+                with self.assertRaisesRegex(ValueError, 'autre niveau'):
+                    Sauvegarde(autre, self.fichier)
+                self.assertEqual(bytes(plan.cases), avant)  # refusée avant d'être appliquée
+                self.assertEqual(autre.inventaire, [])
+
+    def test_effacer(self):
+        self.jouer(100, intervalle=40)
+        effacer(self.fichier)
+        partie, sauvegarde = self.restaurer()
+        self.assertFalse(sauvegarde.restauree)
+        self.verifier_identiques(partie_exemple(), partie)
+
+
+if __name__ == '__main__':
+    unittest.main()
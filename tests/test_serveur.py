@@ -0,0 +1,95 @@
+"""
+    PROJET LANCELOT - tests du serveur de parties
+    =============================================
+
+    Le serveur écoute sur un port libre de la machine locale ; les joueurs sont des clients locaux (client()).
+
+    Dependencies : lancelot (moteur.py, serveur.py, solveur.py)
+"""
+
+import asyncio
+import unittest
+
+from lancelot.moteur import Partie, reponses_fixes, LETTRES_MOUVEMENTS, PORTE, OBJET
+from lancelot.serveur import Serveur, Session, client
+from lancelot.solveur import resoudre
+
+from . import charger_exemple
+
+
+def commandes_solution(plan, dict_objet, dict_porte):
+    """
+    Traduit la solution du solveur en commandes du protocole : une lettre par déplacement, suivie de la
+    réponse quand le déplacement mène à une porte.
+
+    :rtype: list[str]
+    """
+    partie = Partie(plan.copier(), dict_objet, dict_porte, fournisseur=reponses_fixes(dict_porte))
+    commandes = []
+    for mouvement in resoudre(plan, dict_objet, dict_porte):
+        cible = (partie.position[0] + mouvement[0], partie.position[1] + mouvement[1])
+        commandes.append(LETTRES_MOUVEMENTS[mouvement])
+        if partie.plan[cible] == PORTE:
+            commandes.append('REPONSE ' + dict_porte[cible][1])
+        partie.deplacer(mouvement)
+    return commandes
+
+
+class TestServeur(unittest.TestCase):
+    """
+    Deux joueurs sur le même plan partagé.
+    """
+
+    def jouer(self, serveur, *parties):
+        async def deroulement():
+            ecoute = await asyncio.start_server(serveur.gerer_connexion, '127.0.0.1', 0)
+            port = ecoute.sockets[0].getsockname()[1]
+            async with ecoute:
+                return await asyncio.gather(*(client('127.0.0.1', port, commandes) for commandes in parties))
+        return asyncio.run(deroulement())
+
+    def test_deux_sessions_plan_partage(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        initial = bytes(plan.cases)
+        serveur = Serveur(plan, dict_objet, dict_porte)
+        commandes = commandes_solution(plan, dict_objet, dict_porte)
+        gagnant, curieux = self.jouer(serveur, commandes + ['ETAT'], ['ETAT', 'D', 'XYZ', 'REPONSE rien'])
+        self.assertIn('GAGNE', gagnant[-2])
+        self.assertTrue(any(ligne.startswith('QUESTION') for reponse in gagnant for ligne in reponse))
+        self.assertTrue(gagnant[-1][0].startswith('ETAT'))
+        self.assertFalse(gagnant[-1][0].startswith('ETAT 0 '))
+        self.assertEqual(curieux[0][0], 'ETAT 0 objets : ')  # l'autre session n'a rien ramassé
+        self.assertTrue(curieux[2][0].startswith('ERREUR commande inconnue'))
+        self.assertEqual(curieux[3][0], 'ERREUR aucune question en attente')
+        self.assertEqual(bytes(plan.cases), initial)  # le plan partagé n'est jamais modifié
+        self.assertEqual(serveur.sessions, set())
+
+    def test_erreur_du_moteur(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        partie = Partie(plan.copier(), dict_objet, dict_porte, fournisseur=reponses_fixes(dict_porte))
+        commandes = []
+        for mouvement in resoudre(plan, dict_objet, dict_porte):
+            cible = (partie.position[0] + mouvement[0], partie.position[1] + mouvement[1])
+            commandes.append(LETTRES_MOUVEMENTS[mouvement])
+            if partie.plan[cible] == OBJET:
+                break
+            if partie.plan[cible] == PORTE:
+                commandes.append('REPONSE ' + dict_porte[cible][1])
+            partie.deplacer(mouvement)
+        incomplet = {position: objet for position, objet in dict_objet.items() if position != cible}
+        # case objet sans entrée dans le dictionnaire : KeyError au ramassage
+        reponses, = self.jouer(Serveur(plan, incomplet, dict_porte), commandes + ['ETAT'])
+        self.assertTrue(any(ligne.startswith('ERREUR moteur : KeyError') for ligne in reponses[-2]))
+        self.assertTrue(reponses[-1][0].startswith('ETAT'))  # la session continue
+
+    def test_session_sans_reseau(self):
+        plan, dict_objet, dict_porte = charger_exemple()
+        lignes = []
+        session = Session(plan, dict_objet, dict_porte, lignes.append)
+        self.assertTrue(session.executer('D'))
+        self.assertEqual(lignes[-1], 'POSITION 0 1')
+        self.assertFalse(session.executer('QUITTER'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+    PROJET LANCELOT - tests du champ de vision de la torche
+    =======================================================
+
+    Dependencies : lancelot (moteur.py, plan.py, vision.py)
+"""
+
+import unittest
+
+from lancelot.moteur import COULOIR, MUR, PORTE
+from lancelot.plan import Plan
+from lancelot.vision import Vision, champ_de_vision
+
+from . import charger_exemple
+
+
+def salle(nb_lignes, nb_colonnes, murs=()):
+    """
+    Crée un plan de couloirs, avec des murs aux positions données.
+
+    :rtype: Plan
+    """
+    plan = Plan(nb_lignes, nb_colonnes, bytearray([COULOIR]) * (nb_lignes * nb_colonnes))
+    for position in murs:
+        plan[position] = MUR
+    return plan
+
+
+class TestChampDeVision(unittest.TestCase):
+    """
+    Ombrage récursif sur des salles simples, puis sur le niveau d'exemple.
+    """
+
+    def test_salle_ouverte(self):
+        plan = salle(11, 11)
+        visibles = champ_de_vision(plan, (5, 5), 3)
+        attendues = {ligne * 11 + colonne for ligne in range(11) for colonne in range(11)
+                     if (ligne - 5) ** 2 + (colonne - 5) ** 2 <= 9}
+        self.assertEqual(visibles, attendues)  # sans obstacle : le disque de la torche
+
+    def test_mur_fait_ombre(self):
+        plan = salle(11, 11, murs=[(5, colonne) for colonne in range(11)])
+        visibles = champ_de_vision(plan, (7, 5), 5)
+        self.assertIn(5 * 11 + 5, visibles)  # le mur qui borne la vue est vu
+        self.assertFalse(any(indice < 5 * 11 for indice in visibles))  # rien derrière le mur
+
+    def test_porte_fait_ombre(self):
+        plan = salle(1, 7)
+        plan[(0, 3)] = PORTE
+        self.assertEqual(champ_de_vision(plan, (0, 0), 6), {0, 1, 2, 3})
+
+    def test_exemple(self):
+        plan, _, _ = charger_exemple()
+        for position in ((0, 1), (12, 12), (plan.nb_lignes - 1, plan.nb_colonnes - 2)):
+            visibles = champ_de_vision(plan, position, 4)
+            self.assertIn(plan.indice(position), visibles)
+            for indice in visibles:  # toujours dans le disque de la torche
+                ligne, colonne = divmod(indice, plan.nb_colonnes)
+                self.assertLessEqual((ligne - position[0]) ** 2 + (colonne - position[1]) ** 2, 16)
+
+
+class TestVision(unittest.TestCase):
+    """
+    Mise à jour incrémentale du champ de la torche.
+    """
+
+    def test_eclairer(self):
+        plan = salle(11, 11)
+        vision = Vision(plan, 2)
+        premieres = vision.eclairer((5, 5))
+        self.assertEqual(premieres, vision.visibles)
+        changees = vision.eclairer((5, 6))
+        self.assertEqual(changees, champ_de_vision(plan, (5, 5), 2) ^ champ_de_vision(plan, (5, 6), 2))
+        self.assertTrue(vision.est_visible((5, 8)))
+        self.assertFalse(vision.est_visible((5, 3)))
+        vision.changer_plan(salle(3, 3))
+        self.assertEqual(vision.visibles, set())
+
+
+if __name__ == '__main__':
+    unittest.main()